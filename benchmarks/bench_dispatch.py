@@ -0,0 +1,65 @@
+"""JSON-RPC 디스패처 벤치마크 - 순차 호출 vs 배치 호출 처리량
+
+사용법: python benchmarks/bench_dispatch.py [--rounds N] [--batch-size N] [--repo PATH]
+"""
+import argparse
+import logging
+import os
+import time
+
+from common import make_repo, report, summarize
+
+
+def build_batch(size):
+    """상태 + 브랜치 정보 + 최근 20개 커밋 조합을 size 개 만큼 반복"""
+    templates = [
+        ("get_repo_status", {}),
+        ("get_branch_info", {}),
+        ("get_commit_history", {"limit": 20, "fields": ["hash", "subject"]}),
+        ("list_tags", {}),
+    ]
+    return [
+        {"jsonrpc": "2.0", "id": i, "method": templates[i % len(templates)][0],
+         "params": templates[i % len(templates)][1]}
+        for i in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=12)
+    parser.add_argument('--repo', default=None)
+    args = parser.parse_args()
+
+    os.environ['GIT_REPO_PATH'] = args.repo or make_repo(files=500, commits=50)
+    import main as server
+    logging.disable(logging.INFO)
+
+    batch = build_batch(args.batch_size)
+    server.process_command(batch)
+
+    sequential, batched = [], []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        for request in batch:
+            server.process_command(request)
+        sequential.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        responses = server.process_command(batch)
+        batched.append((time.perf_counter() - start) * 1000)
+        assert all('result' in r for r in responses), responses
+
+    seq, bat = summarize(sequential), summarize(batched)
+    results = {
+        "repo": os.environ['GIT_REPO_PATH'],
+        "batch_size": args.batch_size,
+        "sequential": dict(seq, requests_per_sec=round(args.batch_size / (seq['mean_ms'] / 1000), 1)),
+        "batched": dict(bat, requests_per_sec=round(args.batch_size / (bat['mean_ms'] / 1000), 1)),
+    }
+    report('dispatch', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""GitHub 클라이언트 벤치마크 - 로컬 스텁 서버 대상
+
+1. 호출마다 requests.get (새 연결) vs 공유 Session (keep-alive) 지연 시간/연결 수
+2. 같은 PR 반복 조회 시 304 재사용 (rate limit 미차감)
+3. 동시에 들어온 같은 GET 합치기
+4. rate limit 한도 직전 대기 (403 없이 reset 이후 재개)
+
+검증에 실패하면 종료 코드 1.
+
+사용법: python benchmarks/bench_github_client.py [--iterations 200]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+from common import report, summarize, timed
+from fake_github import FakeGitHub
+
+import requests
+from github_client import GitHubClient
+
+PATH = 'repos/octo/repo/pulls/1'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+    checks = {}
+
+    with FakeGitHub(prs=10) as server:
+        url = f'{server.url}/{PATH}'
+        naive = timed(lambda: requests.get(url, headers={'Authorization': 'token x'}).json(), args.iterations)
+        naive_connections = server.connections
+
+    with FakeGitHub(prs=10) as server:
+        client = GitHubClient(token='x', base_url=server.url)
+        pooled = timed(lambda: client.get(PATH), args.iterations)
+        pooled_connections = server.connections
+        checks["keep_alive"] = pooled_connections <= 2
+        checks["not_modified"] = server.not_modified == args.iterations - 1
+        checks["rate_limit_spent_once"] = server.limit - server.remaining == 1
+        client_stats = client.stats()
+
+    with FakeGitHub(prs=10, delay=0.2) as server:
+        client = GitHubClient(token='x', base_url=server.url)
+        barrier = threading.Barrier(20)
+
+        def fetch():
+            barrier.wait()
+            client.get(PATH)
+
+        threads = [threading.Thread(target=fetch) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        checks["coalesced"] = server.requests == 1 and client.stats()["coalesced"] == 19
+
+    with FakeGitHub(prs=10, rate_limit=5, reset_in=2) as server:
+        client = GitHubClient(token='x', base_url=server.url, min_remaining=1, max_wait=10)
+        start = time.perf_counter()
+        errors = []
+        for n in range(1, 9):
+            try:
+                client.get(f'repos/octo/repo/pulls/{n}')
+            except Exception as e:
+                errors.append(str(e))
+        checks["rate_limit_backoff"] = not errors and client.stats()["rate_limit_waits"] >= 1
+        backoff_seconds = round(time.perf_counter() - start, 2)
+
+    results = {
+        "iterations": args.iterations,
+        "per_call_connection": dict(summarize(naive), connections=naive_connections),
+        "pooled_session": dict(summarize(pooled), connections=pooled_connections),
+        "client": client_stats,
+        "rate_limit_backoff_seconds": backoff_seconds,
+        "checks": checks,
+    }
+    report('github_client', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""서버 지표 수집 오버헤드 벤치마크 / 검증
+
+1. 같은 도구 호출(get_repo_status, get_commit_history)을 지표 수집 켬 / 끔으로 실행해 지연 시간 비교
+2. 로그 수준이 꺼져 있을 때 log_sampled() 호출 비용과, 예전처럼 결과 dict 를 매번 포맷하는 비용 비교
+3. 지표가 실제 호출 수 / git 명령 수와 맞는지, Prometheus 텍스트가 형식에 맞는지 확인
+검증 실패 시 종료 코드 1.
+
+사용법: python benchmarks/bench_metrics.py [--files 2000] [--iterations 200]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+from common import make_repo, report, summarize, timed
+
+PROMETHEUS_LINE = re.compile(r'^(# (HELP|TYPE) .+|[a-z_]+(\{[^}]*\})? [0-9.e+-]+)$')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    path = make_repo(files=args.files, commits=20)
+    os.environ['GIT_REPO_PATH'] = path
+    import main as server
+    from metrics import log_sampled, metrics
+    logging.disable(logging.INFO)
+
+    calls = {
+        'get_repo_status': {},
+        'get_commit_history': {'limit': 20},
+    }
+
+    def call(name):
+        # MCP 경로와 같이 결과 직렬화 + 응답 크기 기록까지 포함
+        return server.call_tool(name, calls[name])
+
+    latency = {}
+    for name in calls:
+        call(name)
+        metrics.enabled = False
+        off = summarize(timed(lambda: call(name), args.iterations))
+        metrics.enabled = True
+        on = summarize(timed(lambda: call(name), args.iterations))
+        latency[name] = {
+            "metrics_off_ms": off["mean_ms"],
+            "metrics_on_ms": on["mean_ms"],
+            "overhead_ms": round(on["mean_ms"] - off["mean_ms"], 3),
+        }
+
+    # 로그 비용: DEBUG 가 꺼진 상태에서 결과 dict 를 f-string 으로 포맷하던 방식과 비교
+    result = server.registry.call('get_repo_status')
+    log = logging.getLogger('bench')
+    log.setLevel(logging.INFO)
+    rounds = 10000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        log.debug(f"저장소 상태: {result}")
+    eager_us = (time.perf_counter() - start) / rounds * 1e6
+    start = time.perf_counter()
+    for _ in range(rounds):
+        log_sampled(log, logging.DEBUG, 'bench', "저장소 상태: %s", result)
+    lazy_us = (time.perf_counter() - start) / rounds * 1e6
+
+    metrics.reset()
+    for name in calls:
+        for _ in range(10):
+            call(name)
+    snapshot = server.registry.call('get_server_metrics')
+    text = server.registry.call('get_server_metrics', {'format': 'prometheus'})
+    tools = snapshot["tools"]
+
+    checks = {
+        "tool_counts": all(tools[name]["count"] == 10 for name in calls),
+        "response_bytes": all(tools[name]["bytes"] > 0 and tools[name]["responses"] == 10 for name in calls),
+        "percentiles": all(tools[name]["p50_ms"] <= tools[name]["p95_ms"] <= tools[name]["p99_ms"] for name in calls),
+        "git_commands": snapshot["git"].get("status", {}).get("count", 0) >= 10,
+        "cache_stats": "repo_handles" in snapshot["caches"],
+        "prometheus_format": all(PROMETHEUS_LINE.match(line) for line in text.strip().split('\n')),
+        "lazy_log_cheaper": lazy_us < eager_us,
+    }
+    results = {
+        "repo": path,
+        "latency": latency,
+        "disabled_debug_log_us": {"eager_format": round(eager_us, 3), "log_sampled": round(lazy_us, 3)},
+        "snapshot": {name: tools[name] for name in calls},
+        "checks": checks,
+    }
+    report('metrics', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""PR 목록 페이지네이션 / 일괄 조회 벤치마크 - 로컬 스텁 서버 대상
+
+- Link rel="next" 순차 조회 vs 마지막 페이지를 알고 병렬 조회
+- get_pull_request 반복 vs get_pull_requests 동시 조회
+- 전체 JSON vs 필드 선택 응답 크기
+
+사용법: python benchmarks/bench_pull_requests.py [--prs 2500] [--bulk 200] [--delay 0.02]
+"""
+import argparse
+import json
+import sys
+import time
+
+from common import report
+from fake_github import FakeGitHub
+
+from github_client import GitHubClient, parse_link, project
+
+PULLS = 'repos/octo/repo/pulls'
+FIELDS = ('number', 'title', 'state', 'draft', 'user.login', 'head.ref', 'base.ref',
+          'html_url', 'created_at', 'updated_at')
+
+
+def sequential_pages(client):
+    pulls = []
+    data, headers = client.get(PULLS, params={'state': 'open', 'per_page': 100}, with_headers=True)
+    pulls.extend(data)
+    links = parse_link(headers.get('Link'))
+    while 'next' in links:
+        data, headers = client.get(links['next'], with_headers=True)
+        pulls.extend(data)
+        links = parse_link(headers.get('Link'))
+    return pulls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--prs', type=int, default=2500)
+    parser.add_argument('--bulk', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.02, help='스텁 서버 응답 지연(초)')
+    args = parser.parse_args()
+    results, checks = {}, {}
+
+    with FakeGitHub(prs=args.prs, delay=args.delay) as server:
+        start = time.perf_counter()
+        pulls = sequential_pages(GitHubClient(token='x', base_url=server.url))
+        results["sequential_pages_s"] = round(time.perf_counter() - start, 3)
+        checks["sequential_complete"] = len(pulls) == args.prs
+
+        client = GitHubClient(token='x', base_url=server.url)
+        start = time.perf_counter()
+        pulls = [pull for page in client.paginate(PULLS, params={'state': 'open'}) for pull in page]
+        results["parallel_pages_s"] = round(time.perf_counter() - start, 3)
+        checks["parallel_complete"] = sorted(p["number"] for p in pulls) == list(range(1, args.prs + 1))
+
+        full = len(json.dumps(pulls))
+        projected = len(json.dumps([project(pull, FIELDS) for pull in pulls]))
+        results["response_bytes"] = {"full": full, "projected": projected}
+
+        numbers = list(range(1, min(args.bulk, args.prs) + 1))
+        client = GitHubClient(token='x', base_url=server.url)
+        start = time.perf_counter()
+        for number in numbers:
+            client.get(f'{PULLS}/{number}')
+        results["bulk_sequential_s"] = round(time.perf_counter() - start, 3)
+
+        client = GitHubClient(token='x', base_url=server.url)
+        start = time.perf_counter()
+        fetched = list(client.get_many([f'{PULLS}/{number}' for number in numbers]))
+        results["bulk_concurrent_s"] = round(time.perf_counter() - start, 3)
+        checks["bulk_complete"] = [data["number"] for _, data, _ in fetched] == numbers
+
+    results["checks"] = checks
+    report('pull_requests', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
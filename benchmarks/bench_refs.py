@@ -0,0 +1,115 @@
+"""ref 조회 벤치마크 - 태그 / 브랜치가 많은 저장소
+
+ref 마다 GitPython 으로 조회하는 방식(기존 list_tags / get_branch_info)과 for-each-ref 한 번으로
+읽는 ref 엔진(캐시 미적중 / 적중)을 비교하고, ref 가 바뀌면 캐시가 무효화되는지 확인한다.
+검증 실패 시 종료 코드 1.
+
+기존 방식은 너무 느리므로 --baseline-refs 개만 측정해 전체 ref 수로 환산한다.
+
+사용법: python benchmarks/bench_refs.py [--tags 40000] [--branches 3000] [--iterations 20] [--baseline-refs 1000]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from common import git, make_repo, report, summarize, timed
+
+
+def populate(path, tags, branches):
+    """update-ref --stdin 으로 ref 를 한꺼번에 만든 뒤 pack-refs (주석 태그는 10% 만)"""
+    commits = git(path, 'rev-list', 'HEAD').split()
+    lines = []
+    for i in range(branches):
+        lines.append(f'create refs/heads/feature/b{i} {commits[i % len(commits)]}')
+    annotated = tags // 10
+    for i in range(annotated):
+        tag = git(path, 'mktag', input=(
+            f'object {commits[i % len(commits)]}\ntype commit\ntag v1.{i}\n'
+            f'tagger bench <bench@example.com> {1700000000 + i} +0000\n\nrelease {i}\n'
+        ).encode()).strip()
+        lines.append(f'create refs/tags/v1.{i} {tag}')
+    for i in range(annotated, tags):
+        lines.append(f'create refs/tags/v1.{i} {commits[i % len(commits)]}')
+    git(path, 'update-ref', '--stdin', input=('\n'.join(lines) + '\n').encode())
+    git(path, 'pack-refs', '--all')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tags', type=int, default=40000)
+    parser.add_argument('--branches', type=int, default=3000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--baseline-refs', type=int, default=1000)
+    args = parser.parse_args()
+
+    path = make_repo(files=50, commits=20)
+    start = time.perf_counter()
+    populate(path, args.tags, args.branches)
+    setup = time.perf_counter() - start
+
+    os.environ['GIT_REPO_PATH'] = path
+    import main as server
+    import ref_engine
+    logging.disable(logging.INFO)
+    repo = server.get_repo()
+
+    sample = (repo.tags + repo.heads)[:args.baseline_refs]
+
+    def per_ref():
+        # 기존 방식: ref 마다 객체를 읽어 팁 정보를 구한다
+        return [(ref.name, ref.commit.hexsha, ref.commit.committed_date) for ref in sample]
+
+    def engine_cold():
+        ref_engine.ref_cache.clear()
+        return server.registry.call('list_refs', {'limit': 100})
+
+    def engine_warm():
+        return server.registry.call('list_refs', {'kinds': ['tag'], 'pattern': ['v1.1*'], 'sort': '-version',
+                                                  'limit': 100})
+
+    per_ref_ms = timed(per_ref, 1)[0]
+    refs_total = args.tags + args.branches
+    cold = summarize(timed(engine_cold, args.iterations))
+    engine_warm()
+    warm = summarize(timed(engine_warm, args.iterations))
+
+    first = server.registry.call('list_refs', {})
+    tags = server.registry.call('list_tags', {'pattern': 'v1.0', 'details': True})
+    # 느슨한 ref 추가와 packed-refs 재작성 모두 캐시를 무효화해야 한다
+    git(path, 'tag', 'zz-new')
+    loose = server.registry.call('list_refs', {'kinds': ['tag'], 'pattern': ['zz-*']})
+    git(path, 'pack-refs', '--all')
+    git(path, 'update-ref', '-d', 'refs/heads/feature/b0')
+    packed = server.registry.call('list_refs', {'kinds': ['branch'], 'pattern': ['feature/b0']})
+
+    checks = {
+        "total": first["total"] == refs_total + 1,
+        "annotated_message": tags["details"][0]["annotated"] and tags["details"][0]["message"] == 'release 0',
+        "loose_ref_invalidation": loose["total"] == 1,
+        "packed_ref_invalidation": packed["total"] == 0,
+    }
+    results = {
+        "tags": args.tags,
+        "branches": args.branches,
+        "setup_s": round(setup, 2),
+        "per_ref_gitpython": {
+            "sampled_refs": len(sample),
+            "sample_ms": round(per_ref_ms, 1),
+            "estimated_total_ms": round(per_ref_ms / max(len(sample), 1) * refs_total, 1),
+        },
+        "engine_cold": cold,
+        "engine_warm": warm,
+        "cache": ref_engine.ref_cache.stats(),
+        "checks": checks,
+    }
+    report('refs', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""원격 동기화 벤치마크 - 로컬 bare 저장소를 원격으로 사용
+
+클라이언트 N 개가 동시에 pull_changes 를 호출할 때 fetch 가 한 번만 실행되는지,
+각자 git fetch 를 실행하는 경우와 소요 시간을 비교한다. 검증 실패 시 종료 코드 1.
+
+사용법: python benchmarks/bench_remote_sync.py [--clients 20] [--files 300]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import git, make_repo, report
+
+
+def push_update(upstream, round_no, files):
+    for i in range(files):
+        with open(os.path.join(upstream, f'payload{i}.bin'), 'wb') as f:
+            f.write(os.urandom(4096))
+    git(upstream, 'add', '-A')
+    git(upstream, 'commit', '-q', '-m', f'update {round_no}')
+    git(upstream, 'push', '-q', 'origin', 'HEAD:main')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--files', type=int, default=300)
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix='git-mcp-remote-')
+    origin = os.path.join(base, 'origin.git')
+    upstream = os.path.join(base, 'upstream')
+    os.makedirs(upstream)
+    make_repo(files=50, commits=2, path=upstream)
+    git(base, 'init', '-q', '--bare', origin)
+    git(upstream, 'remote', 'add', 'origin', origin)
+    git(upstream, 'push', '-q', 'origin', 'HEAD:main')
+    local = os.path.join(base, 'local')
+    git(base, 'clone', '-q', '-b', 'main', origin, local)
+    other = os.path.join(base, 'other')
+    git(base, 'clone', '-q', '-b', 'main', origin, other)
+
+    # 비교 기준: 클라이언트마다 git fetch 실행
+    push_update(upstream, 0, args.files)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(lambda _: subprocess.run(
+            ['git', 'fetch', '-q', 'origin'], cwd=other, check=False,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        ), range(args.clients)))
+    independent = time.perf_counter() - start
+
+    os.environ['GIT_REPO_PATH'] = local
+    import main as server
+    logging.disable(logging.INFO)
+
+    push_update(upstream, 1, args.files)
+
+    async def run():
+        return await asyncio.gather(*[
+            server.mcp.call_tool('pull_changes', {}) for _ in range(args.clients)
+        ], return_exceptions=True)
+
+    start = time.perf_counter()
+    outcomes = asyncio.run(run())
+    coalesced = time.perf_counter() - start
+    errors = [str(outcome) for outcome in outcomes if isinstance(outcome, Exception)]
+    stats = server.remote_sync.stats()
+
+    results = {
+        "clients": args.clients,
+        "independent_fetch_s": round(independent, 3),
+        "coalesced_pull_s": round(coalesced, 3),
+        "remote_sync": {k: v for k, v in stats.items() if k != 'last_fetch'},
+        "errors": errors[:5],
+        "up_to_date": git(local, 'rev-parse', 'HEAD') == git(upstream, 'rev-parse', 'HEAD'),
+    }
+    report('remote_sync', results)
+    if errors or not results["up_to_date"] or stats["fetches"] >= args.clients:
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""저장소 핸들 캐시 벤치마크 - 매 호출 Repo() 생성(cold) vs 공유 핸들(warm)
+
+사용법: python benchmarks/bench_repo_cache.py [--iterations N] [--repo PATH]
+"""
+import argparse
+
+from common import make_repo, report, summarize, timed
+
+from git import Repo
+from repo_cache import RepoHandleManager
+
+
+def tool_body(repo):
+    # 일반적인 도구 호출과 비슷한 작업: 브랜치, HEAD 커밋 메타데이터 조회
+    commit = repo.head.commit
+    return repo.active_branch.name, commit.hexsha, commit.message, commit.author.name
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--repo', default=None)
+    args = parser.parse_args()
+
+    path = args.repo or make_repo(files=200, commits=20)
+
+    def cold():
+        repo = Repo(path)
+        try:
+            tool_body(repo)
+        finally:
+            repo.close()
+
+    manager = RepoHandleManager()
+
+    def warm():
+        tool_body(manager.get(path))
+
+    warm()
+    results = {
+        'repo': path,
+        'cold': summarize(timed(cold, args.iterations)),
+        'warm': summarize(timed(warm, args.iterations)),
+    }
+    if results['warm']['mean_ms']:
+        results['speedup'] = round(results['cold']['mean_ms'] / results['warm']['mean_ms'], 2)
+    manager.close()
+    report('repo_cache', results)
+
+
+if __name__ == '__main__':
+    main()
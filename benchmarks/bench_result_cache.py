@@ -0,0 +1,149 @@
+"""결과 캐시 벤치마크 / 검증
+
+1. 캐시 미적중 / 적중 지연 시간 비교 (히스토리, diff, blame, 병합 미리보기)
+2. ref 가 움직인 뒤(새 커밋, reset 으로 되돌리기, amend, 다른 프로세스의 update-ref)
+   캐시된 결과가 캐시 없이 계산한 결과와 항상 같은지 확인
+3. 디스크 계층: 새 프로세스(재시작)에서 같은 조회가 디스크에서 적중하는지 확인
+검증 실패 시 종료 코드 1.
+
+사용법: python benchmarks/bench_result_cache.py [--files 300] [--commits 200] [--iterations 20]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT, git, make_repo, report, summarize, timed
+
+QUERIES = {
+    'get_commit_history': {'revision': 'main', 'limit': 50, 'fields': ['hash', 'subject', 'author']},
+    'get_diff_stats': {'base': 'main~5', 'target': 'main', 'hunks': True},
+    'blame': {'path': 'dir0/file0.txt', 'revision': 'main'},
+    'preview_merge': {'source_branch': 'side', 'target': 'main'},
+}
+
+# 캐시 적중 여부 / 소요 시간 등 결과 비교에서 제외할 필드
+VOLATILE = ('cache_hit', 'seconds', 'revision')
+
+
+def normalize(value):
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items() if k not in VOLATILE}
+    if isinstance(value, list):
+        return [normalize(v) for v in value]
+    return value
+
+
+def commit_file(path, name, text, message):
+    with open(os.path.join(path, name), 'a') as f:
+        f.write(text)
+    git(path, 'add', name)
+    git(path, 'commit', '-q', '-m', message)
+
+
+RESTART_SCRIPT = '''
+import json, logging, sys
+sys.path.insert(0, {root!r})
+import main
+logging.disable(logging.INFO)
+from cache import result_cache
+for name, params in {queries!r}.items():
+    main.registry.call(name, params)
+print(json.dumps(result_cache.stats()))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=300)
+    parser.add_argument('--commits', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    path = make_repo(files=args.files, commits=args.commits)
+    git(path, 'branch', 'side', 'main~3')
+    git(path, 'checkout', '-q', 'side')
+    commit_file(path, 'side.txt', 'side\n', 'side change')
+    git(path, 'checkout', '-q', 'main')
+
+    cache_dir = tempfile.mkdtemp(prefix='git-mcp-result-cache-')
+    os.environ['GIT_REPO_PATH'] = path
+    os.environ['GIT_MCP_RESULT_CACHE_DIR'] = cache_dir
+    import main as server
+    from cache import result_cache
+    logging.disable(logging.INFO)
+
+    def call(name):
+        return server.registry.call(name, QUERIES[name])
+
+    def uncached(name):
+        result_cache.clear()
+        return call(name)
+
+    latency = {}
+    for name in QUERIES:
+        cold = summarize(timed(lambda: uncached(name), max(1, args.iterations // 4)))
+        call(name)
+        warm = summarize(timed(lambda: call(name), args.iterations))
+        latency[name] = {
+            "cold_ms": cold["mean_ms"],
+            "warm_ms": warm["mean_ms"],
+            "speedup": round(cold["mean_ms"] / warm["mean_ms"], 1) if warm["mean_ms"] else None,
+        }
+
+    # ref 이동마다: 캐시를 데운 뒤 ref 를 옮기고, 캐시된 경로의 결과가 캐시 없이 계산한 결과와 같은지 확인
+    moves = {
+        "new_commit": lambda: commit_file(path, 'dir0/file0.txt', 'moved\n', 'move main forward'),
+        "reset_back": lambda: git(path, 'reset', '-q', '--hard', 'main~1'),
+        "amend": lambda: git(path, 'commit', '-q', '--amend', '-m', 'amended message'),
+        "external_update_ref": lambda: git(path, 'update-ref', 'refs/heads/main', 'main~2'),
+    }
+    stale = {}
+    changed = {}
+    for move, apply in moves.items():
+        before = {name: call(name) for name in QUERIES}
+        for name in QUERIES:
+            call(name)
+        apply()
+        git(path, 'reset', '-q', '--hard')
+        after = {name: call(name) for name in QUERIES}
+        fresh = {name: uncached(name) for name in QUERIES}
+        stale[move] = [name for name in QUERIES if normalize(after[name]) != normalize(fresh[name])]
+        changed[move] = [name for name in QUERIES if normalize(before[name]) != normalize(after[name])]
+        # 다음 이동 전에 캐시를 다시 데운다
+        for name in QUERIES:
+            call(name)
+
+    # 재시작: 새 프로세스가 같은 디스크 계층을 열어 같은 조회를 하면 디스크에서 적중해야 한다
+    script = RESTART_SCRIPT.format(root=ROOT, queries=QUERIES)
+    restarted = json.loads(subprocess.run(
+        [sys.executable, '-c', script], env=dict(os.environ), check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ).stdout)
+
+    checks = {
+        "no_stale_results": not any(stale.values()),
+        "ref_moves_changed_results": all(changed.values()),
+        "warm_faster": all(entry["warm_ms"] < entry["cold_ms"] for entry in latency.values()),
+        "disk_hits_after_restart": restarted["disk"]["hits"] >= len(QUERIES),
+    }
+    results = {
+        "repo": path,
+        "latency": latency,
+        "stale_after_move": stale,
+        "changed_after_move": changed,
+        "restart": {"disk": restarted["disk"], "namespaces": restarted["namespaces"]},
+        "stats": result_cache.stats(),
+        "checks": checks,
+    }
+    report('result_cache', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
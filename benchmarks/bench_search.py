@@ -0,0 +1,120 @@
+"""코드 검색 벤치마크 - 파일 10만 개짜리 합성 저장소
+
+git fast-import 로 파일 N 개(기본 100,000)와 리비전 3개를 만든 뒤 search_code 를
+- 단일 git grep (GIT_MCP_SEARCH_WORKERS=1)
+- 경로 / 리비전별 병렬 git grep
+으로 실행해 비교하고, 흔한 패턴에서 결과 상한에 도달하면 조기 종료되는지 확인한다.
+단일 / 병렬 결과가 다르거나 조기 종료가 동작하지 않으면 종료 코드 1.
+
+사용법: python benchmarks/bench_search.py [--files 100000] [--workers 8] [--iterations 3]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from common import git, report, summarize, timed
+
+NEEDLE = 'needle_token'
+
+
+def build_repo(files):
+    """dir<a>/sub<b>/file<i>.py 구조의 파일을 커밋 3개에 걸쳐 생성 (마지막 두 커밋은 일부만 수정)"""
+    path = tempfile.mkdtemp(prefix='git-mcp-search-')
+    git(path, 'init', '-q', '-b', 'main')
+    stream = []
+
+    def blob(i, revision):
+        needle = f'    return "{NEEDLE}"  # rev {revision}\n' if i % 997 == 0 else ''
+        body = (f'def function_{i}(value):\n'
+                f'    """module {i} revision {revision}"""\n'
+                f'    total = value * {i}\n'
+                f'{needle}'
+                f'    return total\n')
+        data = body.encode()
+        return f'data {len(data)}\n'.encode() + data + b'\n'
+
+    def name(i):
+        return f'dir{i % 100}/sub{(i // 100) % 10}/file{i}.py'
+
+    for revision in range(3):
+        message = f'revision {revision}'.encode()
+        stream.append(f'commit refs/heads/main\nmark :{revision + 1}\n'
+                      f'committer bench <bench@example.com> {1700000000 + revision} +0000\n'
+                      f'data {len(message)}\n'.encode() + message + b'\n')
+        if revision:
+            stream.append(f'from :{revision}\n'.encode())
+        for i in range(files):
+            if revision == 0 or i % 50 == revision:
+                stream.append(f'M 100644 inline {name(i)}\n'.encode() + blob(i, revision))
+        stream.append(b'\n')
+    git(path, 'fast-import', '--quiet', input=b''.join(stream))
+    git(path, 'tag', 'rev0', 'main~2')
+    git(path, 'tag', 'rev1', 'main~1')
+    git(path, 'reset', '-q', '--hard', 'main')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=3)
+    args = parser.parse_args()
+
+    path = build_repo(args.files)
+    os.environ['GIT_REPO_PATH'] = path
+    import main as server
+    logging.disable(logging.INFO)
+
+    revisions = ['main', 'rev1', 'rev0']
+
+    def search(workers, **params):
+        os.environ['GIT_MCP_SEARCH_WORKERS'] = str(workers)
+        return server.registry.call('search_code', params)
+
+    def key(result):
+        return [(m["revision"], m["path"], m["line"], m["text"]) for m in result["matches"]]
+
+    rare = {'pattern': NEEDLE, 'fixed_strings': True, 'revisions': revisions, 'max_results': 100000}
+    common = {'pattern': r'total = value \*', 'max_results': 100, 'context_lines': 1}
+
+    single = search(1, **rare)
+    parallel = search(args.workers, **rare)
+    capped = search(args.workers, **common)
+    full = search(1, pattern=r'total = value \*', max_results=10 ** 7)
+
+    results = {
+        "files": args.files,
+        "cpus": os.cpu_count(),
+        "workers": args.workers,
+        "rare_pattern_3_revisions": {
+            "matches": len(single["matches"]),
+            "single_grep": summarize(timed(lambda: search(1, **rare), args.iterations)),
+            "parallel": summarize(timed(lambda: search(args.workers, **rare), args.iterations)),
+            "processes": parallel["processes"],
+        },
+        "common_pattern_early_stop": {
+            "capped_at": len(capped["matches"]),
+            "total_matches": len(full["matches"]),
+            "capped": summarize(timed(lambda: search(args.workers, **common), args.iterations)),
+            "full_scan_s": full["seconds"],
+        },
+    }
+    checks = {
+        "parallel_matches_single": key(single) == key(parallel),
+        "expected_matches": len(single["matches"]) > 0,
+        "early_stop": capped["truncated"] and len(capped["matches"]) == 100
+                      and all(len(m["after"]) == 1 for m in capped["matches"]),
+    }
+    results["checks"] = checks
+    report('search', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
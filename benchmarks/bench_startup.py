@@ -0,0 +1,151 @@
+"""서버 시작 시간 벤치마크 / 검증
+
+main.py 를 stdio 서버로 반복 실행해 initialize 응답, tools/list, 첫 도구 호출까지의 시간을 잰다.
+같은 환경에서 `import mcp.server.fastmcp` 만 하는 프로세스의 시간(SDK 하한)도 재서 서버 자체의
+시작 오버헤드를 따로 본다. 다음을 확인하고 하나라도 어기면 종료 코드 1:
+
+- initialize p50 이 --budget-ms 이하
+- initialize - SDK 하한 (번갈아 잰 쌍의 차이 중앙값) 이 --overhead-budget-ms 이하
+- import main 만으로는 GitPython / requests / GitHub 클라이언트를 불러오지 않음
+- 첫 도구 호출은 정상 동작 (저장소 검증을 미뤘어도)
+- git 저장소가 아닌 경로는 여전히 시작 시 거부
+
+사용법: python benchmarks/bench_startup.py [--iterations 10] [--budget-ms 1500] [--overhead-budget-ms 150]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import GIT_ENV, ROOT, make_repo, percentile, report, summarize
+
+LAZY_MODULES = ('git', 'requests', 'github_client')
+
+
+def start_server(env):
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'main.py')], cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+
+
+def request(proc, request_id, method, params):
+    proc.stdin.write(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+                     .encode() + b'\n')
+    proc.stdin.flush()
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"서버가 종료됨 (exit {proc.poll()})")
+        message = json.loads(line)
+        if message.get('id') == request_id:
+            return message
+
+
+def session(env):
+    """(initialize ms, tools/list ms, 첫 tools/call ms, 도구 수, 첫 호출 성공 여부)"""
+    started = time.perf_counter()
+    proc = start_server(env)
+    try:
+        request(proc, 1, 'initialize', {
+            'protocolVersion': '2024-11-05', 'capabilities': {},
+            'clientInfo': {'name': 'git-mcp-bench', 'version': '1.0'},
+        })
+        initialized = time.perf_counter()
+        proc.stdin.write(json.dumps({'jsonrpc': '2.0', 'method': 'notifications/initialized'}).encode() + b'\n')
+        proc.stdin.flush()
+        tools = request(proc, 2, 'tools/list', {})["result"]["tools"]
+        listed = time.perf_counter()
+        call = request(proc, 3, 'tools/call', {'name': 'get_repo_status', 'arguments': {}})
+        called = time.perf_counter()
+    finally:
+        # MCP SDK 의 stdio 서버는 stdin EOF 에 종료하지 않으므로 클라이언트처럼 종료시킨다
+        proc.stdin.close()
+        proc.terminate()
+        proc.wait()
+    ok = 'result' in call and not call["result"].get("isError")
+    return ((initialized - started) * 1000, (listed - initialized) * 1000, (called - listed) * 1000,
+            len(tools), ok)
+
+
+def sdk_floor_ms(env):
+    """MCP SDK 만 import 하고 준비 신호를 보내기까지의 시간 (서버와 같이 종료 비용은 제외)"""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', 'import sys, mcp.server.fastmcp; print("ready", flush=True); sys.stdin.read()'],
+        cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    proc.stdout.readline()
+    elapsed = (time.perf_counter() - started) * 1000
+    proc.stdin.close()
+    proc.wait()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=1500.0)
+    parser.add_argument('--overhead-budget-ms', type=float, default=150.0)
+    args = parser.parse_args()
+
+    repo = make_repo(files=200, commits=5)
+    env = dict(os.environ, **GIT_ENV, GIT_REPO_PATH=repo, GIT_MCP_LOG_LEVEL='WARNING')
+
+    # 기기 부하 변화가 양쪽에 고르게 들어가도록 번갈아 잰다
+    sdk_floor, sessions = [], []
+    for _ in range(args.iterations):
+        sdk_floor.append(sdk_floor_ms(env))
+        sessions.append(session(env))
+    initialize = summarize([s[0] for s in sessions])
+    floor = summarize(sdk_floor)
+
+    loaded = json.loads(subprocess.run(
+        [sys.executable, '-c', f'import json, sys, main; print(json.dumps([m for m in {LAZY_MODULES!r} '
+                               f'if m in sys.modules]))'],
+        cwd=ROOT, env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    ).stdout)
+
+    not_repo = tempfile.mkdtemp(prefix='git-mcp-not-repo-')
+    rejected = start_server(dict(env, GIT_REPO_PATH=not_repo))
+    rejected.stdin.close()
+    try:
+        rejected_code = rejected.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        rejected.terminate()
+        rejected.wait()
+        rejected_code = 0
+
+    # 연달아 잰 (서버, SDK 하한) 쌍의 차이 중앙값 - 기기 부하 변화에 덜 흔들린다
+    overhead = round(percentile([s[0] - f for s, f in zip(sessions, sdk_floor)], 50), 1)
+    checks = {
+        "initialize_within_budget": initialize["p50_ms"] <= args.budget_ms,
+        "overhead_within_budget": overhead <= args.overhead_budget_ms,
+        "heavy_modules_deferred": not loaded,
+        "first_call_ok": all(s[4] for s in sessions),
+        "invalid_repo_rejected": rejected_code != 0,
+    }
+    results = {
+        "iterations": args.iterations,
+        "initialize": initialize,
+        "tools_list": summarize([s[1] for s in sessions]),
+        "first_tool_call": summarize([s[2] for s in sessions]),
+        "tools": sessions[0][3],
+        "sdk_import_floor": floor,
+        "server_overhead_ms": overhead,
+        "budget_ms": args.budget_ms,
+        "overhead_budget_ms": args.overhead_budget_ms,
+        "loaded_at_import": loaded,
+        "checks": checks,
+    }
+    report('startup', results)
+    if not all(checks.values()):
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,459 @@
+"""전체 도구 벤치마크 스위트 (합성 저장소 + in-process / stdio 전송)
+
+synthetic.py 로 만든 저장소에서 등록된 모든 MCP 도구를 시나리오대로 호출해
+도구별 지연 시간 백분위(첫 호출은 cold_ms 로 따로)와 최대 RSS 를 JSON 으로 출력한다.
+
+- in-process: main 을 import 해 MCP 경로와 같은 call_tool(결과 직렬화 포함)로 호출
+- stdio: main.py 를 하위 프로세스로 띄워 MCP stdio 프로토콜(initialize, tools/call)로 호출
+  (initialize 응답까지의 시작 시간도 기록)
+- PR 도구는 로컬 가짜 GitHub 서버(fake_github.py)에 요청한다
+- 쓰기 도구는 반복마다 준비 작업(측정 제외)을 하므로 반복 실행 가능. 전송마다 저장소 복사본을 쓴다
+- 시나리오가 없는 도구가 있으면 실패 (새 도구는 SCENARIOS 에 추가)
+
+--output 으로 결과를 파일에 저장하고, --compare BASELINE 을 주면 저장된 결과와 비교해
+p50 / p95 가 --threshold 배 이상이고 --min-delta-ms 이상 느려진 도구, RSS 증가를 회귀로 표시한다.
+--results FILE 을 함께 주면 새로 실행하지 않고 FILE 을 비교한다. 검증 실패 / 회귀 시 종료 코드 1.
+
+사용법:
+    python benchmarks/bench_suite.py [--files 10000] [--commits 1000] [--branches 100] [--tags 500]
+        [--dirty-ratio 0.01] [--iterations 10] [--transport both|inprocess|stdio] [--tools a,b]
+        [--output result.json] [--compare baseline.json [--results result.json]]
+        [--threshold 1.5] [--min-delta-ms 2]
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+
+from common import GIT_ENV, ROOT, git, report, summarize
+from fake_github import FakeGitHub
+from synthetic import BLAME_PATH, file_path, generate
+
+OWNER = {'repo_owner': 'octo', 'repo_name': 'repo'}
+
+
+class ToolFailed(Exception):
+    pass
+
+
+class Context:
+    """시나리오 준비 / 정리 작업에 넘기는 실행 환경"""
+
+    def __init__(self, transport, repo, origin):
+        self.transport = transport
+        self.repo = repo
+        self.origin = origin
+        self.prefix = transport.name
+
+    def call(self, name, params=None):
+        return self.transport.call(name, params or {})
+
+    def commit_file(self, path, text, message):
+        with open(os.path.join(self.repo, path), 'a') as f:
+            f.write(text)
+        git(self.repo, 'add', '--', path)
+        git(self.repo, 'commit', '-q', '-m', message, '--', path)
+
+
+# ---- 시나리오 ----
+# prepare(ctx, i) -> params (측정 제외), cleanup(ctx, i, result) (측정 제외)
+
+def scenario(params=None, prepare=None, cleanup=None):
+    return {"params": params or {}, "prepare": prepare, "cleanup": cleanup}
+
+
+def _touch_and_stage(ctx, i):
+    path = f'bench/{ctx.prefix}/commit{i}.txt'
+    os.makedirs(os.path.join(ctx.repo, os.path.dirname(path)), exist_ok=True)
+    with open(os.path.join(ctx.repo, path), 'w') as f:
+        f.write(f'commit {i}\n')
+    return {'message': f'bench commit {i}', 'files': [path]}
+
+
+def _merge_source(ctx, i):
+    branch = f'bench/{ctx.prefix}/merge{i}'
+    git(ctx.repo, 'branch', branch, 'HEAD~1')
+    tree_path = f'bench/{ctx.prefix}/merge{i}.txt'
+    # 작업 트리를 건드리지 않고 브랜치에 커밋 하나 추가
+    blob = git(ctx.repo, 'hash-object', '-w', '--stdin', input=f'merge {i}\n'.encode()).strip()
+    env_index = os.path.join(ctx.repo, '.git', f'bench-index-{ctx.prefix}')
+    subprocess.run(['git', 'read-tree', branch], cwd=ctx.repo, check=True,
+                   env=dict(os.environ, GIT_INDEX_FILE=env_index))
+    subprocess.run(['git', 'update-index', '--add', '--cacheinfo', f'100644,{blob},{tree_path}'],
+                   cwd=ctx.repo, check=True, env=dict(os.environ, GIT_INDEX_FILE=env_index))
+    tree = subprocess.run(['git', 'write-tree'], cwd=ctx.repo, check=True, stdout=subprocess.PIPE,
+                          env=dict(os.environ, GIT_INDEX_FILE=env_index)).stdout.decode().strip()
+    os.remove(env_index)
+    commit = git(ctx.repo, 'commit-tree', tree, '-p', branch, '-m', f'merge source {i}').strip()
+    git(ctx.repo, 'update-ref', f'refs/heads/{branch}', commit)
+    return branch
+
+
+def _background_search(ctx):
+    return ctx.call('search_code', {'pattern': 'token', 'max_results': 50, 'background': True})["job_id"]
+
+
+def _delete_tag(ctx, i):
+    name = f'bench-{ctx.prefix}-delete{i}'
+    git(ctx.repo, 'tag', name, 'HEAD')
+    return {'tag_name': name}
+
+
+def _remove_remote(ctx, i):
+    name = f'bench-{ctx.prefix}-rm{i}'
+    git(ctx.repo, 'remote', 'add', name, ctx.origin)
+    return {'name': name}
+
+
+def _push_commit(ctx, i):
+    ctx.commit_file(file_path(5), f'push {i}\n', f'push {i}')
+    return {'remote': 'origin', 'branch': 'main'}
+
+
+def _release_worktree(ctx, i):
+    lease = ctx.call('lease_worktree', {'branch': f'feature/b{i % 10}'})
+    return {'lease_id': lease["lease_id"]}
+
+
+SCENARIOS = {
+    # 읽기
+    'get_repo_status': scenario(),
+    'get_commit_history': scenario({'limit': 50}),
+    'find_commits_by_path': scenario({'path': BLAME_PATH, 'limit': 50}),
+    'find_commits_by_author': scenario({'author': 'author3@example.com', 'limit': 50}),
+    'search_commit_messages': scenario({'text': 'performance regression', 'limit': 50}),
+    'update_commit_index': scenario(),
+    'read_file_at': scenario({'path': file_path(2), 'revision': 'HEAD~5'}),
+    'blame': scenario({'path': BLAME_PATH, 'revision': 'HEAD'}),
+    'search_code': scenario({'pattern': 'gamma delta', 'max_results': 200}),
+    'get_branch_info': scenario(),
+    'list_refs': scenario({'kinds': ['tag'], 'sort': '-version', 'limit': 100}),
+    'list_tags': scenario(),
+    'list_remotes': scenario(),
+    'list_repositories': scenario(),
+    'get_repository_cache_stats': scenario(),
+    'get_cache_stats': scenario(),
+    'get_server_metrics': scenario(),
+    'get_diff_stats': scenario({'base': 'HEAD~20', 'target': 'HEAD', 'hunks': True}),
+    'preview_merge': scenario({'source_branch': 'feature/b3'}),
+    'list_worktrees': scenario(),
+    'list_jobs': scenario(),
+    'get_job': scenario(prepare=lambda ctx, i: {'job_id': _background_search(ctx)}),
+    'cancel_job': scenario(prepare=lambda ctx, i: {'job_id': _background_search(ctx)}),
+    # 쓰기
+    'commit_changes': scenario(prepare=_touch_and_stage),
+    'create_branch': scenario(prepare=lambda ctx, i: {'branch_name': f'bench/{ctx.prefix}/branch{i}'}),
+    'switch_branch': scenario(
+        prepare=lambda ctx, i: {'branch_name': f'feature/b{10 + i % 10}'},
+        cleanup=lambda ctx, i, result: git(ctx.repo, 'checkout', '-q', 'main'),
+    ),
+    'merge_branch': scenario(prepare=lambda ctx, i: {'source_branch': _merge_source(ctx, i),
+                                                     'message': f'bench merge {i}'}),
+    'create_tag': scenario(prepare=lambda ctx, i: {'tag_name': f'bench-{ctx.prefix}-tag{i}',
+                                                   'message': 'bench tag'}),
+    'delete_tag': scenario(prepare=_delete_tag),
+    'add_remote': scenario(
+        prepare=lambda ctx, i: {'name': f'bench-{ctx.prefix}-add{i}', 'url': ctx.origin},
+        cleanup=lambda ctx, i, result: git(ctx.repo, 'remote', 'remove', f'bench-{ctx.prefix}-add{i}'),
+    ),
+    'remove_remote': scenario(prepare=_remove_remote),
+    'set_remote_url': scenario(prepare=lambda ctx, i: {'name': 'origin', 'url': ctx.origin}),
+    'fetch_changes': scenario({'remote': 'origin'}),
+    'push_changes': scenario(prepare=_push_commit),
+    'pull_changes': scenario({'remote': 'origin', 'branch': 'main'}),
+    'lease_worktree': scenario(
+        prepare=lambda ctx, i: {'branch': f'feature/b{i % 10}'},
+        cleanup=lambda ctx, i, result: ctx.call('release_worktree', {'lease_id': result["lease_id"]}),
+    ),
+    'release_worktree': scenario(prepare=_release_worktree),
+    # GitHub (가짜 서버)
+    'list_pull_requests': scenario(dict(OWNER, state='open', limit=50)),
+    'get_pull_request': scenario(dict(OWNER, pull_number=7)),
+    'get_pull_requests': scenario(dict(OWNER, numbers=list(range(1, 21)))),
+    'create_pull_request': scenario(prepare=lambda ctx, i: dict(
+        OWNER, title=f'bench {i}', body='bench', head=f'feature/b{i % 10}', base='main')),
+    'update_pull_request': scenario(prepare=lambda ctx, i: dict(OWNER, pull_number=5, title=f'bench title {i}')),
+    'merge_pull_request': scenario(prepare=lambda ctx, i: dict(OWNER, pull_number=100 + i)),
+}
+
+
+# ---- 전송 ----
+
+def _decode(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class InProcess:
+    """main 을 import 해 직접 호출 (MCP 경로와 같은 결과 직렬화 포함)"""
+
+    name = 'inprocess'
+
+    def start(self, env):
+        os.environ.update(env)
+        started = time.perf_counter()
+        import main as server
+        import logging
+        logging.disable(logging.INFO)
+        self.server = server
+        self.startup_ms = round((time.perf_counter() - started) * 1000, 1)
+        return sorted(server.registry.names())
+
+    def call(self, name, params):
+        try:
+            result = self.server.call_tool(name, params)
+        except Exception as e:
+            raise ToolFailed(str(e))
+        if isinstance(result, list):
+            return [_decode(item) if isinstance(item, str) else item for item in result]
+        return _decode(result) if isinstance(result, str) else result
+
+    def peak_rss_kb(self):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def close(self):
+        pass
+
+
+class Stdio:
+    """main.py 를 하위 프로세스로 띄워 MCP stdio 로 호출"""
+
+    name = 'stdio'
+
+    def start(self, env):
+        self._ids = itertools.count(1)
+        started = time.perf_counter()
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, 'main.py')], cwd=ROOT,
+            env=dict(os.environ, **env, GIT_MCP_LOG_LEVEL='WARNING'),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        self._request('initialize', {
+            'protocolVersion': '2024-11-05', 'capabilities': {},
+            'clientInfo': {'name': 'git-mcp-bench', 'version': '1.0'},
+        })
+        self.startup_ms = round((time.perf_counter() - started) * 1000, 1)
+        self._send({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        return sorted(tool["name"] for tool in self._request('tools/list', {})["tools"])
+
+    def _send(self, message):
+        self.proc.stdin.write(json.dumps(message).encode() + b'\n')
+        self.proc.stdin.flush()
+
+    def _request(self, method, params):
+        request_id = next(self._ids)
+        self._send({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+        while True:
+            line = self.proc.stdout.readline()
+            if not line:
+                raise RuntimeError(f"서버가 종료됨 (exit {self.proc.poll()})")
+            message = json.loads(line)
+            # 알림(진행, 리소스 변경 등)은 건너뛴다
+            if message.get('id') != request_id:
+                continue
+            if 'error' in message:
+                raise ToolFailed(message['error'].get('message'))
+            return message['result']
+
+    def call(self, name, params):
+        result = self._request('tools/call', {'name': name, 'arguments': params})
+        texts = [item.get('text') for item in result.get('content', []) if item.get('type') == 'text']
+        if result.get('isError'):
+            raise ToolFailed(' '.join(texts))
+        values = [_decode(text) for text in texts]
+        return values[0] if len(values) == 1 else values
+
+    def peak_rss_kb(self):
+        try:
+            with open(f'/proc/{self.proc.pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
+
+    def close(self):
+        # MCP SDK 의 stdio 서버는 stdin EOF 에 종료하지 않으므로 클라이언트처럼 종료시킨다
+        self.proc.stdin.close()
+        self.proc.terminate()
+        self.proc.wait()
+
+
+def run_transport(transport, repo, origin, github_url, names, iterations):
+    env = {
+        **GIT_ENV,
+        'GIT_REPO_PATH': repo,
+        'GITHUB_TOKEN': 'bench-token',
+        'GITHUB_API_URL': github_url,
+    }
+    registered = transport.start(env)
+    ctx = Context(transport, repo, origin)
+    tools = {}
+    try:
+        for name in names:
+            spec = SCENARIOS[name]
+            samples, errors = [], []
+            cold = None
+            for i in range(iterations + 1):
+                params = spec["prepare"](ctx, i) if spec["prepare"] else dict(spec["params"])
+                start = time.perf_counter()
+                try:
+                    result = transport.call(name, params)
+                except ToolFailed as e:
+                    result = None
+                    errors.append(str(e)[:200])
+                elapsed = (time.perf_counter() - start) * 1000
+                if i == 0:
+                    cold = round(elapsed, 3)
+                else:
+                    samples.append(elapsed)
+                if spec["cleanup"] and result is not None:
+                    spec["cleanup"](ctx, i, result)
+            tools[name] = dict(summarize(samples), cold_ms=cold, errors=len(errors),
+                               first_error=errors[0] if errors else None)
+        peak = transport.peak_rss_kb()
+    finally:
+        transport.close()
+    return {
+        "startup_ms": transport.startup_ms,
+        "peak_rss_kb": peak,
+        "registered_tools": registered,
+        "tools": tools,
+    }
+
+
+# ---- 비교 ----
+
+def compare(baseline, current, threshold, min_delta_ms):
+    """baseline 대비 느려진 도구 / RSS 증가 목록"""
+    regressions = []
+    for transport, result in current["transports"].items():
+        base = baseline.get("transports", {}).get(transport)
+        if not base:
+            continue
+        for name, stats in result["tools"].items():
+            old = base["tools"].get(name)
+            if not old:
+                continue
+            for key in ('p50_ms', 'p95_ms'):
+                before, after = old.get(key) or 0.0, stats.get(key) or 0.0
+                if after - before >= min_delta_ms and after >= before * threshold:
+                    regressions.append({
+                        "transport": transport, "tool": name, "metric": key,
+                        "baseline": before, "current": after,
+                        "ratio": round(after / before, 2) if before else None,
+                    })
+        before, after = base.get("peak_rss_kb"), result.get("peak_rss_kb")
+        if before and after and after >= before * threshold:
+            regressions.append({
+                "transport": transport, "tool": None, "metric": "peak_rss_kb",
+                "baseline": before, "current": after, "ratio": round(after / before, 2),
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--commits', type=int, default=1000)
+    parser.add_argument('--branches', type=int, default=100)
+    parser.add_argument('--tags', type=int, default=500)
+    parser.add_argument('--dirty-ratio', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--transport', choices=('both', 'inprocess', 'stdio'), default='both')
+    parser.add_argument('--tools', default=None, help='쉼표로 구분한 도구 이름 (기본: 전체)')
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', default=None, help='비교할 기준 결과 JSON')
+    parser.add_argument('--results', default=None, help='--compare 와 함께: 실행 대신 이 결과 파일을 비교')
+    parser.add_argument('--threshold', type=float, default=1.5)
+    parser.add_argument('--min-delta-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+    else:
+        results = run_suite(args)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+
+    failed = not all(results["checks"].values())
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold, args.min_delta_ms)
+        results = dict(results, comparison={
+            "baseline": args.compare, "threshold": args.threshold,
+            "min_delta_ms": args.min_delta_ms, "regressions": regressions,
+        })
+        failed = failed or bool(regressions)
+    report('suite', results)
+    if failed:
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+def run_suite(args):
+    if args.branches < 20:
+        # worktree 임대는 feature/b0-9, 브랜치 전환은 feature/b10-19 를 쓴다
+        raise SystemExit("--branches 는 20 이상이어야 합니다")
+    names = args.tools.split(',') if args.tools else sorted(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"시나리오가 없는 도구: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    source = generate(args.files, args.commits, args.branches, args.tags, args.dirty_ratio, seed=args.seed)
+    generate_s = round(time.perf_counter() - started, 2)
+
+    transports = [InProcess(), Stdio()] if args.transport == 'both' else \
+        [InProcess() if args.transport == 'inprocess' else Stdio()]
+    measured = {}
+    with FakeGitHub(prs=300) as github:
+        for transport in transports:
+            # 쓰기 도구가 저장소를 바꾸므로 전송마다 복사본 사용
+            repo = source["path"] + f'-{transport.name}'
+            origin = repo + '.origin.git'
+            shutil.copytree(source["path"], repo, symlinks=True)
+            shutil.copytree(source["origin"], origin, symlinks=True)
+            git(repo, 'remote', 'set-url', 'origin', origin)
+            measured[transport.name] = run_transport(transport, repo, origin, github.url, names,
+                                                     args.iterations)
+
+    registered = set(itertools.chain.from_iterable(r.pop("registered_tools") for r in measured.values()))
+    checks = {
+        "all_tools_covered": not sorted(registered - set(SCENARIOS)),
+        "no_errors": all(stats["errors"] == 0 for r in measured.values() for stats in r["tools"].values()),
+    }
+    return {
+        "config": {
+            "files": args.files, "commits": args.commits, "branches": args.branches, "tags": args.tags,
+            "dirty_ratio": args.dirty_ratio, "seed": args.seed, "iterations": args.iterations,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "git": git(ROOT, 'version').strip(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "generate_s": generate_s,
+        "repo": source["path"],
+        "uncovered_tools": sorted(registered - set(SCENARIOS)),
+        "transports": measured,
+        "checks": checks,
+    }
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""벤치마크 공용 유틸리티"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+GIT_ENV = {
+    'GIT_AUTHOR_NAME': 'bench',
+    'GIT_AUTHOR_EMAIL': 'bench@example.com',
+    'GIT_COMMITTER_NAME': 'bench',
+    'GIT_COMMITTER_EMAIL': 'bench@example.com',
+}
+
+
+def git(cwd, *args, input=None):
+    """git 명령 실행 후 stdout 반환"""
+    env = dict(os.environ, **GIT_ENV)
+    result = subprocess.run(
+        ['git', *args], cwd=cwd, env=env, input=input,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+    )
+    return result.stdout.decode('utf-8', 'replace')
+
+
+def make_repo(files=100, commits=10, path=None):
+    """파일 files 개, 커밋 commits 개짜리 임시 저장소 생성"""
+    path = path or tempfile.mkdtemp(prefix='git-mcp-bench-')
+    git(path, 'init', '-q', '-b', 'main')
+    for c in range(commits):
+        for i in range(files):
+            if c == 0 or i % max(commits, 1) == c:
+                sub = os.path.join(path, f'dir{i % 10}')
+                os.makedirs(sub, exist_ok=True)
+                with open(os.path.join(sub, f'file{i}.txt'), 'w') as f:
+                    f.write(f'file {i} revision {c}\n')
+        git(path, 'add', '-A')
+        git(path, 'commit', '-q', '-m', f'commit {c}')
+    return path
+
+
+def timed(fn, iterations):
+    """fn 을 iterations 번 실행하고 호출별 소요 시간(ms) 목록 반환"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    """지연 시간 요약 (ms)"""
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples), 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+    }
+
+
+def report(name, results):
+    """결과를 JSON 으로 출력"""
+    print(json.dumps({'benchmark': name, 'results': results}, indent=2, ensure_ascii=False))
@@ -0,0 +1,197 @@
+"""로컬 GitHub API 스텁 서버 (벤치마크 / 클라이언트 검증용)
+
+풀 리퀘스트 목록/조회/생성/수정/병합만 흉내 낸다. ETag / 304, X-RateLimit 헤더,
+Link 페이지네이션을 지원하고 연결 수와 요청 수를 센다.
+
+사용 예:
+    with FakeGitHub(prs=250) as server:
+        client = GitHubClient(token='x', base_url=server.url)
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_PULLS = re.compile(r'^/repos/([^/]+)/([^/]+)/pulls(?:/(\d+))?(/merge)?$')
+
+
+def make_pull(number, owner='octo', name='repo'):
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "state": "open",
+        "html_url": f"https://github.com/{owner}/{name}/pull/{number}",
+        "user": {"login": f"user{number % 7}"},
+        "head": {"ref": f"feature/{number}", "sha": hashlib.sha1(str(number).encode()).hexdigest()},
+        "base": {"ref": "main"},
+        "body": "x" * 2000,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+        "draft": False,
+        "merged": False,
+    }
+
+
+class FakeGitHub:
+    """스레드 HTTP/1.1 서버 (keep-alive)"""
+
+    def __init__(self, prs=10, delay=0.0, rate_limit=5000, reset_in=3600):
+        self.pulls = {n: make_pull(n) for n in range(1, prs + 1)}
+        self.delay = delay
+        self.limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_in = reset_in
+        self.reset_at = int(time.time()) + reset_in
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.RLock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 따로 쓰므로 Nagle 을 끄지 않으면 지연 ACK 와 겹쳐 응답마다 ~40ms 지연
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with fake.lock:
+                    fake.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=None, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                with fake.lock:
+                    remaining = fake.remaining
+                self.send_header('X-RateLimit-Limit', str(fake.limit))
+                self.send_header('X-RateLimit-Remaining', str(remaining))
+                self.send_header('X-RateLimit-Reset', str(fake.reset_at))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _body(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length)) if length else {}
+
+            def _route(self, method):
+                with fake.lock:
+                    fake.requests += 1
+                if fake.delay:
+                    time.sleep(fake.delay)
+                parsed = urlparse(self.path)
+                match = _PULLS.match(parsed.path)
+                if not match:
+                    return self._send(404, {"message": "Not Found"})
+                owner, name, number, merge = match.groups()
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+                if method == 'GET':
+                    if number:
+                        body = fake.pulls.get(int(number))
+                        if body is None:
+                            return self._send(404, {"message": "Not Found"})
+                        headers = {}
+                    else:
+                        body, headers = self._page(parsed.path, query)
+                    etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+                    if self.headers.get('If-None-Match') == etag:
+                        # 조건부 요청은 rate limit 를 차감하지 않는다
+                        with fake.lock:
+                            fake.not_modified += 1
+                        return self._send(304, None, dict(headers, ETag=etag))
+                    if not self._charge():
+                        return
+                    return self._send(200, body, dict(headers, ETag=etag))
+
+                if not self._charge():
+                    return
+                data = self._body()
+                with fake.lock:
+                    if method == 'POST' and not number:
+                        new = max(fake.pulls, default=0) + 1
+                        pull = make_pull(new, owner, name)
+                        pull.update({k: data[k] for k in ('title', 'body') if k in data})
+                        fake.pulls[new] = pull
+                        return self._send(201, pull)
+                    pull = fake.pulls.get(int(number)) if number else None
+                    if pull is None:
+                        return self._send(404, {"message": "Not Found"})
+                    if method == 'PATCH' and not merge:
+                        pull.update({k: data[k] for k in ('title', 'body', 'state') if k in data})
+                        return self._send(200, pull)
+                    if method == 'PUT' and merge:
+                        pull.update({"merged": True, "state": "closed"})
+                        return self._send(200, {"merged": True, "sha": pull["head"]["sha"]})
+                return self._send(405, {"message": "Method Not Allowed"})
+
+            def _charge(self):
+                with fake.lock:
+                    if time.time() >= fake.reset_at:
+                        fake.remaining = fake.limit
+                        fake.reset_at = int(time.time()) + fake.reset_in
+                    if fake.remaining <= 0:
+                        exhausted = True
+                    else:
+                        fake.remaining -= 1
+                        exhausted = False
+                if exhausted:
+                    self._send(403, {"message": "API rate limit exceeded"})
+                    return False
+                return True
+
+            def _page(self, path, query):
+                state = query.get('state', 'open')
+                pulls = [p for n, p in sorted(fake.pulls.items(), reverse=True)
+                         if state == 'all' or p["state"] == state]
+                per_page = min(int(query.get('per_page', 30)), 100)
+                page = int(query.get('page', 1))
+                last = max(1, -(-len(pulls) // per_page))
+                links = []
+                base = f'{fake.url}{path}?state={state}&per_page={per_page}'
+                if page < last:
+                    links.append(f'<{base}&page={page + 1}>; rel="next"')
+                    links.append(f'<{base}&page={last}>; rel="last"')
+                if page > 1:
+                    links.append(f'<{base}&page={page - 1}>; rel="prev"')
+                    links.append(f'<{base}&page=1>; rel="first"')
+                headers = {'Link': ', '.join(links)} if links else {}
+                return pulls[(page - 1) * per_page:page * per_page], headers
+
+            def do_GET(self):
+                self._route('GET')
+
+            def do_POST(self):
+                self._route('POST')
+
+            def do_PATCH(self):
+                self._route('PATCH')
+
+            def do_PUT(self):
+                self._route('PUT')
+
+        return Handler
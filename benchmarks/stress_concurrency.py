@@ -0,0 +1,104 @@
+"""동시성 스트레스 테스트 - 한 저장소에 50개 클라이언트가 동시에 도구 호출
+
+FastMCP 도구 경로(실행기 + 저장소 읽기/쓰기 잠금)를 그대로 사용한다.
+모든 호출이 성공하고, 커밋/태그 수가 기대값과 같으며 git fsck 가 통과해야 한다.
+
+사용법: python benchmarks/stress_concurrency.py [--clients 50] [--rounds 4]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from common import git, make_repo, report, summarize
+
+READ_CALLS = [
+    ("get_repo_status", {}),
+    ("get_branch_info", {}),
+    ("get_commit_history", {"limit": 20, "fields": ["hash", "subject"]}),
+    ("list_tags", {}),
+    ("get_diff_stats", {}),
+]
+
+
+async def client(server, client_id, rounds, latencies, errors):
+    for round_no in range(rounds):
+        calls = list(READ_CALLS)
+        path = os.path.join(os.environ['GIT_REPO_PATH'], 'clients', f'client{client_id}.txt')
+        with open(path, 'a') as f:
+            f.write(f'round {round_no}\n')
+        calls.append(("commit_changes", {
+            "message": f"client {client_id} round {round_no}",
+            "files": [f'clients/client{client_id}.txt'],
+        }))
+        calls.append(("create_tag", {"tag_name": f"c{client_id}-r{round_no}"}))
+        for name, params in calls:
+            start = time.perf_counter()
+            try:
+                await server.mcp.call_tool(name, params)
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+            latencies.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+
+
+async def run(server, clients, rounds):
+    latencies, errors = {}, []
+    await asyncio.gather(*[
+        client(server, i, rounds, latencies, errors) for i in range(clients)
+    ])
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=4)
+    args = parser.parse_args()
+
+    path = make_repo(files=200, commits=5)
+    os.makedirs(os.path.join(path, 'clients'))
+    os.environ['GIT_REPO_PATH'] = path
+    git(path, 'config', 'user.name', 'bench')
+    git(path, 'config', 'user.email', 'bench@example.com')
+    import main as server
+    logging.disable(logging.INFO)
+
+    start = time.perf_counter()
+    latencies, errors = asyncio.run(run(server, args.clients, args.rounds))
+    elapsed = time.perf_counter() - start
+
+    expected = args.clients * args.rounds
+    commits = int(git(path, 'rev-list', '--count', 'HEAD')) - 5
+    tags = len(git(path, 'tag').split())
+    fsck_ok = True
+    try:
+        git(path, 'fsck', '--no-progress', '--strict')
+    except Exception:
+        fsck_ok = False
+    dirty = git(path, 'status', '--porcelain').strip()
+
+    results = {
+        "clients": args.clients,
+        "rounds": args.rounds,
+        "seconds": round(elapsed, 2),
+        "errors": errors[:20],
+        "error_count": len(errors),
+        "commits": commits,
+        "tags": tags,
+        "expected": expected,
+        "fsck_ok": fsck_ok,
+        "clean_work_tree": not dirty,
+        "latency": {name: summarize(samples) for name, samples in latencies.items()},
+    }
+    report('stress_concurrency', results)
+    ok = not errors and commits == expected and tags == expected and fsck_ok and not dirty
+    if not ok:
+        print(json.dumps({"status": "FAILED"}), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
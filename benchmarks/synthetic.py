@@ -0,0 +1,158 @@
+"""합성 대형 저장소 생성기
+
+git fast-import 로 파일 / 커밋 / 브랜치 / 태그 수를 지정한 저장소를 만들고, 작업 트리에
+dirty_ratio 비율만큼 수정 / 스테이징 / 추적되지 않는 파일을 남긴다. 같은 인자와 seed 면
+커밋 SHA 까지 같은 저장소가 만들어진다 (작성 시각 고정).
+
+- 파일: dir<a>/sub<b>/file<i>.txt. i % 4 == 0 인 파일("cold")은 첫 커밋 이후 바뀌지 않으며
+  dirty 수정은 이 파일들에만 한다 (브랜치 전환 / 병합이 dirty 파일과 충돌하지 않도록)
+- 커밋: 작성자 10명이 번갈아 가며 changes_per_commit 개 파일 수정. BLAME_PATH 는 10 커밋마다 수정
+- 브랜치: feature/b<i> - 히스토리 곳곳에서 갈라져 자기 파일 하나를 추가한 커밋
+- 태그: v<major>.<minor>.<patch> - 절반은 annotated
+- origin: 옆 디렉터리의 bare 복제본 (push / fetch / pull 용), main 의 upstream
+
+사용법: python benchmarks/synthetic.py [--files 10000] [--commits 1000] [--branches 100]
+                                      [--tags 500] [--dirty-ratio 0.01] [--seed 1] [--path DIR]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from common import git
+
+EPOCH = 1700000000
+AUTHORS = [(f'Author {n}', f'author{n}@example.com') for n in range(10)]
+BLAME_PATH = 'dir1/sub0/file1.txt'
+
+
+def file_path(i):
+    return f'dir{i % 100}/sub{(i // 100) % 10}/file{i}.txt'
+
+
+def _data(payload):
+    return f'data {len(payload)}\n'.encode() + payload + b'\n'
+
+
+def _content(i, revision, rng):
+    words = ' '.join(rng.choice(('alpha', 'beta', 'gamma', 'delta', 'token', 'value')) for _ in range(8))
+    lines = [f'file {i} revision {revision}', f'value = {i * 31 + revision}', words]
+    lines += [f'line {n} of file {i}' for n in range(rng.randint(5, 30))]
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def _commit(ref, mark, parent, number, message, changes):
+    name, email = AUTHORS[number % len(AUTHORS)]
+    when = EPOCH + number * 60
+    out = [f'commit {ref}\nmark :{mark}\n'.encode(),
+           f'author {name} <{email}> {when} +0000\n'.encode(),
+           f'committer {name} <{email}> {when} +0000\n'.encode(),
+           _data(message.encode())]
+    if parent:
+        out.append(f'from :{parent}\n'.encode())
+    for path, payload in changes:
+        out.append(f'M 100644 inline {path}\n'.encode() + _data(payload))
+    out.append(b'\n')
+    return b''.join(out)
+
+
+def _spread(count, total):
+    """1..total 구간에 count 개를 고르게 (커밋 마크)"""
+    if count <= 0:
+        return []
+    return [1 + (n * (total - 1)) // max(1, count - 1) if count > 1 else total for n in range(count)]
+
+
+def generate(files=10000, commits=1000, branches=100, tags=500, dirty_ratio=0.01,
+             changes_per_commit=3, seed=1, path=None):
+    """합성 저장소 생성 후 구성 정보 반환"""
+    if commits < 1 or files < 4:
+        raise ValueError("commits 는 1 이상, files 는 4 이상이어야 합니다")
+    rng = random.Random(seed)
+    path = path or tempfile.mkdtemp(prefix='git-mcp-synthetic-')
+    git(path, 'init', '-q', '-b', 'main')
+    hot = [i for i in range(files) if i % 4]
+    stream = [_commit('refs/heads/main', 1, None, 0, 'initial import',
+                      [(file_path(i), _content(i, 0, rng)) for i in range(files)])]
+    for number in range(1, commits):
+        touched = rng.sample(hot, min(changes_per_commit, len(hot)))
+        if number % 10 == 0 and 1 not in touched:
+            touched.append(1)
+        changes = [(file_path(i), _content(i, number, rng)) for i in touched]
+        message = f'update {len(touched)} files in commit {number}'
+        if number % 25 == 0:
+            message += '\n\nfix: performance regression in parser'
+        stream.append(_commit('refs/heads/main', number + 1, number, number, message, changes))
+
+    mark = commits
+    for n, base in enumerate(_spread(branches, commits)):
+        mark += 1
+        stream.append(_commit(f'refs/heads/feature/b{n}', mark, base, base,
+                              f'feature b{n}', [(f'branches/b{n}.txt', f'branch {n}\n'.encode())]))
+    for n, target in enumerate(_spread(tags, commits)):
+        name = f'v{n // 100}.{(n // 10) % 10}.{n % 10}'
+        if n % 2:
+            stream.append(f'reset refs/tags/{name}\nfrom :{target}\n\n'.encode())
+        else:
+            tagger = f'tagger Release <release@example.com> {EPOCH + target * 60} +0000\n'
+            stream.append(f'tag {name}\nfrom :{target}\n{tagger}'.encode() + _data(f'release {name}'.encode()))
+    git(path, 'fast-import', '--quiet', input=b''.join(stream))
+    git(path, 'reset', '-q', '--hard', 'main')
+
+    origin = path.rstrip('/') + '.origin.git'
+    git(os.path.dirname(origin), 'clone', '-q', '--bare', path, origin)
+    git(path, 'remote', 'add', 'origin', origin)
+    git(path, 'fetch', '-q', 'origin')
+    git(path, 'branch', '-q', '-u', 'origin/main', 'main')
+
+    # dirty 상태: cold 파일 수정(1/3 은 스테이징) + 추적되지 않는 파일
+    dirty = int(round(files * dirty_ratio))
+    cold = [i for i in range(files) if i % 4 == 0]
+    modified = rng.sample(cold, min(len(cold), (dirty + 1) // 2))
+    for n, i in enumerate(modified):
+        with open(os.path.join(path, file_path(i)), 'a') as f:
+            f.write(f'local edit {n}\n')
+    staged = [file_path(i) for i in modified[::3]]
+    if staged:
+        git(path, 'add', '--', *staged)
+    untracked = dirty - len(modified)
+    if untracked > 0:
+        os.makedirs(os.path.join(path, 'untracked'), exist_ok=True)
+        for n in range(untracked):
+            with open(os.path.join(path, 'untracked', f'new{n}.txt'), 'w') as f:
+                f.write(f'untracked {n}\n')
+
+    return {
+        "path": path,
+        "origin": origin,
+        "files": files,
+        "commits": commits,
+        "branches": branches,
+        "tags": tags,
+        "dirty_ratio": dirty_ratio,
+        "modified": len(modified),
+        "staged": len(staged),
+        "untracked": max(0, untracked),
+        "seed": seed,
+        "head": git(path, 'rev-parse', 'HEAD').strip(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--commits', type=int, default=1000)
+    parser.add_argument('--branches', type=int, default=100)
+    parser.add_argument('--tags', type=int, default=500)
+    parser.add_argument('--dirty-ratio', type=float, default=0.01)
+    parser.add_argument('--changes-per-commit', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--path', default=None)
+    args = parser.parse_args()
+    print(json.dumps(generate(args.files, args.commits, args.branches, args.tags, args.dirty_ratio,
+                              args.changes_per_commit, args.seed, args.path), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""파일 내용 / blame 조회 엔진
+
+리비전의 파일을 checkout 하지 않고 읽는다. 내용은 저장소 핸들의 persistent
+`git cat-file --batch` 프로세스에서 청크 단위로 스트리밍하므로 큰 blob 도 요청한
+구간만 메모리에 올린다 (구간을 지난 나머지는 디코딩 / 줄 분리 없이 청크 단위로 읽어
+버려 파이프를 비우고, 줄 단위 읽기에서는 전체 줄 수를 위해 개행만 센다).
+blame 은 `git blame --incremental` 출력을 파싱하며, 커밋 히스토리와 blob 은 불변이므로
+(커밋, 경로, blob, 줄 범위)를 키로 공유 결과 캐시에 보관한다.
+"""
+import base64
+
+from cache import result_cache
+import gitproc
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_LENGTH = 64 * 1024
+MAX_LENGTH = 4 * 1024 * 1024
+# git 과 같은 기준: 앞부분 8000 바이트에 NUL 이 있으면 바이너리
+BINARY_PROBE = 8000
+
+
+def _object(repo, revision, path):
+    """(커밋 SHA, blob SHA, 크기) - persistent cat-file --batch-check 사용"""
+    try:
+        commit = gitproc.decode(repo.git.get_object_header(f'{revision}^{{commit}}')[0])
+        blob, kind, size = repo.git.get_object_header(f'{commit}:{path}')
+    except ValueError:
+        raise ValueError(f"파일을 찾을 수 없음: {revision}:{path}")
+    if kind != b'blob':
+        raise ValueError(f"파일이 아닙니다 ({gitproc.decode(kind)}): {revision}:{path}")
+    return commit, gitproc.decode(blob), size
+
+
+def _line_range(line_range):
+    if not line_range:
+        return None
+    if len(line_range) != 2 or int(line_range[0]) < 1 or int(line_range[1]) < int(line_range[0]):
+        raise ValueError("line_range 는 [시작 줄, 끝 줄] 형식이어야 합니다 (1부터 시작)")
+    return int(line_range[0]), int(line_range[1])
+
+
+def read_blob(repo, revision, path, offset=0, length=None, line_range=None):
+    """revision 의 path 내용 일부를 읽음
+
+    offset / length: 바이트 구간 (length 기본 64KB, 최대 4MB)
+    line_range: [시작 줄, 끝 줄] - 주면 바이트 구간 대신 줄 단위로 반환 (텍스트 파일만)
+    바이너리 파일의 바이트 구간은 base64 로 반환한다.
+    """
+    commit, blob, size = _object(repo, revision, path)
+    lines = _line_range(line_range)
+    offset = max(0, int(offset or 0))
+    length = min(MAX_LENGTH, max(0, int(length))) if length is not None else DEFAULT_LENGTH
+
+    stream = repo.git.stream_object_data(blob)[3]
+    position = 0
+    probe = b''
+    binary = None
+    selected = []
+    selected_bytes = 0
+    line_no = 1
+    pending = b''
+    truncated = False
+    try:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if binary is None:
+                probe += chunk[:BINARY_PROBE - len(probe)]
+                if len(probe) >= BINARY_PROBE or position + len(chunk) >= size:
+                    binary = b'\0' in probe
+                    if binary and lines:
+                        raise ValueError(f"바이너리 파일은 줄 단위로 읽을 수 없습니다: {path}")
+            if lines is None:
+                start, end = offset - position, offset + length - position
+                if end > 0 and start < len(chunk):
+                    selected.append(chunk[max(0, start):end])
+                if position + len(chunk) >= offset + length and binary is not None:
+                    # 구간을 다 읽었으면 나머지는 finally 에서 버린다
+                    break
+            elif line_no > lines[1] or truncated:
+                # 구간을 지나면 디코딩 / 줄 분리 없이 개행 수만 센다 (total_lines)
+                # pending 은 마지막 줄이 개행 없이 끝나는지만 알면 되므로 한 바이트만 둔다
+                newline = chunk.rfind(b'\n')
+                if newline >= 0:
+                    line_no += chunk.count(b'\n')
+                    pending = chunk[newline + 1:newline + 2]
+                else:
+                    pending = pending[:1] or chunk[:1]
+            else:
+                # 요청 구간까지는 줄 단위로 나눠 보관
+                data = pending + chunk
+                parts = data.split(b'\n')
+                pending = parts.pop()
+                for part in parts:
+                    if lines[0] <= line_no <= lines[1]:
+                        if selected_bytes + len(part) > MAX_LENGTH:
+                            truncated = True
+                        elif not truncated:
+                            selected.append(part)
+                            selected_bytes += len(part) + 1
+                    line_no += 1
+            position += len(chunk)
+    finally:
+        # 다 읽지 않은 나머지를 한 번에 읽지 않도록 청크 단위로 비운다
+        while stream.read(CHUNK_SIZE):
+            pass
+
+    result = {
+        "revision": revision,
+        "commit": commit,
+        "path": path,
+        "blob": blob,
+        "size": size,
+        "binary": bool(binary),
+    }
+    if lines is None:
+        content = b''.join(selected)
+        result.update(
+            offset=offset,
+            length=len(content),
+            eof=offset + len(content) >= size,
+            encoding='base64' if binary else 'utf-8',
+            content=base64.b64encode(content).decode('ascii') if binary else gitproc.decode(content),
+        )
+        return result
+    if pending:
+        if lines[0] <= line_no <= lines[1] and not truncated:
+            selected.append(pending)
+        line_no += 1
+    total = line_no - 1
+    result.update(
+        start_line=lines[0],
+        end_line=lines[0] + len(selected) - 1 if selected else None,
+        total_lines=total,
+        truncated=truncated,
+        encoding='utf-8',
+        content='\n'.join(gitproc.decode(line) for line in selected),
+    )
+    return result
+
+
+def _parse_blame(records):
+    """blame --incremental 출력 -> (범위 목록, 커밋별 정보)"""
+    ranges = []
+    commits = {}
+    current = None
+    for raw in records:
+        line = gitproc.decode(raw)
+        if current is None:
+            sha, orig, final, count = line.split()[:4]
+            current = {"start": int(final), "lines": int(count), "commit": sha, "orig_start": int(orig)}
+            commits.setdefault(sha, {})
+            continue
+        key, _, value = line.partition(' ')
+        if key == 'filename':
+            # 범위 하나의 끝
+            current["orig_path"] = value
+            ranges.append(current)
+            current = None
+        elif key in ('author', 'author-mail', 'author-time', 'author-tz', 'committer', 'committer-time', 'summary'):
+            commits[current["commit"]][key.replace('-', '_')] = value
+        elif key == 'previous':
+            commits[current["commit"]]["previous"] = value.split(' ', 1)[0]
+    for info in commits.values():
+        if "author_mail" in info:
+            info["author_email"] = info.pop("author_mail").strip('<>')
+        for key in ('author_time', 'committer_time'):
+            if key in info:
+                info[key] = int(info[key])
+    ranges.sort(key=lambda r: r["start"])
+    return ranges, commits
+
+
+def blame(repo, revision, path, line_range=None):
+    """revision 기준 path 의 줄별 마지막 변경 커밋
+
+    반환: {commit, blob, ranges: [{start, lines, commit, orig_start, orig_path}], commits: {sha: 정보}, cache_hit}
+    """
+    commit, blob, _ = _object(repo, revision, path)
+    lines = _line_range(line_range)
+    key = [commit, path, blob, list(lines) if lines else None]
+    cached = result_cache.get('blame', key)
+    if cached is not None:
+        return dict(cached, revision=revision, cache_hit=True)
+
+    args = ['blame', '--incremental']
+    if lines:
+        args.append(f'-L{lines[0]},{lines[1]}')
+    args += [commit, '--', path]
+    records = gitproc.stream(repo.working_tree_dir, args, sep=b'\n')
+    try:
+        ranges, commits = _parse_blame(records)
+    finally:
+        records.close()
+    result = {
+        "commit": commit,
+        "path": path,
+        "blob": blob,
+        "line_range": list(lines) if lines else None,
+        "ranges": ranges,
+        "commits": commits,
+    }
+    result_cache.put('blame', key, result)
+    return dict(result, revision=revision, cache_hit=False)
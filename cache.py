@@ -0,0 +1,286 @@
+"""결과 캐시
+
+불변 객체(트리, 커밋 SHA)로 키를 만든 결과를 바이트 크기 제한 LRU 에 보관한다.
+
+ResultCache 는 도구들이 함께 쓰는 내용 주소(content-addressed) 결과 캐시다. 키에는 ref 이름이
+아니라 해석된 객체 ID 만 넣으므로 브랜치가 움직이면 키가 달라질 뿐 오래된 결과가 나오지 않는다.
+GIT_MCP_RESULT_CACHE_DIR 을 설정하면 SQLite 디스크 계층에도 저장해 재시작 후에도 재사용한다.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value):
+    """캐시 항목 크기 추정 (JSON 직렬화 길이)"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class LRUCache:
+    """스레드 안전한 바이트 크기 제한 LRU"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, size=None):
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._items[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def discard(self, predicate):
+        """predicate(key) 가 참인 항목 삭제 후 삭제한 개수 반환"""
+        with self._lock:
+            doomed = [key for key in self._items if predicate(key)]
+            for key in doomed:
+                self.bytes -= self._items.pop(key)[1]
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+DISK_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used);
+'''
+
+
+class DiskTier:
+    """SQLite 디스크 계층 - 크기 제한을 넘으면 가장 오래 쓰지 않은 항목부터 삭제"""
+
+    # 마지막 사용 시각은 이 간격(초)보다 오래됐을 때만 갱신해 읽기마다 쓰기가 생기지 않게 한다
+    TOUCH_INTERVAL = 60.0
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(DISK_SCHEMA)
+            self.bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, last_used FROM results WHERE namespace = ? AND key = ?', (namespace, key)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = time.time()
+        if now - row[1] > self.TOUCH_INTERVAL:
+            with conn:
+                conn.execute('UPDATE results SET last_used = ? WHERE namespace = ? AND key = ?', (now, namespace, key))
+        return json.loads(row[0])
+
+    def put(self, namespace, key, encoded):
+        size = len(encoded)
+        if size > self.max_bytes:
+            return
+        conn = self._connect()
+        with self._lock, conn:
+            old = conn.execute(
+                'SELECT size FROM results WHERE namespace = ? AND key = ?', (namespace, key)
+            ).fetchone()
+            conn.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)', (namespace, key, encoded, size, time.time())
+            )
+            self.bytes += size - (old[0] if old else 0)
+            if self.bytes > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """크기 제한의 90% 까지 오래된 항목 삭제 (lock / 트랜잭션 안에서 호출)"""
+        target = self.max_bytes * 0.9
+        rows = conn.execute('SELECT namespace, key, size FROM results ORDER BY last_used').fetchall()
+        doomed = []
+        for namespace, key, size in rows:
+            if self.bytes <= target:
+                break
+            doomed.append((namespace, key))
+            self.bytes -= size
+        conn.executemany('DELETE FROM results WHERE namespace = ? AND key = ?', doomed)
+        self.evictions += len(doomed)
+
+    def clear(self):
+        conn = self._connect()
+        with self._lock, conn:
+            conn.execute('DELETE FROM results')
+            self.bytes = 0
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ResultCache:
+    """도구 결과 공유 캐시 (메모리 LRU + 선택적 디스크 계층)
+
+    namespace 로 결과 종류(diff, history, blame ...)를 나누고, key 는 해석된 객체 ID 와
+    조회 옵션으로 만든 JSON 직렬화 가능한 값이어야 한다. 값도 JSON 직렬화 가능해야 한다.
+    """
+
+    def __init__(self, max_bytes, disk_path=None, disk_bytes=None):
+        self.memory = LRUCache(max_bytes)
+        self.disk = None
+        if disk_path:
+            try:
+                self.disk = DiskTier(disk_path, disk_bytes or 256 * 1024 * 1024)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"결과 캐시 디스크 계층을 열 수 없음 ({disk_path}): {str(e)}")
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """GIT_MCP_RESULT_CACHE_BYTES / GIT_MCP_RESULT_CACHE_DIR / GIT_MCP_RESULT_CACHE_DISK_BYTES"""
+        directory = os.getenv('GIT_MCP_RESULT_CACHE_DIR')
+        return cls(
+            int(os.getenv('GIT_MCP_RESULT_CACHE_BYTES', str(64 * 1024 * 1024))),
+            disk_path=os.path.join(directory, 'results.sqlite') if directory else None,
+            disk_bytes=int(os.getenv('GIT_MCP_RESULT_CACHE_DISK_BYTES', str(256 * 1024 * 1024))),
+        )
+
+    def _count(self, namespace, field):
+        with self._lock:
+            counts = self._counts.setdefault(namespace, {"hits": 0, "misses": 0, "stores": 0})
+            counts[field] += 1
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, separators=(',', ':'), sort_keys=True, default=str)
+
+    def get(self, namespace, key):
+        """캐시된 결과 (없으면 None)"""
+        encoded = self._key(key)
+        value = self.memory.get((namespace, encoded))
+        if value is None and self.disk is not None:
+            try:
+                value = self.disk.get(namespace, encoded)
+            except sqlite3.Error as e:
+                logger.debug(f"결과 캐시 디스크 조회 실패: {str(e)}")
+                value = None
+            if value is not None:
+                self.memory.put((namespace, encoded), value)
+        self._count(namespace, "misses" if value is None else "hits")
+        return value
+
+    def put(self, namespace, key, value):
+        encoded_key = self._key(key)
+        encoded = json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+        self.memory.put((namespace, encoded_key), value, size=len(encoded))
+        if self.disk is not None:
+            try:
+                self.disk.put(namespace, encoded_key, encoded)
+            except sqlite3.Error as e:
+                logger.debug(f"결과 캐시 디스크 저장 실패: {str(e)}")
+        self._count(namespace, "stores")
+
+    def memoize(self, namespace, key, compute):
+        """캐시된 결과 또는 compute() 결과를 저장 후 반환 -> (값, 적중 여부)"""
+        value = self.get(namespace, key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(namespace, key, value)
+        return value, False
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        with self._lock:
+            namespaces = {name: dict(counts) for name, counts in self._counts.items()}
+        for counts in namespaces.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = round(counts["hits"] / total, 3) if total else None
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+            "namespaces": namespaces,
+        }
+
+
+# 프로세스 전역 결과 캐시
+result_cache = ResultCache.from_env()
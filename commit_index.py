@@ -0,0 +1,371 @@
+"""영구 증분 커밋 인덱스 (SQLite)
+
+커밋, 작성자, 시각, 부모 관계, 변경 경로를 `.git/mcp-commit-index.sqlite` 에 저장한다.
+처음 한 번 전체를 색인한 뒤에는 마지막으로 색인한 팁 이후의 커밋만 추가하고,
+히스토리가 다시 쓰여 도달 불가능해진 커밋은 삭제한다.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import gitproc
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'mcp-commit-index.sqlite'
+SCHEMA_VERSION = '1'
+BATCH_SIZE = 2000
+FIELD_SEP = '\x1f'
+RECORD_START = '\x1e'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS commits (
+    id INTEGER PRIMARY KEY,
+    sha TEXT UNIQUE NOT NULL,
+    author_name TEXT,
+    author_email TEXT,
+    author_time INTEGER,
+    date TEXT,
+    committer_time INTEGER,
+    subject TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS commits_author_name ON commits(author_name COLLATE NOCASE, author_time);
+CREATE INDEX IF NOT EXISTS commits_author_email ON commits(author_email COLLATE NOCASE, author_time);
+CREATE INDEX IF NOT EXISTS commits_author_time ON commits(author_time);
+CREATE TABLE IF NOT EXISTS parents (
+    commit_id INTEGER NOT NULL,
+    parent_sha TEXT NOT NULL,
+    ord INTEGER NOT NULL,
+    PRIMARY KEY (commit_id, ord)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parents_parent ON parents(parent_sha);
+CREATE TABLE IF NOT EXISTS paths (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS touches (
+    path_id INTEGER NOT NULL,
+    commit_id INTEGER NOT NULL,
+    status TEXT,
+    PRIMARY KEY (path_id, commit_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS touches_commit ON touches(commit_id);
+CREATE TABLE IF NOT EXISTS tips (ref TEXT PRIMARY KEY, sha TEXT NOT NULL);
+'''
+
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5(
+    subject, body, content='commits', content_rowid='id'
+);
+'''
+
+
+def _has_fts5(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _to_timestamp(value):
+    """ISO 날짜 문자열 또는 유닉스 시각을 정수 타임스탬프로 변환"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if str(value).isdigit():
+        return int(value)
+    dt = datetime.fromisoformat(str(value))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class CommitIndex:
+    """저장소 하나의 커밋 인덱스"""
+
+    def __init__(self, work_tree, common_dir):
+        self.work_tree = work_tree
+        self.path = os.path.join(common_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._fts = None
+        self._checked_generation = None
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            self._fts = _has_fts5(conn)
+            if self._fts:
+                conn.executescript(FTS_SCHEMA)
+            version = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if version is None:
+                conn.execute("INSERT INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ---- 색인 ----
+
+    def _current_tips(self):
+        out = gitproc.output(self.work_tree, [
+            'for-each-ref',
+            '--format=%(refname)%00%(objecttype)%00%(objectname)%00%(*objecttype)%00%(*objectname)',
+            'refs/heads', 'refs/tags'
+        ])
+        tips = {}
+        for line in out.splitlines():
+            ref, kind, sha, peeled_kind, peeled = line.split('\0')
+            if kind == 'commit':
+                tips[ref] = sha
+            elif peeled_kind == 'commit':
+                tips[ref] = peeled
+        code, head = gitproc.run(self.work_tree, ['rev-parse', '--verify', '-q', 'HEAD^{commit}'], ok_codes=(0, 1))
+        if code == 0:
+            tips['HEAD'] = head.decode().strip()
+        return tips
+
+    def _rev_list(self, include, exclude):
+        if not include:
+            return []
+        args = ['rev-list', '--stdin']
+        data = '\n'.join(list(include) + [f'^{sha}' for sha in exclude]) + '\n'
+        return gitproc.output(self.work_tree, args, input=data.encode()).split()
+
+    def _existing(self, shas):
+        """오브젝트 DB 에 아직 남아 있는 커밋만 반환 (gc 로 사라진 이전 팁 제외)"""
+        if not shas:
+            return set()
+        data = ''.join(f'{sha}\n' for sha in shas).encode()
+        out = gitproc.output(self.work_tree, ['cat-file', '--batch-check=%(objectname) %(objecttype)'], input=data)
+        return {line.split()[0] for line in out.splitlines() if line.endswith(' commit')}
+
+    def update(self, rebuild=False, generation=None):
+        """마지막 색인 이후의 커밋을 반영하고 통계를 반환
+
+        generation: 갱신 시점의 refs 세대 번호 (get_index 가 같은 세대에서 다시 확인하지 않도록 기록)
+        """
+        with self._lock:
+            start = time.perf_counter()
+            conn = self._connect()
+            new_tips = self._current_tips()
+            old_tips = dict(conn.execute("SELECT ref, sha FROM tips").fetchall())
+            self._checked_generation = generation
+            removed = 0
+            if rebuild:
+                self._clear(conn)
+                old_tips = {}
+            elif set(old_tips.items()) == set(new_tips.items()):
+                return {"added": 0, "removed": 0, "seconds": 0.0, "commits": self._count(conn)}
+            old_shas = set(old_tips.values())
+            alive = self._existing(old_shas)
+            if alive != old_shas:
+                # 이전 팁이 gc 로 사라지면 도달 불가능한 커밋을 계산할 수 없으므로 전체 재색인
+                logger.info("이전 팁 커밋이 사라져 커밋 인덱스를 다시 만듭니다")
+                self._clear(conn)
+                alive = set()
+            else:
+                # 히스토리 재작성: 이전 팁에서만 도달 가능한 커밋 삭제
+                orphaned = self._rev_list(alive, set(new_tips.values()))
+                removed = self._delete(conn, orphaned)
+            added = self._index_commits(conn, set(new_tips.values()), alive)
+            conn.execute("DELETE FROM tips")
+            conn.executemany("INSERT INTO tips VALUES (?, ?)", new_tips.items())
+            conn.commit()
+            elapsed = time.perf_counter() - start
+            logger.info(f"커밋 인덱스 갱신: +{added} -{removed} ({elapsed:.2f}s)")
+            return {"added": added, "removed": removed, "seconds": round(elapsed, 3), "commits": self._count(conn)}
+
+    def _count(self, conn):
+        return conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+
+    def _clear(self, conn):
+        conn.execute("DELETE FROM touches")
+        conn.execute("DELETE FROM parents")
+        conn.execute("DELETE FROM commits")
+        conn.execute("DELETE FROM paths")
+        conn.execute("DELETE FROM tips")
+        if self._fts:
+            conn.execute("INSERT INTO messages(messages) VALUES ('delete-all')")
+
+    def _delete(self, conn, shas):
+        removed = 0
+        for i in range(0, len(shas), BATCH_SIZE):
+            batch = shas[i:i + BATCH_SIZE]
+            marks = ','.join('?' * len(batch))
+            rows = conn.execute(
+                f"SELECT id, subject, body FROM commits WHERE sha IN ({marks})", batch
+            ).fetchall()
+            ids = [row['id'] for row in rows]
+            if not ids:
+                continue
+            if self._fts:
+                conn.executemany(
+                    "INSERT INTO messages(messages, rowid, subject, body) VALUES ('delete', ?, ?, ?)",
+                    [(row['id'], row['subject'], row['body']) for row in rows]
+                )
+            id_marks = ','.join('?' * len(ids))
+            conn.execute(f"DELETE FROM touches WHERE commit_id IN ({id_marks})", ids)
+            conn.execute(f"DELETE FROM parents WHERE commit_id IN ({id_marks})", ids)
+            conn.execute(f"DELETE FROM commits WHERE id IN ({id_marks})", ids)
+            removed += len(ids)
+        return removed
+
+    def _path_id(self, conn, cache, path):
+        path_id = cache.get(path)
+        if path_id is None:
+            row = conn.execute("SELECT id FROM paths WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                path_id = conn.execute("INSERT INTO paths(path) VALUES (?)", (path,)).lastrowid
+            else:
+                path_id = row[0]
+            cache[path] = path_id
+        return path_id
+
+    def _index_commits(self, conn, include, exclude):
+        """include 에서 도달 가능하고 exclude 에서는 도달 불가능한 커밋을 색인"""
+        if not include:
+            return 0
+        fmt = RECORD_START + FIELD_SEP.join(['%H', '%P', '%an', '%ae', '%at', '%aI', '%ct', '%s', '%b'])
+        args = ['log', '-z', '--name-status', '--no-renames', f'--format={fmt}',
+                *include, *[f'^{sha}' for sha in exclude], '--']
+        path_ids = {}
+        added = 0
+        commit_id = None
+        status = None
+        for raw in gitproc.stream(self.work_tree, args):
+            token = gitproc.decode(raw)
+            if token.startswith(RECORD_START):
+                sha, parents, name, email, atime, date, ctime, subject, body = \
+                    token[1:].split(FIELD_SEP)
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO commits(sha, author_name, author_email, author_time, date, "
+                    "committer_time, subject, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (sha, name, email, int(atime), date, int(ctime), subject, body.strip())
+                )
+                if cur.rowcount == 0:
+                    # 이미 색인된 커밋 (예: 재색인 도중 중단된 경우)
+                    commit_id = None
+                    continue
+                commit_id = cur.lastrowid
+                conn.executemany(
+                    "INSERT INTO parents VALUES (?, ?, ?)",
+                    [(commit_id, parent, i) for i, parent in enumerate(parents.split())]
+                )
+                if self._fts:
+                    conn.execute(
+                        "INSERT INTO messages(rowid, subject, body) VALUES (?, ?, ?)",
+                        (commit_id, subject, body.strip())
+                    )
+                added += 1
+                if added % BATCH_SIZE == 0:
+                    conn.commit()
+                status = None
+            elif status is None:
+                status = token.strip()
+                if not status:
+                    status = None
+            else:
+                if commit_id is not None:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO touches VALUES (?, ?, ?)",
+                        (self._path_id(conn, path_ids, token), commit_id, status[0])
+                    )
+                status = None
+        return added
+
+    # ---- 조회 ----
+
+    def _rows(self, sql, params):
+        conn = self._connect()
+        return [{
+            "hash": row['sha'],
+            "subject": row['subject'],
+            "author": row['author_name'],
+            "author_email": row['author_email'],
+            "date": row['date'],
+        } for row in conn.execute(sql, params)]
+
+    def commits_by_path(self, path, limit=50):
+        """경로(파일 또는 디렉터리)를 변경한 커밋 - 최신순"""
+        path = path.strip('/')
+        conn = self._connect()
+        path_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM paths WHERE path = ? OR (path >= ? AND path < ?)",
+            (path, path + '/', path + '0')
+        )]
+        if not path_ids:
+            return []
+        marks = ','.join('?' * len(path_ids))
+        return self._rows(
+            f"SELECT DISTINCT c.* FROM touches t JOIN commits c ON c.id = t.commit_id "
+            f"WHERE t.path_id IN ({marks}) ORDER BY c.committer_time DESC LIMIT ?",
+            (*path_ids, limit)
+        )
+
+    def commits_by_author(self, author, since=None, until=None, limit=50):
+        """작성자 이름 또는 이메일이 일치하는 커밋 - 최신순"""
+        since, until = _to_timestamp(since), _to_timestamp(until)
+        sql = ("SELECT * FROM commits WHERE (author_name = ? COLLATE NOCASE OR author_email = ? COLLATE NOCASE)")
+        params = [author, author]
+        if since is not None:
+            sql += " AND author_time >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND author_time <= ?"
+            params.append(until)
+        sql += " ORDER BY author_time DESC LIMIT ?"
+        params.append(limit)
+        return self._rows(sql, params)
+
+    def search_messages(self, text, limit=50, oldest_first=False):
+        """커밋 메시지 검색 (FTS5 구문 검색, 사용 불가 시 LIKE)"""
+        order = 'ASC' if oldest_first else 'DESC'
+        if self._fts:
+            phrase = '"' + text.replace('"', '""') + '"'
+            return self._rows(
+                "SELECT c.* FROM messages m JOIN commits c ON c.id = m.rowid "
+                f"WHERE messages MATCH ? ORDER BY c.committer_time {order} LIMIT ?",
+                (phrase, limit)
+            )
+        pattern = f"%{text}%"
+        return self._rows(
+            f"SELECT * FROM commits WHERE subject LIKE ? OR body LIKE ? "
+            f"ORDER BY committer_time {order} LIMIT ?",
+            (pattern, pattern, limit)
+        )
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def open_index(repo):
+    """저장소용 커밋 인덱스 (갱신하지 않음)"""
+    key = os.path.realpath(repo.common_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = CommitIndex(repo.working_tree_dir or repo.git_dir, repo.common_dir)
+            _indexes[key] = index
+    return index
+
+
+def get_index(repo, generation=None):
+    """저장소용 커밋 인덱스를 열고 필요하면 증분 갱신
+
+    generation 은 refs 관련 세대 번호로, 지난 확인 이후 바뀌지 않았으면 팁 비교도 생략한다.
+    """
+    index = open_index(repo)
+    if generation is None or generation != index._checked_generation:
+        index.update(generation=generation)
+    return index
@@ -0,0 +1,162 @@
+"""도구 실행기와 저장소별 읽기/쓰기 잠금
+
+동기 도구를 제한된 스레드 풀에서 실행해 느린 push/pull 이 서버 이벤트 루프를
+막지 않게 한다. 같은 저장소에 대해 읽기 전용 도구는 함께 실행되고, 변경 도구는
+배타 잠금을 잡아 index 를 동시에 쓰지 않는다.
+"""
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv('GIT_MCP_MAX_WORKERS', '8'))
+LOCK_TIMEOUT = float(os.getenv('GIT_MCP_LOCK_TIMEOUT', '60'))
+
+
+class LockTimeout(Exception):
+    """저장소 잠금 대기 시간 초과"""
+
+
+class RWLock:
+    """쓰기 우선 읽기/쓰기 잠금
+
+    쓰기 대기자가 있으면 새 읽기 요청은 대기열에서 기다리므로 쓰기가 굶지 않는다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+
+    def acquire_read(self, timeout=None):
+        with self._cond:
+            self._waiting_readers += 1
+            try:
+                ok = self._cond.wait_for(
+                    lambda: not self._writer and not self._waiting_writers, timeout
+                )
+            finally:
+                self._waiting_readers -= 1
+            if not ok:
+                raise LockTimeout(f"저장소 읽기 잠금 대기 시간 초과 ({timeout}s)")
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self, timeout=None):
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                ok = self._cond.wait_for(
+                    lambda: not self._writer and self._readers == 0, timeout
+                )
+            finally:
+                self._waiting_writers -= 1
+            if not ok:
+                # 이 쓰기 대기 때문에 막혀 있던 읽기 요청을 깨운다
+                self._cond.notify_all()
+                raise LockTimeout(f"저장소 쓰기 잠금 대기 시간 초과 ({timeout}s)")
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def locked(self, write=False, timeout=None):
+        if write:
+            self.acquire_write(timeout)
+            try:
+                yield
+            finally:
+                self.release_write()
+        else:
+            self.acquire_read(timeout)
+            try:
+                yield
+            finally:
+                self.release_read()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "readers": self._readers,
+                "writer": self._writer,
+                "waiting_readers": self._waiting_readers,
+                "waiting_writers": self._waiting_writers,
+            }
+
+
+class RepoLocks:
+    """저장소 경로별 RWLock"""
+
+    def __init__(self):
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        key = os.path.realpath(key) if key else key
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = RWLock()
+            return lock
+
+    @contextmanager
+    def locked(self, key, write=False, timeout=None):
+        timeout = LOCK_TIMEOUT if timeout is None else timeout
+        lock = self.get(key)
+        start = time.perf_counter()
+        with lock.locked(write=write, timeout=timeout):
+            waited = time.perf_counter() - start
+            if waited > 1:
+                logger.info(f"저장소 잠금 대기 {waited:.2f}s ({'write' if write else 'read'}): {key}")
+            yield
+
+    def busy(self, key):
+        """잠금을 잡고 있거나 기다리는 호출이 있는지"""
+        with self._lock:
+            lock = self._locks.get(os.path.realpath(key) if key else key)
+        if lock is None:
+            return False
+        stats = lock.stats()
+        return bool(stats["readers"] or stats["writer"] or stats["waiting_readers"] or stats["waiting_writers"])
+
+    def stats(self):
+        with self._lock:
+            items = list(self._locks.items())
+        return {key: lock.stats() for key, lock in items}
+
+
+repo_locks = RepoLocks()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    """도구 실행용 제한 스레드 풀 (GIT_MCP_MAX_WORKERS)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='git-mcp-tool')
+        return _executor
+
+
+async def run_async(fn, *args, **kwargs):
+    """동기 함수를 도구 실행기에서 실행하고 결과를 기다린다"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), functools.partial(fn, *args, **kwargs))
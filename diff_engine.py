@@ -0,0 +1,191 @@
+"""구조화된 diff 엔진
+
+`git diff -z --raw --numstat` 한 번으로 파일별 상태, 추가/삭제 줄 수, 이름 변경/복사,
+바이너리 여부를 구하고, 요청 시 패치를 스트리밍해 바이트/줄 예산 안에서 hunk 를 붙인다.
+두 트리 사이의 diff 는 불변이므로 트리 쌍을 키로 공유 결과 캐시에 보관한다.
+"""
+import gitproc
+from cache import result_cache
+
+DEFAULT_MAX_BYTES = 256 * 1024
+DEFAULT_MAX_LINES = 5000
+
+
+def _range_args(base, target, cached):
+    args = []
+    if cached:
+        args.append('--cached')
+    # 리비전이 '-' 로 시작해도 옵션으로 해석되지 않게 한다
+    args.append('--end-of-options')
+    if base:
+        args.append(base)
+    if target:
+        args.append(target)
+    return args
+
+
+def _common_args(find_copies):
+    args = ['-M']
+    if find_copies:
+        args.append('-C')
+    return args
+
+
+def _parse_summary(records):
+    """--raw 와 --numstat 레코드를 파일 목록으로 변환"""
+    files = []
+    numstat_index = 0
+    records = iter(records)
+    for raw in records:
+        if not raw:
+            continue
+        token = gitproc.decode(raw)
+        if token.startswith(':'):
+            # :old_mode new_mode old_sha new_sha STATUS \0 path [\0 new_path]
+            meta = token[1:].split(' ')
+            status = meta[4]
+            entry = {
+                "path": None,
+                "old_path": None,
+                "status": status[0],
+                "additions": 0,
+                "deletions": 0,
+                "binary": False,
+            }
+            first = gitproc.decode(next(records, b''))
+            if status[0] in ('R', 'C'):
+                entry["old_path"] = first
+                entry["path"] = gitproc.decode(next(records, b''))
+                entry["similarity"] = int(status[1:] or 0)
+            else:
+                entry["path"] = first
+            files.append(entry)
+            continue
+        # added \t deleted \t path  (이름 변경이면 path 가 비고 뒤에 두 경로가 온다)
+        added, deleted, path = token.split('\t', 2)
+        if not path:
+            next(records, None)
+            next(records, None)
+        if numstat_index >= len(files):
+            continue
+        entry = files[numstat_index]
+        numstat_index += 1
+        if added == '-':
+            entry["binary"] = True
+        else:
+            entry["additions"] = int(added)
+            entry["deletions"] = int(deleted)
+    return files
+
+
+def _attach_hunks(records, files, max_bytes, max_lines):
+    """패치 스트림을 읽어 파일별 hunk 를 붙인다. 예산을 넘으면 True 반환"""
+    index = -1
+    current = None
+    used_bytes = 0
+    used_lines = 0
+    for raw in records:
+        line = gitproc.decode(raw)
+        if line.startswith('diff --git ') or line.startswith('diff --cc ') or line.startswith('diff --combined '):
+            index += 1
+            current = None
+            if index < len(files):
+                files[index]["hunks"] = []
+            continue
+        if index < 0 or index >= len(files):
+            continue
+        entry = files[index]
+        if line.startswith('@@'):
+            current = {"header": line, "lines": []}
+            entry["hunks"].append(current)
+        elif current is None:
+            # index / mode / rename / --- / +++ 등 파일 헤더 줄
+            continue
+        else:
+            current["lines"].append(line)
+        used_bytes += len(raw) + 1
+        used_lines += 1
+        if used_bytes > max_bytes or used_lines > max_lines:
+            entry["truncated"] = True
+            for rest in files[index + 1:]:
+                rest["hunks_omitted"] = True
+            return True
+    return False
+
+
+def iter_diff(work_tree, base=None, target=None, cached=False, paths=None, find_copies=False):
+    """파일별 diff 요약을 하나씩 생성 (hunk 제외)"""
+    args = ['diff', '-z', '--raw', '--numstat', '--no-color', *_common_args(find_copies),
+            *_range_args(base, target, cached), '--']
+    if paths:
+        args += list(paths)
+    records = gitproc.stream(work_tree, args)
+    try:
+        yield from _parse_summary(records)
+    finally:
+        records.close()
+
+
+def _tree(work_tree, revision):
+    """리비전 -> 트리 SHA (없으면 None)"""
+    if not revision:
+        return None
+    return gitproc.output(work_tree, ['rev-parse', '--verify', '--end-of-options', f'{revision}^{{tree}}']).strip()
+
+
+def _tree_key(work_tree, base, target):
+    """base/target 이 모두 커밋(트리)으로 해석되면 (base_tree, target_tree) 반환"""
+    if not base or not target:
+        return None
+    return _tree(work_tree, base), _tree(work_tree, target)
+
+
+def diff(work_tree, base=None, target=None, cached=False, paths=None, hunks=False,
+         context_lines=3, max_bytes=DEFAULT_MAX_BYTES, max_lines=DEFAULT_MAX_LINES,
+         find_copies=False):
+    """구조화된 diff 결과 반환
+
+    base/target 이 없으면 작업 트리 vs index (git diff 와 동일), base 만 있으면 base vs 작업 트리,
+    cached=True 면 index 기준으로 비교한다. 결과의 cache_hit 은 결과 캐시 적중 여부다.
+    """
+    key = None
+    trees = _tree_key(work_tree, base, target)
+    revisions = (base, target)
+    if trees is not None:
+        key = [list(trees), list(paths or ()), hunks, context_lines, max_bytes, max_lines, find_copies]
+        cached_result = result_cache.get('diff', key)
+        if cached_result is not None:
+            return dict(cached_result, base=base, target=target, cache_hit=True)
+        # 해석한 트리로 비교해야 그 사이 ref 가 움직여도 키와 결과가 어긋나지 않는다
+        revisions = trees
+    else:
+        # 한쪽만 주어진 경우에도 git diff 에는 검증된 트리 SHA 만 넘긴다
+        revisions = (_tree(work_tree, base), _tree(work_tree, target))
+
+    files = list(iter_diff(work_tree, *revisions, cached, paths, find_copies))
+    truncated = False
+    if hunks and files:
+        args = ['diff', '-p', f'-U{int(context_lines)}', '--no-color', '--no-ext-diff',
+                *_common_args(find_copies), *_range_args(*revisions, cached), '--']
+        if paths:
+            args += list(paths)
+        records = gitproc.stream(work_tree, args, sep=b'\n')
+        try:
+            truncated = _attach_hunks(records, files, max_bytes, max_lines)
+        finally:
+            records.close()
+
+    result = {
+        "base": base,
+        "target": target,
+        "files": files,
+        "files_changed": len(files),
+        "total_additions": sum(f["additions"] for f in files),
+        "total_deletions": sum(f["deletions"] for f in files),
+        "truncated": truncated,
+        "cache_hit": False,
+    }
+    if trees is not None:
+        result["trees"] = list(trees)
+        result_cache.put('diff', key, result)
+    return result
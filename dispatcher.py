@@ -0,0 +1,233 @@
+"""JSON-RPC 2.0 디스패처
+
+@tool() 로 등록된 함수 시그니처로 파라미터를 바인딩/검증하고, 배치 요청을 지원한다.
+배치 안에서 연속된 읽기 전용 호출은 동시에 실행하고, 쓰기 호출은 순서대로 실행한다.
+background 를 지원하는 도구는 background=true 로 호출하면 작업으로 실행되고 작업 정보를 바로 반환한다.
+"""
+import inspect
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC 2.0 오류 코드
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+_SIMPLE_TYPES = (str, int, float, bool, list, dict)
+
+
+class RPCError(Exception):
+    """JSON-RPC 오류 응답으로 변환되는 예외"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class ToolSpec:
+    """등록된 도구 정보"""
+
+    def __init__(self, fn, read_only, locked=True, background=False):
+        self.fn = fn
+        self.name = fn.__name__
+        self.read_only = read_only
+        # False 면 도구가 직접 필요한 구간에서만 저장소 잠금을 잡는다 (예: fetch 후 merge)
+        self.locked = locked
+        # True 면 background 인자로 작업 실행을 요청할 수 있다
+        self.background = background
+        self.signature = inspect.signature(fn)
+
+    def split_background(self, params):
+        """params 에서 background 플래그 분리 -> (params, background)"""
+        if not self.background or not isinstance(params, dict) or 'background' not in params:
+            return params, False
+        params = dict(params)
+        background = params.pop('background')
+        if background is not None and not isinstance(background, bool):
+            raise RPCError(INVALID_PARAMS, f"Invalid params for {self.name}: 'background' must be bool")
+        return params, bool(background)
+
+    def bind(self, params):
+        """params(dict 또는 list)를 시그니처에 바인딩하고 타입을 검증"""
+        if params is None:
+            params = {}
+        try:
+            if isinstance(params, dict):
+                bound = self.signature.bind(**params)
+            elif isinstance(params, list):
+                bound = self.signature.bind(*params)
+            else:
+                raise RPCError(INVALID_PARAMS, "params must be an object or array")
+        except TypeError as e:
+            raise RPCError(INVALID_PARAMS, f"Invalid params for {self.name}: {str(e)}")
+        for name, value in bound.arguments.items():
+            annotation = self.signature.parameters[name].annotation
+            if value is None or annotation not in _SIMPLE_TYPES:
+                continue
+            if annotation is float and isinstance(value, int) and not isinstance(value, bool):
+                continue
+            if annotation is int and isinstance(value, bool):
+                raise RPCError(INVALID_PARAMS, f"Invalid params for {self.name}: '{name}' must be int")
+            if not isinstance(value, annotation):
+                raise RPCError(
+                    INVALID_PARAMS,
+                    f"Invalid params for {self.name}: '{name}' must be {annotation.__name__}"
+                )
+        return bound
+
+
+class ToolRegistry:
+    """도구 이름 -> ToolSpec 레지스트리
+
+    locks 가 주어지면 도구 실행 시 lock_key(arguments) 로 정한 저장소 잠금을 잡는다
+    (읽기 전용 도구는 공유 잠금, 나머지는 배타 잠금).
+    jobs 가 주어지면 background=True 호출을 jobs.submit() 으로 넘기고, 취소된 작업은
+    on_cancel(job) 으로 정리한다 (읽기 전용 도구는 정리할 것이 없으므로 제외).
+    """
+
+    def __init__(self, max_workers=None, locks=None, lock_key=None, jobs=None, on_cancel=None):
+        self._tools = {}
+        self._locks = locks
+        self._lock_key = lock_key
+        self._jobs = jobs
+        self._on_cancel = on_cancel
+        self._max_workers = max_workers or int(os.getenv('GIT_MCP_BATCH_WORKERS', '8'))
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def register(self, fn, read_only=False, locked=True, background=False):
+        self._tools[fn.__name__] = ToolSpec(fn, read_only, locked, background and self._jobs is not None)
+        return fn
+
+    def get(self, name):
+        spec = self._tools.get(name)
+        if spec is None:
+            raise RPCError(METHOD_NOT_FOUND, f"Unknown method: {name}")
+        return spec
+
+    def names(self):
+        return list(self._tools)
+
+    def _invoke(self, spec, bound):
+        # 지연 시간은 잠금 대기를 포함한다 (호출자가 실제로 기다린 시간)
+        started = time.perf_counter()
+        error = True
+        try:
+            if self._locks is None or not spec.locked:
+                result = spec.fn(*bound.args, **bound.kwargs)
+            else:
+                key = self._lock_key(bound.arguments) if self._lock_key else None
+                with self._locks.locked(key, write=not spec.read_only):
+                    result = spec.fn(*bound.args, **bound.kwargs)
+            error = False
+            return result
+        finally:
+            metrics.observe_tool(spec.name, time.perf_counter() - started, error)
+
+    def _run(self, spec, params):
+        params, background = spec.split_background(params)
+        bound = spec.bind(params)
+        if not background:
+            return self._invoke(spec, bound)
+        job = self._jobs.submit(
+            spec.name, dict(bound.arguments), lambda: self._invoke(spec, bound),
+            None if spec.read_only else self._on_cancel
+        )
+        return job.summary(include_result=False)
+
+    def call(self, name, params=None):
+        """도구 호출 (파라미터 검증 및 저장소 잠금 포함)"""
+        return self._run(self.get(name), params)
+
+    # ---- JSON-RPC ----
+
+    def _executor_instance(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix='git-mcp-batch'
+                )
+            return self._executor
+
+    def _validate(self, request):
+        if not isinstance(request, dict):
+            raise RPCError(INVALID_REQUEST, "Invalid request format")
+        if request.get('jsonrpc') != '2.0':
+            raise RPCError(INVALID_REQUEST, "Invalid JSON-RPC version")
+        method = request.get('method')
+        if not method:
+            raise RPCError(INVALID_REQUEST, "Method is required")
+        return self.get(method)
+
+    def _execute(self, request):
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            spec = self._validate(request)
+            result = self._run(spec, request.get('params'))
+            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as e:
+            return _error(request_id, e.code, str(e))
+        except Exception as e:
+            return _error(request_id, SERVER_ERROR, str(e))
+
+    def _is_read_only(self, request):
+        if not isinstance(request, dict):
+            return True
+        spec = self._tools.get(request.get('method'))
+        # 알 수 없는 메서드는 오류 응답만 만들므로 읽기 전용으로 취급
+        return spec is None or spec.read_only
+
+    def handle(self, payload):
+        """단일 요청 또는 배치(list)를 처리해 응답 반환"""
+        if not isinstance(payload, list):
+            return self._execute(payload)
+        if not payload:
+            return _error(None, INVALID_REQUEST, "Empty batch")
+
+        responses = [None] * len(payload)
+        pending = []
+
+        def flush():
+            # 모아 둔 읽기 전용 호출을 동시에 실행
+            if len(pending) == 1:
+                i = pending[0]
+                responses[i] = self._execute(payload[i])
+            elif pending:
+                executor = self._executor_instance()
+                futures = [(i, executor.submit(self._execute, payload[i])) for i in pending]
+                for i, future in futures:
+                    responses[i] = future.result()
+            pending.clear()
+
+        for i, request in enumerate(payload):
+            if self._is_read_only(request):
+                pending.append(i)
+                continue
+            flush()
+            responses[i] = self._execute(request)
+        flush()
+
+        # 배치에서 id 가 없는 요청(notification)은 응답하지 않는다
+        return [
+            response for request, response in zip(payload, responses)
+            if not isinstance(request, dict) or 'id' in request
+        ]
+
+
+def _error(request_id, code, message):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {
+            "code": code,
+            "message": message
+        }
+    }
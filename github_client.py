@@ -0,0 +1,365 @@
+"""GitHub REST API 클라이언트
+
+연결 풀을 쓰는 requests.Session 하나를 공유해 호출마다 TLS 연결을 새로 맺지 않는다.
+GET 응답은 ETag / Last-Modified 로 캐시해 304 응답(rate limit 미차감)으로 재사용하고,
+같은 GET 이 동시에 여러 번 들어오면 요청 하나로 합친다. X-RateLimit 헤더를 보고
+한도에 닿기 전에 reset 시각까지 기다린다. 목록 API 는 Link 헤더로 마지막 페이지를 알아낸 뒤
+다음 페이지들을 제한된 개수만큼 앞서 병렬 조회한다.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import LRUCache, estimate_size
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = 'https://api.github.com'
+
+_SCP_REMOTE = re.compile(r'^(?:[\w.-]+@)?([\w.-]+):(?!//)(.+)$')
+_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+class GitHubError(Exception):
+    """GitHub API 오류 응답"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_github_remote(url, hosts=('github.com',)):
+    """origin URL 에서 (owner, name) 추출 - https / ssh / scp 형식 지원, 아니면 None"""
+    if not url:
+        return None
+    if '://' in url:
+        parsed = urlparse(url)
+        host, path = parsed.hostname, parsed.path
+    else:
+        match = _SCP_REMOTE.match(url)
+        if not match:
+            return None
+        host, path = match.groups()
+    if not host or host.lower() not in hosts:
+        return None
+    parts = path.strip('/').split('/')
+    if len(parts) < 2 or not parts[-2] or not parts[-1]:
+        return None
+    name = parts[-1][:-4] if parts[-1].endswith('.git') else parts[-1]
+    return parts[-2], name
+
+
+def parse_link(header):
+    """Link 헤더 -> {rel: url}"""
+    return {rel: url for url, rel in _LINK.findall(header or '')}
+
+
+def _page_number(url):
+    try:
+        return int(parse_qs(urlparse(url).query)['page'][0])
+    except (KeyError, ValueError, IndexError):
+        return None
+
+
+def project(item, fields):
+    """item 에서 fields 만 추출 ('user.login' 처럼 점으로 중첩 필드 지정)"""
+    result = {}
+    for field in fields:
+        value = item
+        for part in field.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        result[field] = value
+    return result
+
+
+class _Flight:
+    """진행 중인 GET 하나 (같은 요청을 기다리는 호출이 결과를 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class GitHubClient:
+    """스레드 안전한 GitHub API 클라이언트
+
+    min_remaining: 남은 호출 수가 이 값 이하이면 reset 시각까지 대기
+    max_wait: rate limit 대기 최대 시간(초) - 더 오래 기다려야 하면 오류
+    """
+
+    def __init__(self, token=None, base_url=None, pool_size=None, cache_bytes=None,
+                 min_remaining=None, max_wait=None, timeout=30, max_concurrency=None):
+        self.base_url = (base_url or os.getenv('GITHUB_API_URL') or DEFAULT_API_URL).rstrip('/')
+        self.timeout = timeout
+        self.min_remaining = int(os.getenv('GITHUB_RATE_LIMIT_MIN_REMAINING', '5')) \
+            if min_remaining is None else min_remaining
+        self.max_wait = float(os.getenv('GITHUB_RATE_LIMIT_MAX_WAIT', '60')) \
+            if max_wait is None else max_wait
+        pool_size = pool_size or int(os.getenv('GITHUB_POOL_SIZE', '10'))
+        self.max_concurrency = max_concurrency or int(os.getenv('GITHUB_MAX_CONCURRENCY', '8'))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/vnd.github.v3+json'})
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+        self.cache = LRUCache(cache_bytes or int(os.getenv('GITHUB_CACHE_BYTES', str(16 * 1024 * 1024))))
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self.rate_limit = {"limit": None, "remaining": None, "reset": None}
+        self.requests = 0
+        self.not_modified = 0
+        self.coalesced = 0
+        self.rate_limit_waits = 0
+
+    # ---- rate limit ----
+
+    def _update_rate_limit(self, response):
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        with self._lock:
+            try:
+                self.rate_limit = {
+                    "limit": int(headers.get('X-RateLimit-Limit', 0)),
+                    "remaining": int(headers['X-RateLimit-Remaining']),
+                    "reset": int(headers.get('X-RateLimit-Reset', 0)),
+                }
+            except ValueError:
+                pass
+
+    def _sleep_until(self, reset, reason):
+        wait = max(0.0, reset - time.time()) + 1
+        if wait > self.max_wait:
+            raise GitHubError(f"GitHub API rate limit exceeded (reset in {int(wait)}s)", 403)
+        logger.warning(f"GitHub rate limit 대기 {wait:.1f}s ({reason})")
+        with self._lock:
+            self.rate_limit_waits += 1
+        time.sleep(wait)
+
+    def _throttle(self):
+        with self._lock:
+            remaining, reset = self.rate_limit["remaining"], self.rate_limit["reset"]
+        if remaining is not None and reset and remaining <= self.min_remaining and reset > time.time():
+            self._sleep_until(reset, f"remaining={remaining}")
+            with self._lock:
+                self.rate_limit["remaining"] = None
+
+    def _retry_after(self, response):
+        """rate limit 로 거절된 응답이면 다시 시도할 시각, 아니면 None"""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return time.time() + int(retry_after)
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            return int(response.headers.get('X-RateLimit-Reset', 0)) or time.time() + 60
+        return None
+
+    # ---- 요청 ----
+
+    def url(self, path):
+        return path if path.startswith(('http://', 'https://')) else f'{self.base_url}/{path.lstrip("/")}'
+
+    def _send(self, method, url, params=None, json=None, headers=None):
+        for attempt in range(2):
+            self._throttle()
+            with self._lock:
+                self.requests += 1
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, url, params=params, json=json, headers=headers, timeout=self.timeout
+                )
+            except requests.RequestException:
+                metrics.observe_http(method, 'error', time.perf_counter() - started)
+                raise
+            metrics.observe_http(method, response.status_code, time.perf_counter() - started)
+            self._update_rate_limit(response)
+            retry_at = self._retry_after(response)
+            if retry_at is None or attempt:
+                return response
+            self._sleep_until(retry_at, f"HTTP {response.status_code}")
+            # 거절 응답의 remaining=0 으로 다시 시도 전에 한 번 더 기다리지 않도록
+            with self._lock:
+                self.rate_limit["remaining"] = None
+        return response
+
+    @staticmethod
+    def _error(response, default):
+        try:
+            message = response.json().get('message', default)
+        except ValueError:
+            message = default
+        return GitHubError(message, response.status_code)
+
+    def request(self, method, path, params=None, json=None, ok=(200, 201, 204), default_error='GitHub API request failed'):
+        """캐시 없이 요청하고 (JSON 본문, 응답) 반환"""
+        response = self._send(method, self.url(path), params=params, json=json)
+        if response.status_code not in ok:
+            raise self._error(response, default_error)
+        data = response.json() if response.content else None
+        return data, response
+
+    def get(self, path, params=None, default_error='GitHub API request failed', with_headers=False):
+        """조건부 캐시 + 동일 요청 합치기를 적용한 GET
+
+        with_headers=True 이면 (데이터, 헤더) 를 반환한다 (Link 헤더 등 필요 시).
+        """
+        url = self.url(path)
+        key = url + ('?' + urlencode(sorted(params.items())) if params else '')
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                flight.result = self._conditional_get(key, url, params, default_error)
+            except Exception as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        data, headers = flight.result
+        return (data, headers) if with_headers else data
+
+    def _conditional_get(self, key, url, params, default_error):
+        cached = self.cache.get(key)
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers['If-None-Match'] = cached["etag"]
+            if cached["last_modified"]:
+                headers['If-Modified-Since'] = cached["last_modified"]
+        response = self._send('GET', url, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.not_modified += 1
+            return cached["data"], cached["headers"]
+        if response.status_code != 200:
+            raise self._error(response, default_error)
+        data = response.json()
+        kept = {name: response.headers[name] for name in ('Link',) if name in response.headers}
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.cache.put(key, {
+                "etag": etag, "last_modified": last_modified, "data": data, "headers": kept,
+            }, size=len(response.content) + estimate_size(kept))
+        return data, kept
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix='github-api'
+                )
+            return self._executor
+
+    def paginate(self, path, params=None, per_page=100, default_error='GitHub API request failed', limit=None):
+        """목록 API 의 페이지를 순서대로 yield (페이지 단위 list)
+
+        첫 페이지의 Link rel="last" 로 페이지 수를 알면 다음 페이지를 최대 max_concurrency 개까지
+        앞서 요청하고 한 페이지를 넘길 때마다 하나씩 더 요청한다. 모르면 rel="next" 를 따라 순차 조회한다.
+        limit 을 주면 그 개수를 채우는 데 필요한 페이지까지만 앞서 요청하고, 그 뒤는 호출 측이 더
+        읽을 때만 한 페이지씩 가져온다. 호출 측이 중간에 멈추면 남은 요청은 취소된다.
+        """
+        if limit:
+            per_page = min(per_page, limit)
+        params = dict(params or {}, per_page=per_page)
+        data, headers = self.get(path, params=params, default_error=default_error, with_headers=True)
+        received = len(data)
+        yield data
+        links = parse_link(headers.get('Link'))
+        last = _page_number(links.get('last', ''))
+        if last is None:
+            while 'next' in links:
+                data, headers = self.get(links['next'], default_error=default_error, with_headers=True)
+                yield data
+                links = parse_link(headers.get('Link'))
+            return
+        pool = self._pool()
+        pending = deque()
+        page = 2
+        try:
+            while pending or page <= last:
+                window = self.max_concurrency
+                if limit:
+                    window = min(window, max(1, -(-(limit - received) // per_page)))
+                while page <= last and len(pending) < window:
+                    pending.append(pool.submit(self.get, path, dict(params, page=page), default_error))
+                    page += 1
+                data = pending.popleft().result()
+                received += len(data)
+                yield data
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def get_many(self, paths, default_error='GitHub API request failed'):
+        """여러 GET 을 최대 max_concurrency 개씩 동시에 실행 - (path, 데이터, 오류) 를 입력 순서대로 yield"""
+        pool = self._pool()
+        futures = [(path, pool.submit(self.get, path, None, default_error)) for path in paths]
+        try:
+            for path, future in futures:
+                try:
+                    yield path, future.result(), None
+                except Exception as e:
+                    yield path, None, e
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def post(self, path, json=None, default_error='GitHub API request failed'):
+        return self.request('POST', path, json=json, default_error=default_error)[0]
+
+    def patch(self, path, json=None, default_error='GitHub API request failed'):
+        return self.request('PATCH', path, json=json, default_error=default_error)[0]
+
+    def put(self, path, json=None, default_error='GitHub API request failed'):
+        return self.request('PUT', path, json=json, default_error=default_error)[0]
+
+    def parse_remote(self, url):
+        """origin URL -> (owner, name) - github.com 과 GITHUB_API_URL 의 호스트(Enterprise)를 인식"""
+        hosts = {'github.com'}
+        host = urlparse(self.base_url).hostname
+        if host and host != 'api.github.com':
+            hosts.add(host.lower())
+        return parse_github_remote(url, hosts=tuple(hosts))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "coalesced": self.coalesced,
+                "rate_limit_waits": self.rate_limit_waits,
+                "rate_limit": dict(self.rate_limit),
+                "cache": self.cache.stats(),
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
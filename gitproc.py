@@ -0,0 +1,218 @@
+"""git 서브프로세스 실행 헬퍼
+
+엔진 모듈들이 git 출력을 한 번에 메모리에 올리지 않고 레코드 단위로
+스트리밍할 수 있게 한다. 소비자가 중간에 멈추면 프로세스를 바로 종료한다.
+tracking() 안에서 띄운 프로세스는 추적기에 등록되어 작업 취소 시 종료할 수 있다.
+모든 실행은 명령별 실행 수 / 소요 시간 지표(metrics)에 기록된다.
+GitPython 은 서버 시작 시간을 줄이기 위해 gitpython() 으로 처음 필요할 때 import 하며,
+그때 GitPython 이 띄우는 프로세스도 같은 추적 / 지표를 거치도록 진입점을 감싼다.
+"""
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import metrics
+
+CHUNK_SIZE = 64 * 1024
+
+
+class GitError(Exception):
+    """git 명령 실패"""
+
+    def __init__(self, args, status, stderr):
+        self.args_list = list(args)
+        self.status = status
+        self.stderr = stderr
+        super().__init__(stderr.strip() or f"git {' '.join(self.args_list)} 실패 (exit {status})")
+
+
+_local = threading.local()
+
+
+@contextmanager
+def tracking(tracker):
+    """이 스레드에서 띄우는 git 프로세스를 tracker 에 등록
+
+    tracker.check() 는 프로세스를 띄우기 직전에 호출되며 (취소된 경우 예외),
+    tracker.add(proc) 는 띄운 직후 호출된다.
+    """
+    previous = getattr(_local, 'tracker', None)
+    _local.tracker = tracker
+    try:
+        yield
+    finally:
+        _local.tracker = previous
+
+
+def current():
+    """이 스레드의 추적기 (다른 스레드로 작업을 넘길 때 tracking() 에 다시 전달)"""
+    return getattr(_local, 'tracker', None)
+
+
+def before_spawn():
+    """추적 중이면 취소 여부를 확인하고 Popen 추가 인자 반환
+
+    추적되는 프로세스는 새 프로세스 그룹으로 띄워, 취소 시 git 이 띄운 하위 프로세스
+    (ssh, upload-pack 등)까지 함께 종료할 수 있게 한다.
+    """
+    tracker = getattr(_local, 'tracker', None)
+    if tracker is None:
+        return {}
+    tracker.check()
+    return {'start_new_session': True}
+
+
+def register(proc):
+    tracker = getattr(_local, 'tracker', None)
+    if tracker is not None:
+        tracker.add(proc)
+    return proc
+
+
+def git_command():
+    return os.environ.get('GIT_PYTHON_GIT_EXECUTABLE', 'git')
+
+
+def _env(extra=None):
+    env = dict(os.environ)
+    # status 등이 index 를 다시 쓰지 않게 해서 다른 프로세스와의 잠금 경합을 줄인다
+    env['GIT_OPTIONAL_LOCKS'] = '0'
+    env.setdefault('LC_ALL', 'C')
+    if extra:
+        env.update(extra)
+    return env
+
+
+def _spawn(cwd, args, stdin=None, env=None):
+    popen_kwargs = before_spawn()
+    stderr = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        [git_command(), *args],
+        cwd=cwd,
+        stdin=stdin if stdin is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+        env=_env(env),
+        **popen_kwargs,
+    )
+    register(proc)
+    return proc, stderr
+
+
+def _read_stderr(stderr):
+    stderr.seek(0)
+    data = stderr.read().decode('utf-8', 'replace')
+    stderr.close()
+    return data
+
+
+def _terminate(proc):
+    if proc.poll() is None:
+        proc.kill()
+    proc.stdout.close()
+    proc.wait()
+
+
+def run(cwd, args, input=None, ok_codes=(0,), env=None):
+    """git 명령을 실행하고 (exit code, stdout bytes) 반환"""
+    started = time.perf_counter()
+    proc, stderr = _spawn(cwd, args, stdin=subprocess.PIPE if input is not None else None, env=env)
+    try:
+        out, _ = proc.communicate(input)
+    except BaseException:
+        _terminate(proc)
+        _read_stderr(stderr)
+        metrics.observe_git(args, time.perf_counter() - started, -1)
+        raise
+    err = _read_stderr(stderr)
+    metrics.observe_git(args, time.perf_counter() - started, proc.returncode not in ok_codes)
+    if proc.returncode not in ok_codes:
+        raise GitError(args, proc.returncode, err)
+    return proc.returncode, out
+
+
+def output(cwd, args, **kwargs):
+    """git 명령 stdout 을 문자열로 반환"""
+    return run(cwd, args, **kwargs)[1].decode('utf-8', 'replace')
+
+
+def stream(cwd, args, sep=b'\0', ok_codes=(0,), env=None):
+    """git 출력을 sep 단위 레코드(bytes)로 스트리밍
+
+    제너레이터가 끝까지 소비되지 않고 닫히면 프로세스를 종료하며 오류로
+    보지 않는다.
+    """
+    started = time.perf_counter()
+    proc, stderr = _spawn(cwd, args, env=env)
+    finished = False
+    try:
+        pending = b''
+        read = proc.stdout.read1 if hasattr(proc.stdout, 'read1') else proc.stdout.read
+        while True:
+            chunk = read(CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += chunk
+            parts = pending.split(sep)
+            pending = parts.pop()
+            for part in parts:
+                yield part
+        if pending:
+            yield pending
+        finished = True
+    finally:
+        _terminate(proc)
+        err = _read_stderr(stderr)
+        metrics.observe_git(args, time.perf_counter() - started, finished and proc.returncode not in ok_codes)
+        if finished and proc.returncode not in ok_codes:
+            raise GitError(args, proc.returncode, err)
+
+
+_gitpython = None
+_gitpython_lock = threading.Lock()
+
+
+def gitpython():
+    """GitPython 모듈 (처음 호출할 때 import 하고 Popen / execute 진입점을 감싼다)"""
+    global _gitpython
+    if _gitpython is not None:
+        return _gitpython
+    with _gitpython_lock:
+        if _gitpython is None:
+            import git
+            import git.cmd
+
+            safer_popen = git.cmd.safer_popen
+            execute = git.cmd.Git.execute
+
+            def tracked_popen(*args, **kwargs):
+                # 작업 안에서 띄운 프로세스는 작업에 등록 (취소 시 종료)
+                for key, value in before_spawn().items():
+                    kwargs.setdefault(key, value)
+                return register(safer_popen(*args, **kwargs))
+
+            def measured_execute(self, command, *args, **kwargs):
+                # as_process 는 프로세스를 띄우는 데까지만 잰다
+                started = time.perf_counter()
+                status = 0
+                try:
+                    return execute(self, command, *args, **kwargs)
+                except git.exc.GitCommandError as e:
+                    status = e.status or 1
+                    raise
+                finally:
+                    metrics.observe_git(command[1:] if isinstance(command, (list, tuple)) else [command],
+                                        time.perf_counter() - started, status)
+
+            git.cmd.safer_popen = tracked_popen
+            git.cmd.Git.execute = measured_execute
+            _gitpython = git
+    return _gitpython
+
+
+def decode(raw):
+    """git 출력 경로/텍스트 디코딩"""
+    return raw.decode('utf-8', 'replace')
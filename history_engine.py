@@ -0,0 +1,355 @@
+"""스트리밍 커밋 히스토리 엔진
+
+`git log -z --format=...` 프로세스 하나의 출력을 레코드 단위로 파싱한다.
+커밋 객체를 하나씩 로드하지 않으며, 다음 페이지는 마지막으로 읽은 위치를 담은 불투명
+커서로 이어서 조회한다. 리비전과 날짜를 고정한 페이지는 불변이므로 공유 결과 캐시에 보관한다.
+"""
+import base64
+import json
+import re
+
+import gitproc
+from cache import result_cache
+
+# 조회 가능한 필드와 git log 포맷 지정자
+FIELDS = {
+    "hash": '%H',
+    "short_hash": '%h',
+    "parents": '%P',
+    "author": '%an',
+    "author_email": '%ae',
+    "date": '%aI',
+    "committer": '%cn',
+    "committer_email": '%ce',
+    "committer_date": '%cI',
+    "subject": '%s',
+    "body": '%b',
+    "message": '%B',
+}
+DEFAULT_FIELDS = ("hash", "message", "author", "date")
+FIELD_SEP = '\x1f'
+# 커서에 담는 '마지막 시각과 같은 시각의 커밋' 수 상한 (넘으면 --skip 으로 이어간다)
+MAX_SEEN = 256
+
+
+def encode_cursor(state):
+    raw = json.dumps(state, separators=(',', ':'), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("잘못된 커서입니다")
+
+
+_SHA = re.compile(r'^[0-9a-f]{40}(?:[0-9a-f]{24})?$')
+
+
+def _is_rev(value, negated=False):
+    """커밋 SHA (negated=True 면 '^' 가 붙은 SHA 도 허용)"""
+    if not isinstance(value, str):
+        return False
+    if negated and value.startswith('^'):
+        value = value[1:]
+    return _SHA.match(value) is not None
+
+
+def _check_cursor(state):
+    """클라이언트가 보낸 커서 검증 - git 인자로 넘어가는 값은 SHA 만 허용"""
+    def revs(key, negated=False):
+        return isinstance(state.get(key), list) and all(_is_rev(rev, negated) for rev in state[key])
+
+    def optional(key, kind):
+        return state.get(key) is None or (isinstance(state[key], kind) and not isinstance(state[key], bool))
+
+    valid = isinstance(state, dict) \
+        and isinstance(state.get("fields"), list) and state["fields"] \
+        and all(isinstance(name, str) and name in FIELDS for name in state["fields"]) \
+        and (state.get("paths") is None
+             or (isinstance(state["paths"], list) and all(isinstance(path, str) for path in state["paths"]))) \
+        and optional("author", str)
+    valid = valid and optional("max_age", int) and optional("min_age", int)
+    if valid and "skip" in state:
+        valid = revs("revs", negated=True) and isinstance(state["skip"], int) and state["skip"] >= 0 \
+            and optional("since", str) and optional("until", str)
+    elif valid:
+        valid = revs("pending") and revs("exclude", negated=True) \
+            and all(rev.startswith('^') for rev in state["exclude"]) \
+            and (state.get("revs") is None or revs("revs", negated=True)) \
+            and (state.get("seen") is None or revs("seen")) \
+            and optional("watermark", int) and optional("emitted", int)
+    if not valid:
+        raise ValueError("잘못된 커서입니다")
+    return state
+
+
+def resolve_revisions(work_tree, revision):
+    """리비전(범위 포함)을 커밋 SHA 목록으로 고정 (예: 'a..b' -> ['<b>', '^<a>'])"""
+    out = gitproc.output(work_tree, ['rev-parse', '--revs-only', revision, '--'])
+    revs = out.split()
+    # rev-parse 는 rev-list 옵션을 그대로 내보내므로 SHA 가 아닌 값이 있으면 거부한다
+    if not revs or not all(_is_rev(rev, negated=True) for rev in revs):
+        raise ValueError(f"알 수 없는 리비전: {revision}")
+    return revs
+
+
+def _parse_record(raw, fields):
+    values = gitproc.decode(raw).split(FIELD_SEP)
+    commit = dict(zip(fields, values))
+    if "parents" in commit:
+        commit["parents"] = commit["parents"].split()
+    return commit
+
+
+def iter_commits(work_tree, revs, fields=DEFAULT_FIELDS, paths=None, author=None,
+                 since=None, until=None, skip=0, max_count=None, max_age=None, min_age=None):
+    """커밋을 하나씩 생성하는 제너레이터 (메모리 사용량은 limit 과 무관)
+
+    max_age / min_age 는 resolve_dates 로 고정한 since / until 시각이다.
+    paths 가 있으면 경계로 이어가는 페이지와 같은 순서 / 부모가 되도록 --parents 를 쓴다.
+    """
+    fmt = FIELD_SEP.join(FIELDS[name] for name in fields)
+    args = ['log', '-z', f'--format={fmt}']
+    if author:
+        args.append(f'--author={author}')
+    if since:
+        args.append(f'--since={since}')
+    if until:
+        args.append(f'--until={until}')
+    if max_age is not None:
+        args.append(f'--max-age={max_age}')
+    if min_age is not None:
+        args.append(f'--min-age={min_age}')
+    if skip:
+        args.append(f'--skip={skip}')
+    if max_count is not None:
+        args.append(f'--max-count={max_count}')
+    if paths:
+        args.append('--parents')
+    args.append('--end-of-options')
+    args += list(revs)
+    args.append('--')
+    if paths:
+        args += list(paths)
+    records = gitproc.stream(work_tree, args)
+    try:
+        for raw in records:
+            yield _parse_record(raw, fields)
+    finally:
+        records.close()
+
+
+
+
+def resolve_dates(work_tree, since=None, until=None):
+    """since / until(상대 날짜 포함)을 유닉스 시각으로 고정 -> (max_age, min_age)"""
+    args = [f'--since={since}'] if since else []
+    if until:
+        args.append(f'--until={until}')
+    if not args:
+        return None, None
+    ages = {}
+    for line in gitproc.output(work_tree, ['rev-parse', *args]).split():
+        name, _, value = line.lstrip('-').partition('=')
+        ages[name] = int(value)
+    return ages.get('max-age'), ages.get('min-age')
+
+
+def _author_matcher(author):
+    """git log --author 처럼 'Name <email>' 에 대한 정규식 검색 (잘못된 정규식이면 문자열 검색)"""
+    if not author:
+        return None
+    try:
+        pattern = re.compile(author)
+    except re.error:
+        pattern = re.compile(re.escape(author))
+    return lambda name, email: pattern.search(f'{name} <{email}>') is not None
+
+
+def _fetch_fields(work_tree, shas, fields):
+    """지정한 커밋들의 필드만 다시 조회 (순서 유지)"""
+    fmt = FIELD_SEP.join(FIELDS[name] for name in fields)
+    records = gitproc.stream(work_tree, ['log', '-z', '--no-walk=unsorted', f'--format={fmt}', '--end-of-options',
+                                         *shas, '--'])
+    try:
+        return [_parse_record(raw, fields) for raw in records]
+    finally:
+        records.close()
+
+
+def _single_file(work_tree, revision, paths):
+    """paths 가 파일 경로 하나인지 (glob / pathspec magic / 디렉터리가 아님)"""
+    if len(paths) != 1 or paths[0] in ('', '.') or paths[0].startswith(':') or paths[0].endswith('/') \
+            or any(c in paths[0] for c in '*?['):
+        return False
+    code, out = gitproc.run(work_tree, ['cat-file', '-t', f'{revision}:{paths[0]}'], ok_codes=(0, 128))
+    # 지금은 없는 (삭제된) 경로도 파일로 본다
+    return code != 0 or out.strip() != b'tree'
+
+
+class _Skewed(Exception):
+    """부모보다 커밋 시각이 이른 커밋을 만나 경계로 이어갈 수 없음"""
+
+
+def _walk_page(work_tree, state, limit):
+    """경계(pending)부터 한 페이지 조회 -> (커밋 목록, 다음 페이지 상태 또는 None)
+
+    git log 의 날짜순 탐색은 '아직 출력하지 않은 커밋' 큐를 유지한다. 출력(또는 필터로 건너뛴)
+    커밋을 큐에서 빼고 부모를 넣어 이 큐를 그대로 재구성해 다음 페이지의 시작점으로 쓰므로,
+    페이지마다 처음부터 다시 걷는 --skip 과 달리 페이지 비용이 앞서 읽은 커밋 수와 무관하다.
+    paths 가 있으면 git 이 건너뛴 커밋을 볼 수 없으므로 --parents 로 단순화된 부모
+    (다음에 출력될 조상)를 받아 경계로 쓴다. 작성자 / until 필터는 탐색한 커밋을 모두 봐야
+    하므로 git 대신 여기서 거르고, 통과한 커밋의 필드만 따로 조회한다.
+
+    경계에서 다시 시작한 git 은 앞 페이지에서 이미 나온 커밋을 모르므로, 그런 커밋에 다시
+    도달하면 중복이 생긴다. 커밋 시각이 부모보다 늦지 않은 히스토리에서는 탐색 순서의 커밋
+    시각이 줄어들기만 하므로, 다시 도달할 수 있는 커밋은 마지막 시각(watermark)과 같은 시각의
+    커밋뿐이다. 이들을 seen 에 담아 걸러내고, 시각이 거꾸로 가는 커밋을 만나면 _Skewed 를 낸다.
+    """
+    fields = state["fields"]
+    match_author = _author_matcher(state["author"])
+    min_age = state["min_age"]
+    filtered = match_author is not None or min_age is not None
+    walk = ['%H', '%P', '%ct'] + (['%an', '%ae'] if filtered else [FIELDS[name] for name in fields])
+    seen = set(state.get("seen") or ())
+    args = ['log', '-z', f'--format={FIELD_SEP.join(walk)}']
+    if state["paths"]:
+        args.append('--parents')
+    if state["max_age"] is not None:
+        args.append(f'--max-age={state["max_age"]}')
+    if not filtered and not seen:
+        args.append(f'--max-count={limit + 1}')
+    args += ['--end-of-options'] + state["pending"] + state["exclude"] + ['--'] + (state["paths"] or [])
+
+    # 첫 페이지에 paths 가 있으면 시작 리비전 자체는 출력되지 않을 수 있으므로 경계에 남기지 않는다
+    # (시작 리비전이 하나일 때만 이 방식을 쓰며, 첫 출력 커밋이 그 리비전에서 이어진다)
+    first = state.get("first")
+    pending = dict.fromkeys([] if first and state["paths"] else state["pending"])
+    watermark = state.get("watermark")
+    boundary = list(state.get("seen") or ())
+    walked = set()
+    commits = []
+    more = False
+    records = gitproc.stream(work_tree, args)
+    try:
+        for raw in records:
+            values = gitproc.decode(raw).split(FIELD_SEP)
+            sha, parents, timestamp = values[0], values[1].split(), int(values[2])
+            if sha in seen:
+                # 앞 페이지에서 이미 나온 커밋 (부모도 그때 경계에 들어갔다)
+                continue
+            # 다음 페이지의 첫 커밋도 검사한다 - paths 가 있으면 그 사이 건너뛴 커밋의 시각은 보이지 않는다
+            if watermark is not None and timestamp > watermark:
+                raise _Skewed()
+            if filtered:
+                name, email = values[3:5]
+                keep = (min_age is None or timestamp <= min_age) and \
+                    (match_author is None or match_author(name, email))
+            else:
+                keep = True
+            if keep and len(commits) == limit:
+                more = True
+                break
+            walked.add(sha)
+            pending.pop(sha, None)
+            for parent in parents:
+                if parent not in walked:
+                    pending[parent] = None
+            if timestamp != watermark:
+                watermark = timestamp
+                boundary = []
+            boundary.append(sha)
+            if keep:
+                commits.append(dict(zip(fields, values[3:])) if not filtered else {"hash": sha, "parents": parents})
+    finally:
+        records.close()
+    if len(boundary) > MAX_SEEN:
+        # 같은 시각의 커밋이 너무 많으면 커서에 담지 않고 --skip 으로 이어간다
+        raise _Skewed()
+
+    if filtered:
+        shas = [commit["hash"] for commit in commits]
+        parents = [commit["parents"] for commit in commits]
+        commits = _fetch_fields(work_tree, shas, fields) if shas else []
+        if "parents" in fields:
+            for commit, walked_parents in zip(commits, parents):
+                commit["parents"] = walked_parents
+    elif "parents" in fields:
+        for commit in commits:
+            commit["parents"] = commit["parents"].split()
+    if not more:
+        return commits, None
+    next_state = dict(state, pending=list(pending), watermark=watermark, seen=boundary,
+                      emitted=state.get("emitted", 0) + len(commits))
+    next_state.pop("first", None)
+    return commits, next_state
+
+
+def _skip_state(state):
+    """경계 대신 --skip 으로 이어가는 상태"""
+    return {"revs": state["revs"], "fields": state["fields"], "paths": state["paths"], "author": state["author"],
+            "max_age": state["max_age"], "min_age": state["min_age"], "skip": state.get("emitted", 0)}
+
+
+def history_page(work_tree, limit=10, revision='HEAD', fields=None, paths=None,
+                 author=None, since=None, until=None, cursor=None):
+    """히스토리 한 페이지 조회
+
+    cursor 는 첫 페이지 조회 시점의 리비전(SHA 로 고정)과 필터, 그리고 마지막으로 읽은
+    위치(아직 출력하지 않은 커밋 경계)를 담으므로, 그 사이 브랜치가 움직여도 페이지가
+    어긋나지 않고 다음 페이지는 처음부터 다시 걷지 않고 그 위치에서 이어진다.
+    since / until 도 첫 페이지에서 시각으로 고정한다.
+    커밋 시각이 부모보다 이른 커밋(시계가 틀린 기기에서 만든 커밋 등)을 만나면 그 페이지부터는
+    --skip 으로 이어간다 (결과는 같고, 페이지 비용만 앞서 읽은 커밋 수에 비례한다).
+    paths 가 있으면 parents 는 git log --parents 처럼 단순화된 히스토리 기준이다.
+    """
+    if cursor:
+        state = _check_cursor(decode_cursor(cursor))
+    else:
+        fields = list(fields or DEFAULT_FIELDS)
+        unknown = [name for name in fields if name not in FIELDS]
+        if unknown:
+            raise ValueError(f"알 수 없는 필드: {', '.join(unknown)}")
+        revs = resolve_revisions(work_tree, revision)
+        include = [rev for rev in revs if not rev.startswith('^')]
+        paths = list(paths) if paths else None
+        max_age, min_age = resolve_dates(work_tree, since, until)
+        state = {"revs": revs, "pending": include, "exclude": [rev for rev in revs if rev.startswith('^')],
+                 "fields": fields, "paths": paths, "author": author,
+                 "max_age": max_age, "min_age": min_age, "first": True}
+        if paths and (len(include) > 1 or not _single_file(work_tree, include[0], paths)):
+            # 시작 리비전이 여럿이거나 paths 가 파일 하나가 아니면 (경로 여럿, 디렉터리, glob)
+            # 건너뛴 커밋 때문에 경계에서 다시 시작한 순서가 git log 와 어긋날 수 있어 --skip 으로 이어간다
+            state = _skip_state(state)
+    limit = int(limit)
+    key = None
+    if "skip" not in state or (not state.get("since") and not state.get("until")):
+        key = dict(state, limit=limit)
+        cached = result_cache.get('history', key)
+        if cached is not None:
+            return cached
+    next_cursor = None
+    if "skip" not in state:
+        try:
+            commits, next_state = _walk_page(work_tree, state, limit)
+            if next_state is not None:
+                next_cursor = encode_cursor(next_state)
+        except _Skewed:
+            state = _skip_state(dict(state, revs=state.get("revs") or state["pending"] + state["exclude"]))
+    if "skip" in state:
+        commits = list(iter_commits(
+            work_tree, state["revs"], fields=state["fields"], paths=state["paths"],
+            author=state["author"], since=state.get("since"), until=state.get("until"),
+            max_age=state.get("max_age"), min_age=state.get("min_age"),
+            skip=state["skip"], max_count=limit + 1
+        ))
+        if len(commits) > limit:
+            commits = commits[:limit]
+            next_cursor = encode_cursor(dict(state, skip=state["skip"] + limit))
+    result = {"commits": commits, "next_cursor": next_cursor}
+    if key is not None:
+        result_cache.put('history', key, result)
+    return result
@@ -0,0 +1,235 @@
+"""오래 걸리는 git 작업의 백그라운드 실행 / 취소
+
+background=True 로 호출한 도구는 작업(job)으로 등록되고 바로 작업 ID 를 반환한다.
+작업이 띄운 git 프로세스(gitproc 와 GitPython 모두)는 작업에 등록되어, 취소하면
+SIGTERM 으로 종료하고 (git 이 lock 파일을 정리할 시간을 준 뒤) 남아 있으면 SIGKILL 한다.
+완료된 작업 기록은 GIT_MCP_JOB_HISTORY 개까지 보관한다.
+"""
+import logging
+import os
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import gitproc
+import progress
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# SIGTERM 후 SIGKILL 까지 기다리는 시간(초)
+KILL_GRACE = 5.0
+
+
+class JobCancelled(Exception):
+    """취소된 작업에서 새 git 프로세스를 띄우려 할 때"""
+
+
+def _signal_group(proc, sig):
+    """추적 프로세스는 자기 프로세스 그룹의 리더이므로 그룹 전체에 신호를 보낸다"""
+    try:
+        os.killpg(proc.pid, sig)
+    except (OSError, AttributeError):
+        try:
+            proc.send_signal(sig)
+        except OSError:
+            pass
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+
+class Job:
+    """작업 하나 - gitproc.tracking() 의 추적기 역할도 한다"""
+
+    def __init__(self, name, arguments, fn, cleanup=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.arguments = arguments
+        self.fn = fn
+        self.cleanup = cleanup
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.progress = None
+        self.future = None
+        self._cancel = threading.Event()
+        self._procs = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    # ---- gitproc 추적기 ----
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(f"작업이 취소됨: {self.id}")
+
+    def add(self, proc):
+        with self._lock:
+            self._procs = {p for p in self._procs if p.poll() is None}
+            self._procs.add(proc)
+        if self._cancel.is_set():
+            self._terminate()
+
+    def _terminate(self):
+        with self._lock:
+            procs = [p for p in self._procs if p.poll() is None]
+        for proc in procs:
+            _signal_group(proc, signal.SIGTERM)
+
+        def kill_remaining():
+            for proc in procs:
+                if proc.poll() is None:
+                    logger.warning(f"git 프로세스 강제 종료 (pid {proc.pid})")
+                    _signal_group(proc, signal.SIGKILL)
+
+        if procs:
+            timer = threading.Timer(KILL_GRACE, kill_remaining)
+            timer.daemon = True
+            timer.start()
+
+    def report(self, value, total=None, message=None):
+        self.progress = {"value": value, "total": total, "message": message}
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self._finish(CANCELLED, error="cancelled before start")
+            return
+        self._terminate()
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+
+    def summary(self, include_result=True):
+        started, finished = self.started_at, self.finished_at
+        record = {
+            "job_id": self.id,
+            "tool": self.name,
+            "arguments": self.arguments,
+            "status": self.status,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(started),
+            "finished_at": _iso(finished),
+            "timings": {
+                "queued": round((started or finished or time.time()) - self.created_at, 3),
+                "run": round((finished or time.time()) - started, 3) if started else None,
+                "total": round((finished or time.time()) - self.created_at, 3),
+            },
+            "progress": self.progress,
+            "cancel_requested": self.cancel_requested,
+        }
+        if include_result:
+            record["result"] = self.result
+            record["error"] = self.error
+        return record
+
+
+class JobManager:
+    """작업 실행 / 조회 / 취소
+
+    max_workers: 동시에 실행할 작업 수 (GIT_MCP_MAX_JOBS)
+    history: 보관할 완료 작업 수 (GIT_MCP_JOB_HISTORY)
+    """
+
+    def __init__(self, max_workers=None, history=None):
+        self.max_workers = max_workers or int(os.getenv('GIT_MCP_MAX_JOBS', '4'))
+        self.history = history or int(os.getenv('GIT_MCP_JOB_HISTORY', '100'))
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='git-mcp-job')
+            return self._executor
+
+    def submit(self, name, arguments, fn, cleanup=None):
+        """fn() 을 작업으로 실행하고 Job 반환 (cleanup(job) 은 취소된 작업 정리용)"""
+        job = Job(name, arguments, fn, cleanup)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job.future = self._pool().submit(self._run, job)
+        logger.info(f"작업 등록: {job.id} ({name})")
+        return job
+
+    def _run(self, job):
+        if job.cancel_requested:
+            job._finish(CANCELLED, error="cancelled before start")
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            with gitproc.tracking(job), progress.reporting(job.report):
+                result = job.fn()
+            job._finish(SUCCEEDED, result=result)
+        except Exception as e:
+            if job.cancel_requested and job.cleanup is not None:
+                # 정리가 끝나기 전에 종료 상태를 보이면 조회한 쪽이 정리 전 작업 트리를 보게 된다
+                try:
+                    job.cleanup(job)
+                except Exception as cleanup_error:
+                    logger.warning(f"취소된 작업 정리 중 오류 ({job.id}): {str(cleanup_error)}")
+            job._finish(CANCELLED if job.cancel_requested else FAILED, error=str(e))
+        logger.info(f"작업 종료: {job.id} ({job.name}) {job.status}")
+
+    def _prune(self):
+        """완료된 작업 기록을 history 개까지만 유지 (lock 보유 상태에서 호출)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise Exception(f"작업을 찾을 수 없음: {job_id}")
+        return job
+
+    def list(self, status=None, limit=50):
+        with self._lock:
+            self._prune()
+            jobs = list(self._jobs.values())
+        if status:
+            jobs = [job for job in jobs if job.status == status]
+        return [job.summary(include_result=False) for job in reversed(jobs)][:limit]
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job.status not in FINISHED:
+            job.cancel()
+        return job.summary(include_result=False)
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"max_workers": self.max_workers, "history": self.history, "jobs": counts}
+
+
+# 프로세스 전역 작업 관리자
+job_manager = JobManager()
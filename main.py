@@ -1,16 +1,40 @@
 import os
 import sys
 import json
-import git
-from git import Repo
+import asyncio
+import functools
+import inspect
+import threading
+from urllib.parse import unquote
 from dotenv import load_dotenv
-import requests
 import logging
-from mcp.server.fastmcp import FastMCP
+import pydantic_core
+from mcp.server.fastmcp import FastMCP, Context
+from repo_cache import repo_manager
+from repositories import RepositoryResolver, is_repository
+from cache import result_cache
+import gitproc
+import status_engine
+import status_watcher
+import history_engine
+import commit_index
+import diff_engine
+import merge_engine
+import ref_engine
+import search_engine
+import blob_engine
+import staging
+import worktree_pool
+from dispatcher import ToolRegistry
+import concurrency
+import progress
+from remote_sync import remote_sync
+from jobs import job_manager
+from metrics import log_sampled, metrics
 
-# 로깅 설정
+# 로깅 설정 (GIT_MCP_LOG_LEVEL, 기본 INFO - DEBUG 는 GitPython 명령 로그까지 모두 남겨 느려진다)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv('GIT_MCP_LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     stream=sys.stderr
 )
@@ -26,172 +50,705 @@ GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 logger.info("GIT-MCP-SERVER 시작")
 logger.info(f"저장소 경로: {REPO_PATH}")
 
+class LazyToolsMCP(FastMCP):
+    """도구 등록(도구별 인자 모델 / JSON 스키마 생성)을 첫 tools/list, tools/call 까지 미루는 FastMCP
+
+    initialize 응답에는 도구 스키마가 필요 없으므로 서버 시작 시간에서 빠진다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_tools = []
+        self._pending_lock = threading.Lock()
+
+    def defer_tool(self, fn):
+        self._pending_tools.append(fn)
+
+    def _register_pending(self):
+        if not self._pending_tools:
+            return
+        with self._pending_lock:
+            for fn in self._pending_tools:
+                self.add_tool(fn)
+            self._pending_tools = []
+
+    async def list_tools(self):
+        self._register_pending()
+        return await super().list_tools()
+
+    async def call_tool(self, name, arguments):
+        self._register_pending()
+        return await super().call_tool(name, arguments)
+
 # MCP 서버 생성 (stdio 모드)
-mcp = FastMCP(
+mcp = LazyToolsMCP(
     name="GitMCPServer",
     mode="stdio",
     version="1.0.0",
     description="Git 작업을 위한 MCP 서버"
 )
 
-@mcp.tool()
-def get_repo_status() -> dict:
-    """저장소 상태 조회"""
+# 여러 저장소 지원: 도구의 repo 인자 -> 허용된 저장소 경로
+repositories = RepositoryResolver.from_env(REPO_PATH)
+# 실행 중인 도구가 있는 저장소의 핸들은 LRU / 유휴 정리 대상에서 제외
+repo_manager.is_busy = concurrency.repo_locks.busy
+# ref 가 바뀐 저장소의 ref 캐시만 바로 버린다 (다른 캐시는 객체 ID 키라 오래된 결과가 나오지 않음)
+repo_manager.subscribe(ref_engine.invalidate)
+
+def resolve_repo_path(repo=None, worktree=None):
+    """repo 인자(이름 또는 경로, 생략 시 기본 저장소)를 저장소 경로로 변환 (worktree 임대 ID 가 있으면 그 경로)"""
+    if worktree:
+        return worktree_pool.resolve(worktree)
+    return repositories.resolve(repo)
+
+def get_repo(repo=None, worktree=None):
+    """공유 핸들 관리자에서 저장소 핸들 가져오기"""
+    return repo_manager.get(resolve_repo_path(repo, worktree))
+
+def repo_lock_key(arguments):
+    """도구 인자 -> 잠글 저장소 경로 (기본 저장소가 없고 repo 도 없으면 잠그지 않음)"""
+    if not arguments.get('repo') and not arguments.get('worktree') and not repositories.default:
+        return None
+    return resolve_repo_path(arguments.get('repo'), arguments.get('worktree'))
+
+def cleanup_cancelled_job(job):
+    """취소된 작업이 남긴 index.lock, 중단된 merge / rebase / fast-forward 정리 (작업 시작 이후 생긴 것만)"""
+    path = resolve_repo_path(job.arguments.get('repo'), job.arguments.get('worktree'))
+    with concurrency.repo_locks.locked(path, write=True):
+        repo = repo_manager.get(path)
+
+        def created_by_job(name):
+            target = os.path.join(repo.git_dir, name)
+            return os.path.exists(target) and os.path.getmtime(target) >= job.started_at
+
+        if created_by_job('index.lock'):
+            logger.warning(f"취소된 작업의 index.lock 제거: {job.id}")
+            os.remove(os.path.join(repo.git_dir, 'index.lock'))
+        if created_by_job('MERGE_HEAD'):
+            logger.warning(f"취소된 작업의 merge 중단: {job.id}")
+            repo.git.merge('--abort')
+        elif created_by_job('rebase-merge') or created_by_job('rebase-apply'):
+            logger.warning(f"취소된 작업의 rebase 중단: {job.id}")
+            repo.git.rebase('--abort')
+        elif created_by_job('ORIG_HEAD') and repo.git.rev_parse('ORIG_HEAD') == repo.git.rev_parse('HEAD'):
+            # merge / fast-forward 가 HEAD 를 옮기기 전(예: pre-merge-commit hook)에 중단되면
+            # MERGE_HEAD 없이 index 와 작업 트리만 바뀐 채 남는다
+            logger.warning(f"취소된 작업의 index / 작업 트리 변경 되돌림: {job.id}")
+            repo.git.reset('-q', '--merge', 'ORIG_HEAD')
+    status_watcher.invalidate(path)
+
+# JSON-RPC 디스패처용 도구 레지스트리 (저장소별 읽기/쓰기 잠금, background 작업 적용)
+registry = ToolRegistry(
+    locks=concurrency.repo_locks, lock_key=repo_lock_key,
+    jobs=job_manager, on_cancel=cleanup_cancelled_job
+)
+
+def progress_reporter(ctx, loop):
+    """MCP 진행 알림(notifications/progress) 보고 함수 - 클라이언트가 progressToken 을 보낸 경우만"""
     try:
-        logger.info("저장소 상태 조회 시작")
-        repo = Repo(REPO_PATH)
-        result = {
-            "current_branch": repo.active_branch.name,
-            "is_dirty": repo.is_dirty(),
-            "untracked_files": repo.untracked_files,
-            "modified_files": [item.a_path for item in repo.index.diff(None)],
-            "staged_files": [item.a_path for item in repo.index.diff('HEAD')]
-        }
-        logger.info(f"저장소 상태: {result}")
+        meta = ctx.request_context.meta if ctx is not None else None
+    except ValueError:
+        # 요청 밖에서 호출된 경우 (예: 직접 call_tool)
+        meta = None
+    if meta is None or meta.progressToken is None:
+        return None
+
+    def send(value, total=None, message=None):
+        asyncio.run_coroutine_threadsafe(ctx.report_progress(value, total), loop)
+
+    return progress.throttled(send)
+
+def serialize_result(name, result):
+    """도구 결과를 FastMCP 와 같은 방식으로 JSON 텍스트로 바꾸고 응답 크기를 기록
+
+    FastMCP 는 문자열을 그대로 TextContent 로 보내므로 응답 내용은 같고, 직렬화가
+    이벤트 루프 대신 실행기 스레드에서 한 번만 일어난다. 리스트는 FastMCP 처럼 항목별로 나눈다.
+    """
+    if isinstance(result, (list, tuple)):
+        items = [serialize_result(None, item) for item in result]
+    elif result is None or isinstance(result, str):
+        items = result
+    else:
+        try:
+            # FastMCP(pydantic_core.to_json)처럼 비 ASCII 문자를 \uXXXX 로 바꾸지 않는다 (응답 크기도 실제 UTF-8 기준)
+            items = json.dumps(pydantic_core.to_jsonable_python(result), ensure_ascii=False)
+        except Exception:
+            # Content 객체 등은 FastMCP 에 그대로 맡긴다
+            return result
+    if name is not None:
+        texts = items if isinstance(items, list) else [items]
+        metrics.observe_response(name, sum(len(text.encode('utf-8')) for text in texts if isinstance(text, str)))
+    return items
+
+def call_tool(name, arguments, reporter=None):
+    """실행기 스레드에서 진행 보고 함수를 연결하고 도구 호출"""
+    with progress.reporting(reporter):
+        result = registry.call(name, arguments)
+    return serialize_result(name, result) if metrics.enabled else result
+
+def tool(read_only=False, locked=True, background=False):
+    """MCP 도구 등록 (FastMCP + 디스패처 레지스트리)
+
+    read_only: 저장소를 변경하지 않는 도구 - 공유 잠금으로 다른 읽기 도구와 동시에 실행된다
+    locked: False 면 호출 전체에 잠금을 잡지 않는다 (도구가 필요한 구간에서 직접 잠금)
+    background: True 면 background=true 인자로 작업 실행 가능 (get_job / cancel_job 으로 관리)
+    """
+    def decorator(fn):
+        registry.register(fn, read_only=read_only, locked=locked, background=background)
+
+        @functools.wraps(fn)
+        async def run_tool(mcp_context: Context = None, **kwargs):
+            # 이벤트 루프를 막지 않도록 실행기 스레드에서 잠금을 잡고 실행
+            reporter = progress_reporter(mcp_context, asyncio.get_running_loop())
+            return await concurrency.run_async(call_tool, fn.__name__, kwargs, reporter)
+
+        # FastMCP 가 Context 를 주입하도록 원래 시그니처에 mcp_context 인자를 더한다
+        signature = inspect.signature(fn)
+        parameters = list(signature.parameters.values())
+        if background:
+            parameters.append(inspect.Parameter(
+                'background', inspect.Parameter.POSITIONAL_OR_KEYWORD, default=False, annotation=bool
+            ))
+        parameters.append(
+            inspect.Parameter('mcp_context', inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Context)
+        )
+        run_tool.__signature__ = signature.replace(parameters=parameters)
+        mcp.defer_tool(run_tool)
+        return fn
+    return decorator
+
+@tool(read_only=True)
+def get_repo_status(untracked: str = 'all', paths: list = None, max_entries: int = None, repo: str = None,
+                    worktree: str = None) -> dict:
+    """저장소 상태 조회
+
+    untracked: 추적되지 않는 파일 조회 방식 ('all', 'normal', 'no')
+    paths: 조회 대상 경로(pathspec) 목록
+    max_entries: 반환할 최대 항목 수
+    worktree: lease_worktree 로 받은 임대 ID (해당 worktree 의 상태 조회)
+    """
+    try:
+        logger.debug("저장소 상태 조회 시작")
+        repo = get_repo(repo, worktree)
+        watcher = status_watcher.get_watcher(repo)
+        if watcher and paths is None:
+            # 감시 모드: 메모리 상태 맵에서 바로 응답
+            result = watcher.snapshot(untracked=untracked, max_entries=max_entries)
+            if result is not None:
+                return result
+        result = status_engine.repo_status(
+            repo.working_tree_dir,
+            untracked=untracked,
+            paths=paths,
+            max_entries=max_entries
+        )
+        # 상태 결과는 클 수 있으므로 DEBUG 일 때만, GIT_MCP_LOG_SAMPLE 번에 한 번 포맷한다
+        log_sampled(logger, logging.DEBUG, 'get_repo_status', "저장소 상태: %s", result)
         return result
     except Exception as e:
         logger.error(f"저장소 상태 조회 중 오류 발생: {str(e)}")
         raise
 
-@mcp.tool()
-def commit_changes(message: str, files: list = None) -> str:
-    """변경사항 커밋"""
-    try:
-        logger.info(f"커밋 시작 - 메시지: {message}, 파일: {files}")
-        repo = Repo(REPO_PATH)
-        
-        if files:
-            # 파일 경로를 절대 경로로 변환
-            absolute_files = [os.path.join(REPO_PATH, file) for file in files]
-            logger.debug(f"절대 경로로 변환된 파일 목록: {absolute_files}")
-            
-            # 각 파일에 대해 존재 여부 확인
-            for file_path in absolute_files:
-                if os.path.exists(file_path):
-                    # 파일이 존재하면 추가
-                    logger.debug(f"파일 추가: {file_path}")
-                    repo.index.add([file_path])
-                else:
-                    # 파일이 존재하지 않으면 삭제로 처리
-                    relative_path = os.path.relpath(file_path, REPO_PATH)
-                    logger.debug(f"파일 삭제: {relative_path}")
-                    repo.index.remove([relative_path], working_tree=True)
-        else:
-            # 모든 변경사항 추가
-            logger.debug("모든 변경사항 추가")
-            repo.index.add('*')
-            repo.git.add('-A')
-            
-        commit = repo.index.commit(message)
-        logger.info(f"커밋 완료: {commit.hexsha}")
-        return "Changes committed successfully"
+# 저장소 상태 리소스 (구독 시 상태 변경 알림)
+# git://status 는 기본 저장소, git://status/<repo> 는 repo 인자와 같은 이름 / 경로(URL 인코딩)
+STATUS_RESOURCE_URI = "git://status"
+# (세션, URI) -> (이벤트 루프, 감시 중인 작업 트리)
+_status_subscribers = {}
+
+def status_resource_repo(uri):
+    """상태 리소스 URI -> 저장소 경로"""
+    uri = str(uri)
+    if uri == STATUS_RESOURCE_URI:
+        return resolve_repo_path()
+    prefix = STATUS_RESOURCE_URI + '/'
+    if uri.startswith(prefix) and len(uri) > len(prefix):
+        return resolve_repo_path(unquote(uri[len(prefix):]))
+    raise Exception(f"Unknown resource: {uri}")
+
+@mcp.resource(STATUS_RESOURCE_URI, name="repo_status", description="저장소 상태", mime_type="application/json")
+async def repo_status_resource() -> str:
+    """저장소 상태 리소스"""
+    result = await concurrency.run_async(registry.call, 'get_repo_status')
+    return json.dumps(result, ensure_ascii=False)
+
+@mcp.resource(STATUS_RESOURCE_URI + "/{repo}", name="repo_status_by_repo", description="지정한 저장소의 상태",
+              mime_type="application/json")
+async def repo_status_resource_by_repo(repo: str) -> str:
+    """저장소 상태 리소스 (repo 지정)"""
+    result = await concurrency.run_async(registry.call, 'get_repo_status', {'repo': unquote(repo)})
+    return json.dumps(result, ensure_ascii=False)
+
+def _watch_status(uri):
+    """URI 의 저장소 감시 시작 후 작업 트리 경로 반환 (도구 실행기에서 실행)"""
+    repo = repo_manager.get(status_resource_repo(uri))
+    status_watcher.get_watcher(repo, force=True)
+    return os.path.realpath(repo.working_tree_dir)
+
+# FastMCP 는 구독 핸들러를 노출하지 않으므로 하위 서버에 직접 등록
+@mcp._mcp_server.subscribe_resource()
+async def subscribe_resource(uri):
+    """리소스 구독 - 감시 모드가 꺼져 있어도 구독자가 있으면 감시를 시작"""
+    session = mcp._mcp_server.request_context.session
+    # 저장소 열기 / inotify 감시 스레드 시작은 블로킹 작업이므로 이벤트 루프 밖에서 실행
+    work_tree = await concurrency.run_async(_watch_status, uri)
+    _status_subscribers[(session, str(uri))] = (asyncio.get_running_loop(), work_tree)
+    logger.info(f"저장소 상태 리소스 구독: {uri}")
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe_resource(uri):
+    """리소스 구독 해제"""
+    _status_subscribers.pop((mcp._mcp_server.request_context.session, str(uri)), None)
+
+def _notify_status_subscribers(work_tree, version):
+    """감시 스레드에서 호출 - 해당 저장소를 구독한 세션에 resources/updated 알림 전송"""
+    for (session, uri), (loop, watched) in list(_status_subscribers.items()):
+        if watched != work_tree:
+            continue
+        future = asyncio.run_coroutine_threadsafe(session.send_resource_updated(uri), loop)
+        future.add_done_callback(_drop_subscriber_on_error((session, uri)))
+
+def _drop_subscriber_on_error(key):
+    def callback(future):
+        if future.cancelled() or future.exception():
+            _status_subscribers.pop(key, None)
+    return callback
+
+status_watcher.subscribe(_notify_status_subscribers)
+
+@tool(background=True)
+def commit_changes(message: str, files: list = None, dry_run: bool = False, repo: str = None,
+                   worktree: str = None) -> dict:
+    """변경사항 커밋
+
+    files: 커밋할 파일 또는 pathspec 글롭 목록 (생략 시 전체 변경사항)
+    dry_run: 커밋하지 않고 스테이징될 목록만 반환
+    worktree: lease_worktree 로 받은 임대 ID (해당 worktree 에서 커밋)
+    """
+    try:
+        logger.info("커밋 시작 - 메시지: %s, 파일: %s", message, files)
+        repo = get_repo(repo, worktree)
+        try:
+            result = staging.commit(repo.working_tree_dir, message, pathspecs=files, dry_run=dry_run)
+        finally:
+            # 상태 감시자가 이벤트 debounce 전에 조회돼도 이 커밋을 반영하도록
+            status_watcher.invalidate(repo.working_tree_dir)
+        if dry_run:
+            return result
+        logger.info("커밋 완료: %s", result["commit"])
+        result["message"] = "Changes committed successfully"
+        return result
     except Exception as e:
         logger.error(f"커밋 중 오류 발생: {str(e)}")
         raise
 
-@mcp.tool()
-def push_changes(remote: str = 'origin', branch: str = None):
-    """변경사항 푸시"""
+@tool(background=True)
+def push_changes(remote: str = 'origin', branch: str = None, repo: str = None):
+    """변경사항 푸시 (진행 상황을 MCP 진행 알림으로 보고)"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         if not branch:
             branch = repo.active_branch.name
         origin = repo.remote(remote)
-        origin.push(branch)
+        git_progress = progress.git_progress()
+        git_progress.add(progress.current())
+        origin.push(branch, progress=git_progress)
         return f"Changes pushed to {remote}/{branch}"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def pull_changes(remote='origin', branch=None):
-    """변경사항 풀"""
+@tool(locked=False, background=True)
+def fetch_changes(remote: str = 'origin', repo: str = None):
+    """원격 fetch (같은 원격에 진행 중인 fetch 가 있으면 그 결과를 공유)"""
     try:
-        repo = Repo(REPO_PATH)
-        if not branch:
-            branch = repo.active_branch.name
-        origin = repo.remote(remote)
-        origin.pull(branch)
-        return f"Changes pulled from {remote}/{branch}"
+        return remote_sync.fetch(resolve_repo_path(repo), remote, progress.current())
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def create_branch(branch_name):
+def pull_source(path, remote, branch=None):
+    """pull 할 remote-tracking ref (branch 생략 시 remote 에 있는 현재 브랜치의 upstream, 없으면 같은 이름)"""
+    current = gitproc.output(path, ['symbolic-ref', '-q', '--short', 'HEAD'], ok_codes=(0, 1)).strip()
+    if not current:
+        raise Exception("detached HEAD 에서는 pull 할 수 없습니다")
+    if not branch:
+        upstream_remote, _, upstream = gitproc.output(path, [
+            'for-each-ref', '--format=%(upstream:remotename)%00%(upstream)', f'refs/heads/{current}'
+        ]).strip().partition('\0')
+        if upstream_remote == remote and upstream:
+            return current, upstream
+        branch = current
+    return current, f'refs/remotes/{remote}/{branch}'
+
+def pull_rebase_mode(path, current):
+    """branch.<name>.rebase, 없으면 pull.rebase 값 (git pull 과 같은 우선순위)"""
+    for key in (f'branch.{current}.rebase', 'pull.rebase'):
+        value = gitproc.output(path, ['config', '--get', key], ok_codes=(0, 1)).strip()
+        if value:
+            return value.lower()
+    return None
+
+@tool(locked=False, background=True)
+def pull_changes(remote='origin', branch=None, repo: str = None):
+    """변경사항 풀 (fetch 는 다른 요청과 공유, 병합할 때만 저장소 쓰기 잠금)
+
+    branch 를 생략하면 현재 브랜치의 upstream(branch.<name>.merge)을 가져온다.
+    병합 방식은 git pull 과 같이 pull.ff, pull.rebase, branch.<name>.rebase 설정을 따른다.
+    """
+    try:
+        path = resolve_repo_path(repo)
+        fetched = remote_sync.fetch(path, remote, progress.current())
+        with concurrency.repo_locks.locked(path, write=True):
+            current, source = pull_source(path, remote, branch)
+            if pull_rebase_mode(path, current) in ('interactive', 'i'):
+                raise Exception("rebase=interactive 는 대화형 편집이 필요해 지원하지 않습니다")
+            if gitproc.run(path, ['rev-parse', '-q', '--verify', source], ok_codes=(0, 1))[0]:
+                raise Exception(f"원격 브랜치를 찾을 수 없습니다: {source}")
+            # 이미 fetch 한 remote-tracking ref 를 현재 저장소(.)에서 pull 해 다시 fetch 하지 않고
+            # git pull 의 병합 / rebase / fast-forward 규칙을 그대로 적용한다
+            try:
+                gitproc.run(path, ['pull', '--no-edit', '.', source])
+            finally:
+                status_watcher.invalidate(path)
+        return {
+            "message": f"Changes pulled from {source.removeprefix('refs/remotes/')}",
+            "fetch": fetched,
+        }
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool()
+def create_branch(branch_name, repo: str = None):
     """새 브랜치 생성"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         current = repo.active_branch
         new_branch = repo.create_head(branch_name)
-        new_branch.checkout()
+        try:
+            new_branch.checkout()
+        finally:
+            status_watcher.invalidate(repo.working_tree_dir)
         return f"Created and switched to branch {branch_name}"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def switch_branch(branch_name):
+@tool()
+def switch_branch(branch_name, repo: str = None):
     """브랜치 전환"""
     try:
-        repo = Repo(REPO_PATH)
-        repo.heads[branch_name].checkout()
+        repo = get_repo(repo)
+        try:
+            repo.heads[branch_name].checkout()
+        finally:
+            status_watcher.invalidate(repo.working_tree_dir)
         return f"Switched to branch {branch_name}"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def merge_branch(source_branch):
-    """브랜치 병합"""
+@tool(read_only=True)
+def preview_merge(source_branch: str, target: str = 'HEAD', hunks: bool = True,
+                  max_bytes: int = merge_engine.DEFAULT_MAX_HUNK_BYTES, repo: str = None, worktree: str = None):
+    """병합 미리보기 (작업 트리 / index 변경 없음)
+
+    결과 트리, 충돌 파일(단계별 blob), 충돌 hunk 를 반환한다.
+    max_bytes: 충돌 hunk 를 읽을 최대 바이트 (초과 시 truncated)
+    """
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo, worktree)
+        return merge_engine.preview(repo.working_tree_dir, source_branch, target, hunks, max_bytes)
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(background=True)
+def merge_branch(source_branch, fast_path: bool = False, message: str = None, repo: str = None,
+                 worktree: str = None):
+    """브랜치 병합
+
+    fast_path: 미리보기가 깨끗하면 git merge 대신 병합 커밋을 직접 만들고 바뀐 파일만 갱신
+               (충돌이면 아무것도 바꾸지 않고 충돌 목록 반환, merge hook 은 실행되지 않음)
+    """
+    try:
+        repo = get_repo(repo, worktree)
         current = repo.active_branch
-        repo.git.merge(source_branch)
+        try:
+            if fast_path:
+                result = merge_engine.fast_merge(repo.working_tree_dir, source_branch, message)
+                if result["up_to_date"]:
+                    result["message"] = "Already up to date"
+                elif not result["merged"]:
+                    result["message"] = f"Merge conflicts: {', '.join(c['path'] for c in result['conflicts'])}"
+                else:
+                    result["message"] = f"Merged {source_branch} into {current.name}"
+                return result
+            if message:
+                repo.git.merge(source_branch, '-m', message)
+            else:
+                repo.git.merge(source_branch)
+        finally:
+            status_watcher.invalidate(repo.working_tree_dir)
         return f"Merged {source_branch} into {current.name}"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def get_commit_history(limit=10):
-    """커밋 히스토리 조회"""
+@tool(read_only=True)
+def get_commit_history(limit: int = 10, cursor: str = None, revision: str = 'HEAD', fields: list = None,
+                       paths: list = None, author: str = None, since: str = None, until: str = None, repo: str = None):
+    """커밋 히스토리 조회
+
+    limit: 페이지당 커밋 수
+    cursor: 이전 응답의 next_cursor (주어지면 나머지 필터는 첫 페이지 값을 사용)
+    revision: 시작 리비전 또는 범위 (예: 'main', 'v1.0..HEAD')
+    fields: 반환할 필드 목록 (기본: hash, message, author, date)
+    paths / author / since / until: 조회 필터
+    """
     try:
-        repo = Repo(REPO_PATH)
-        commits = list(repo.iter_commits('HEAD', max_count=limit))
-        return [{
-            "hash": commit.hexsha,
-            "message": commit.message,
-            "author": commit.author.name,
-            "date": commit.authored_datetime.isoformat()
-        } for commit in commits]
+        repo = get_repo(repo)
+        return history_engine.history_page(
+            repo.working_tree_dir,
+            limit=10 if limit is None else limit,
+            revision=revision,
+            fields=fields,
+            paths=paths,
+            author=author,
+            since=since,
+            until=until,
+            cursor=cursor
+        )
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def get_branch_info():
-    """브랜치 정보 조회"""
+def commit_index_generation(path):
+    """커밋 인덱스 확인용 세대 번호 - HEAD / refs / packed-refs 가 바뀌면 달라진다"""
+    return repo_manager.generation(path, 'head', 'refs', 'packed_refs')
+
+def get_commit_index(repo=None):
+    """커밋 인덱스 (refs 가 바뀌었으면 증분 갱신 후 반환)"""
+    path = resolve_repo_path(repo)
+    return commit_index.get_index(repo_manager.get(path), commit_index_generation(path))
+
+@tool()
+def update_commit_index(rebuild: bool = False, repo: str = None):
+    """커밋 인덱스 갱신 (rebuild=True 면 전체 재색인) - 이번 갱신에서 추가 / 삭제한 커밋 수 반환"""
     try:
-        repo = Repo(REPO_PATH)
-        branches = [branch.name for branch in repo.heads]
-        current = repo.active_branch.name
-        return {
+        path = resolve_repo_path(repo)
+        index = commit_index.open_index(repo_manager.get(path))
+        return index.update(rebuild=rebuild, generation=commit_index_generation(path))
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def find_commits_by_path(path: str, limit: int = 50, repo: str = None):
+    """파일 또는 디렉터리를 변경한 커밋 조회 (커밋 인덱스 사용)"""
+    try:
+        return {"commits": get_commit_index(repo).commits_by_path(path, limit)}
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def find_commits_by_author(author: str, since: str = None, until: str = None, limit: int = 50, repo: str = None):
+    """작성자(이름 또는 이메일)별 커밋 조회 (커밋 인덱스 사용)
+
+    since / until: ISO 8601 날짜 (예: 2024-07-01) 또는 유닉스 시각
+    """
+    try:
+        return {"commits": get_commit_index(repo).commits_by_author(author, since, until, limit)}
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def search_commit_messages(text: str, limit: int = 50, oldest_first: bool = False, repo: str = None):
+    """커밋 메시지 검색 (커밋 인덱스 사용, oldest_first=True 면 가장 오래된 커밋부터)"""
+    try:
+        return {"commits": get_commit_index(repo).search_messages(text, limit, oldest_first)}
+    except Exception as e:
+        raise Exception(str(e))
+
+def ref_generation(repo=None):
+    """ref 캐시 키 - refs / packed-refs / HEAD / config 가 바뀌면 달라진다"""
+    return repo_manager.generation(resolve_repo_path(repo), 'head', 'refs', 'packed_refs', 'config')
+
+@tool(read_only=True)
+def read_file_at(path: str, revision: str = 'HEAD', offset: int = 0, length: int = None, line_range: list = None,
+                 repo: str = None):
+    """리비전의 파일 내용 읽기 (checkout 없이, 요청한 구간만 메모리에 올림)
+
+    offset / length: 바이트 구간 (length 기본 64KB, 최대 4MB, 바이너리는 base64)
+    line_range: [시작 줄, 끝 줄] - 줄 단위로 읽기 (total_lines 포함)
+    """
+    try:
+        return blob_engine.read_blob(get_repo(repo), revision, path, offset, length, line_range)
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def blame(path: str, revision: str = 'HEAD', line_range: list = None, repo: str = None):
+    """줄별 마지막 변경 커밋 (blame --incremental, 커밋 / blob 기준 캐시)
+
+    line_range: [시작 줄, 끝 줄]
+    반환: ranges (start, lines, commit, orig_start, orig_path) 와 커밋별 작성자 / 시각 / 제목
+    """
+    try:
+        return blob_engine.blame(get_repo(repo), revision, path, line_range)
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True, background=True)
+def search_code(pattern: str, revisions: list = None, paths: list = None, fixed_strings: bool = False,
+                ignore_case: bool = False, word: bool = False, context_lines: int = 0,
+                max_results: int = search_engine.DEFAULT_MAX_RESULTS, max_per_file: int = None,
+                repo: str = None):
+    """파일 내용 검색 (git grep, 리비전 / 경로별로 나눠 병렬 실행)
+
+    pattern: 확장 정규식 (fixed_strings=True 면 문자열 그대로)
+    revisions: 검색할 리비전 목록 (기본 HEAD)
+    paths: pathspec 목록
+    context_lines: 결과마다 앞뒤로 포함할 줄 수
+    max_results: 결과 상한 (도달하면 검색을 멈추고 truncated=True)
+    max_per_file: 파일당 최대 결과 수
+    """
+    try:
+        path = get_repo(repo).working_tree_dir
+        return search_engine.search(
+            path,
+            pattern,
+            revisions=revisions,
+            paths=paths,
+            fixed_strings=fixed_strings,
+            ignore_case=ignore_case,
+            word=word,
+            context_lines=context_lines,
+            max_results=max_results,
+            max_per_file=max_per_file
+        )
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def get_branch_info(details: bool = False, repo: str = None):
+    """브랜치 정보 조회
+
+    details: 브랜치별 팁 SHA, 날짜, 작성자, upstream, ahead/behind 포함
+    """
+    try:
+        path = get_repo(repo).working_tree_dir
+        branches = ref_engine.list_refs(path, kinds=['branch'], limit=None, generation=ref_generation(repo))["refs"]
+        current = next((branch["name"] for branch in branches if branch["current"]), None)
+        result = {
             "current": current,
-            "all_branches": branches
+            "all_branches": [branch["name"] for branch in branches]
         }
+        if details:
+            result["branches"] = branches
+        return result
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def get_diff_stats():
-    """변경사항 통계 조회"""
+@tool(read_only=True)
+def list_refs(kinds: list = None, pattern: list = None, sort: str = 'name', offset: int = 0, limit: int = 100,
+              repo: str = None):
+    """브랜치 / 원격 브랜치 / 태그 목록 (for-each-ref 한 번으로 조회, ref 가 바뀔 때까지 캐시)
+
+    kinds: 'branch', 'remote', 'tag' 중 일부 (생략 시 전부)
+    pattern: 이름 glob 패턴 목록 (예: ["release/*", "v2.*"])
+    sort: 'name', 'date', 'version' (앞에 '-' 를 붙이면 역순, 예: '-date')
+    offset / limit: 페이지 (다음 페이지는 반환된 next_offset 사용)
+    """
     try:
-        repo = Repo(REPO_PATH)
-        stats = repo.git.diff('--stat')
-        return {"stats": stats}
+        path = get_repo(repo).working_tree_dir
+        return ref_engine.list_refs(
+            path,
+            kinds=kinds,
+            patterns=pattern,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            generation=ref_generation(repo)
+        )
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def list_repositories():
+    """접근 가능한 저장소 목록"""
+    try:
+        return {"repositories": repositories.list()}
+    except Exception as e:
+        logger.error(f"저장소 목록 조회 중 오류 발생: {str(e)}")
+        raise Exception(str(e))
+
+@tool(read_only=True)
+def get_repository_cache_stats():
+    """저장소 핸들 캐시 지표 (적중률, 제거 횟수)"""
+    return repo_manager.stats()
+
+@tool(read_only=True, locked=False)
+def get_cache_stats(clear: bool = False):
+    """결과 캐시 지표 - 메모리 / 디스크 계층, 결과 종류(diff, history, blame, merge_preview)별 적중률
+
+    clear: 결과 캐시 비우기 (지표는 비우기 전 값)
+    """
+    stats = {"results": result_cache.stats(), "refs": ref_engine.ref_cache.stats()}
+    if clear:
+        result_cache.clear()
+    return stats
+
+# get_server_metrics 의 캐시 적중 / 미적중 지표
+metrics.register_cache('repo_handles', repo_manager.stats)
+metrics.register_cache('refs', ref_engine.ref_cache.stats)
+metrics.register_cache('results_memory', lambda: result_cache.memory.stats())
+metrics.register_cache('results_disk', lambda: result_cache.disk.stats() if result_cache.disk is not None else None)
+for _namespace in ('diff', 'history', 'blame', 'merge_preview'):
+    metrics.register_cache(f'results.{_namespace}',
+                           lambda namespace=_namespace: result_cache.stats()["namespaces"].get(namespace))
+metrics.register_cache('github', lambda: _github.cache.stats() if _github is not None else None)
+
+@tool(read_only=True, locked=False)
+def get_server_metrics(format: str = 'json', reset: bool = False):
+    """서버 지표 - 도구별 지연 시간(p50/p95/p99)과 응답 크기, git 명령 / GitHub 요청 수와 소요 시간, 캐시 적중률
+
+    format: 'json' 또는 'prometheus' (Prometheus 텍스트 형식 문자열)
+    reset: 조회 후 도구 / git / GitHub 지표 초기화 (캐시 지표는 각 캐시가 관리)
+    """
+    if format not in ('json', 'prometheus'):
+        raise Exception("format 은 'json' 또는 'prometheus' 여야 합니다")
+    result = metrics.prometheus() if format == 'prometheus' else metrics.snapshot()
+    if reset:
+        metrics.reset()
+    return result
+
+@tool(read_only=True)
+def get_diff_stats(base: str = None, target: str = None, cached: bool = False, paths: list = None,
+                   hunks: bool = False, context_lines: int = 3,
+                   max_bytes: int = diff_engine.DEFAULT_MAX_BYTES, max_lines: int = diff_engine.DEFAULT_MAX_LINES,
+                   find_copies: bool = False, repo: str = None, worktree: str = None):
+    """변경사항 통계 조회
+
+    base / target: 비교할 리비전 (생략 시 작업 트리 vs index, base 만 주면 base vs 작업 트리)
+    cached: index(스테이징) 기준 비교
+    hunks: 파일별 변경 hunk 포함 여부 (max_bytes / max_lines 예산 초과 시 truncated 표시)
+    find_copies: 복사 감지 사용
+    worktree: lease_worktree 로 받은 임대 ID
+    """
+    try:
+        repo = get_repo(repo, worktree)
+        return diff_engine.diff(
+            repo.working_tree_dir,
+            base=base,
+            target=target,
+            cached=cached,
+            paths=paths,
+            hunks=hunks,
+            context_lines=context_lines,
+            max_bytes=max_bytes,
+            max_lines=max_lines,
+            find_copies=find_copies
+        )
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def create_tag(tag_name, message=None, commit_hash=None):
+@tool()
+def create_tag(tag_name, message=None, commit_hash=None, repo: str = None):
     """태그 생성"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         if commit_hash:
             commit = repo.commit(commit_hash)
         else:
@@ -202,21 +759,29 @@ def create_tag(tag_name, message=None, commit_hash=None):
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def list_tags():
-    """태그 목록 조회"""
+@tool(read_only=True)
+def list_tags(pattern: str = None, details: bool = False, repo: str = None):
+    """태그 목록 조회
+
+    pattern: 태그 이름 glob 패턴 (예: "v1.*")
+    details: 태그별 대상 커밋, 날짜, 주석 태그 메시지 포함
+    """
     try:
-        repo = Repo(REPO_PATH)
-        tags = [tag.name for tag in repo.tags]
-        return {"tags": tags}
+        path = get_repo(repo).working_tree_dir
+        tags = ref_engine.list_refs(path, kinds=['tag'], patterns=pattern, limit=None,
+                                    generation=ref_generation(repo))["refs"]
+        result = {"tags": [tag["name"] for tag in tags]}
+        if details:
+            result["details"] = tags
+        return result
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def delete_tag(tag_name, remote=False):
+@tool()
+def delete_tag(tag_name, remote=False, repo: str = None):
     """태그 삭제"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         repo.delete_tag(tag_name)
         if remote:
             repo.git.push('origin', f':refs/tags/{tag_name}')
@@ -224,176 +789,163 @@ def delete_tag(tag_name, remote=False):
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def list_remotes():
+@tool(read_only=True)
+def list_remotes(repo: str = None):
     """원격 저장소 목록 조회"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         remotes = [remote.name for remote in repo.remotes]
         return {"remotes": remotes}
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def add_remote(name, url):
+@tool()
+def add_remote(name, url, repo: str = None):
     """원격 저장소 추가"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         repo.create_remote(name, url)
         return f"Added remote {name}"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def remove_remote(name):
+@tool()
+def remove_remote(name, repo: str = None):
     """원격 저장소 제거"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         repo.delete_remote(name)
         return f"Removed remote {name}"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def set_remote_url(name, url):
+@tool()
+def set_remote_url(name, url, repo: str = None):
     """원격 저장소 URL 변경"""
     try:
-        repo = Repo(REPO_PATH)
+        repo = get_repo(repo)
         remote = repo.remote(name)
         remote.set_url(url)
         return f"Updated remote {name} URL"
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def create_pull_request(title, body, head, base='main', repo_owner=None, repo_name=None):
+_github = None
+
+def github():
+    """공유 GitHub API 클라이언트 (연결 풀, ETag 캐시, rate limit 대기)"""
+    global _github
+    if not GITHUB_TOKEN:
+        raise Exception("GitHub token not configured")
+    if _github is None:
+        # requests 를 포함한 GitHub 클라이언트는 PR 도구를 처음 쓸 때 import
+        from github_client import GitHubClient
+        _github = GitHubClient(token=GITHUB_TOKEN)
+    return _github
+
+def github_repo_path(repo=None, repo_owner=None, repo_name=None):
+    """repos/{owner}/{name} API 경로 (owner/name 이 없으면 origin URL 에서 추출)"""
+    client = github()
+    if not repo_owner or not repo_name:
+        parsed = client.parse_remote(get_repo(repo).remote('origin').url)
+        if not parsed:
+            raise Exception("Could not determine repository owner and name")
+        repo_owner, repo_name = parsed
+    return f'repos/{repo_owner}/{repo_name}'
+
+@tool()
+def create_pull_request(title, body, head, base='main', repo_owner=None, repo_name=None, repo: str = None):
     """풀 리퀘스트 생성"""
     try:
-        if not GITHUB_TOKEN:
-            raise Exception("GitHub token not configured")
-            
-        if not repo_owner or not repo_name:
-            repo = Repo(REPO_PATH)
-            origin_url = repo.remote('origin').url
-            if origin_url.startswith('https://github.com/'):
-                parts = origin_url.replace('https://github.com/', '').replace('.git', '').split('/')
-                repo_owner, repo_name = parts[0], parts[1]
-            else:
-                raise Exception("Could not determine repository owner and name")
-
-        headers = {
-            'Authorization': f'token {GITHUB_TOKEN}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
         data = {
             'title': title,
             'body': body,
             'head': head,
             'base': base
         }
-        
-        response = requests.post(
-            f'https://api.github.com/repos/{repo_owner}/{repo_name}/pulls',
-            headers=headers,
-            json=data
+        return github().post(
+            f'{github_repo_path(repo, repo_owner, repo_name)}/pulls', json=data,
+            default_error='Failed to create pull request'
         )
-        
-        if response.status_code == 201:
-            return response.json()
-        else:
-            raise Exception(response.json().get('message', 'Failed to create pull request'))
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def list_pull_requests(state='open', repo_owner=None, repo_name=None):
-    """풀 리퀘스트 목록 조회"""
-    try:
-        if not GITHUB_TOKEN:
-            raise Exception("GitHub token not configured")
-            
-        if not repo_owner or not repo_name:
-            repo = Repo(REPO_PATH)
-            origin_url = repo.remote('origin').url
-            if origin_url.startswith('https://github.com/'):
-                parts = origin_url.replace('https://github.com/', '').replace('.git', '').split('/')
-                repo_owner, repo_name = parts[0], parts[1]
-            else:
-                raise Exception("Could not determine repository owner and name")
+# 목록/일괄 조회 기본 반환 필드 (PR 전체 JSON 은 건당 수십 KB)
+PULL_REQUEST_FIELDS = (
+    'number', 'title', 'state', 'draft', 'user.login', 'head.ref', 'base.ref',
+    'html_url', 'created_at', 'updated_at'
+)
 
-        headers = {
-            'Authorization': f'token {GITHUB_TOKEN}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
-        response = requests.get(
-            f'https://api.github.com/repos/{repo_owner}/{repo_name}/pulls',
-            headers=headers,
-            params={'state': state}
+def project_pull_request(pull, fields=None):
+    """필드 선택 (fields=['*'] 이면 전체)"""
+    if fields and '*' in fields:
+        return pull
+    from github_client import project
+    return project(pull, fields or PULL_REQUEST_FIELDS)
+
+@tool(read_only=True)
+def list_pull_requests(state='open', repo_owner=None, repo_name=None, repo: str = None,
+                       fields: list = None, limit: int = None):
+    """풀 리퀘스트 목록 조회 (전체 페이지, fields 로 반환 필드 선택, limit 으로 최대 개수 제한)
+
+    페이지는 도착하는 대로 처리하며 모은 개수를 진행 알림으로 보낸다. limit 을 채우는 데
+    필요한 페이지만 요청한다.
+    """
+    try:
+        pulls, seen = [], set()
+        pages = github().paginate(
+            f'{github_repo_path(repo, repo_owner, repo_name)}/pulls', params={'state': state},
+            default_error='Failed to list pull requests', limit=limit
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(response.json().get('message', 'Failed to list pull requests'))
+        try:
+            for page in pages:
+                progress.report(len(pulls) + len(page), limit, "pull requests")
+                for pull in page:
+                    # 페이지 조회 사이에 PR 이 추가되면 다음 페이지에 같은 PR 이 다시 나올 수 있다
+                    if pull.get('number') in seen:
+                        continue
+                    seen.add(pull.get('number'))
+                    pulls.append(project_pull_request(pull, fields))
+                    if limit and len(pulls) >= limit:
+                        return pulls
+        finally:
+            pages.close()
+        return pulls
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def get_pull_request(pull_number, repo_owner=None, repo_name=None):
+@tool(read_only=True)
+def get_pull_request(pull_number, repo_owner=None, repo_name=None, repo: str = None):
     """풀 리퀘스트 상세 조회"""
     try:
-        if not GITHUB_TOKEN:
-            raise Exception("GitHub token not configured")
-            
-        if not repo_owner or not repo_name:
-            repo = Repo(REPO_PATH)
-            origin_url = repo.remote('origin').url
-            if origin_url.startswith('https://github.com/'):
-                parts = origin_url.replace('https://github.com/', '').replace('.git', '').split('/')
-                repo_owner, repo_name = parts[0], parts[1]
-            else:
-                raise Exception("Could not determine repository owner and name")
-
-        headers = {
-            'Authorization': f'token {GITHUB_TOKEN}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
-        response = requests.get(
-            f'https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pull_number}',
-            headers=headers
+        return github().get(
+            f'{github_repo_path(repo, repo_owner, repo_name)}/pulls/{pull_number}',
+            default_error='Failed to get pull request'
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(response.json().get('message', 'Failed to get pull request'))
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def update_pull_request(pull_number, title=None, body=None, state=None, repo_owner=None, repo_name=None):
-    """풀 리퀘스트 업데이트"""
+@tool(read_only=True)
+def get_pull_requests(numbers: list, fields: list = None, repo_owner=None, repo_name=None, repo: str = None):
+    """풀 리퀘스트 여러 건 동시 조회 (GITHUB_MAX_CONCURRENCY 개씩)"""
     try:
-        if not GITHUB_TOKEN:
-            raise Exception("GitHub token not configured")
-            
-        if not repo_owner or not repo_name:
-            repo = Repo(REPO_PATH)
-            origin_url = repo.remote('origin').url
-            if origin_url.startswith('https://github.com/'):
-                parts = origin_url.replace('https://github.com/', '').replace('.git', '').split('/')
-                repo_owner, repo_name = parts[0], parts[1]
+        base = f'{github_repo_path(repo, repo_owner, repo_name)}/pulls'
+        pulls, errors = [], {}
+        results = github().get_many([f'{base}/{number}' for number in numbers],
+                                    default_error='Failed to get pull request')
+        for number, (_, pull, error) in zip(numbers, results):
+            if error is not None:
+                errors[str(number)] = str(error)
             else:
-                raise Exception("Could not determine repository owner and name")
+                pulls.append(project_pull_request(pull, fields))
+        return {"pull_requests": pulls, "errors": errors}
+    except Exception as e:
+        raise Exception(str(e))
 
-        headers = {
-            'Authorization': f'token {GITHUB_TOKEN}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
+@tool()
+def update_pull_request(pull_number, title=None, body=None, state=None, repo_owner=None, repo_name=None, repo: str = None):
+    """풀 리퀘스트 업데이트"""
+    try:
         data = {}
         if title is not None:
             data['title'] = title
@@ -401,41 +953,17 @@ def update_pull_request(pull_number, title=None, body=None, state=None, repo_own
             data['body'] = body
         if state is not None:
             data['state'] = state
-            
-        response = requests.patch(
-            f'https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pull_number}',
-            headers=headers,
-            json=data
+        return github().patch(
+            f'{github_repo_path(repo, repo_owner, repo_name)}/pulls/{pull_number}', json=data,
+            default_error='Failed to update pull request'
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(response.json().get('message', 'Failed to update pull request'))
     except Exception as e:
         raise Exception(str(e))
 
-@mcp.tool()
-def merge_pull_request(pull_number, merge_method='merge', commit_title=None, commit_message=None, repo_owner=None, repo_name=None):
+@tool()
+def merge_pull_request(pull_number, merge_method='merge', commit_title=None, commit_message=None, repo_owner=None, repo_name=None, repo: str = None):
     """풀 리퀘스트 병합"""
     try:
-        if not GITHUB_TOKEN:
-            raise Exception("GitHub token not configured")
-            
-        if not repo_owner or not repo_name:
-            repo = Repo(REPO_PATH)
-            origin_url = repo.remote('origin').url
-            if origin_url.startswith('https://github.com/'):
-                parts = origin_url.replace('https://github.com/', '').replace('.git', '').split('/')
-                repo_owner, repo_name = parts[0], parts[1]
-            else:
-                raise Exception("Could not determine repository owner and name")
-
-        headers = {
-            'Authorization': f'token {GITHUB_TOKEN}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
         data = {
             'merge_method': merge_method
         }
@@ -443,151 +971,101 @@ def merge_pull_request(pull_number, merge_method='merge', commit_title=None, com
             data['commit_title'] = commit_title
         if commit_message:
             data['commit_message'] = commit_message
-            
-        response = requests.put(
-            f'https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pull_number}/merge',
-            headers=headers,
-            json=data
+        return github().put(
+            f'{github_repo_path(repo, repo_owner, repo_name)}/pulls/{pull_number}/merge', json=data,
+            default_error='Failed to merge pull request'
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(response.json().get('message', 'Failed to merge pull request'))
     except Exception as e:
         raise Exception(str(e))
 
-def process_command(command_data):
-    """명령어 처리"""
+@tool(locked=False)
+def lease_worktree(branch: str, create: bool = False, start_point: str = None, sparse_paths: list = None,
+                   repo: str = None):
+    """브랜치용 worktree 임대 (기본 작업 트리를 checkout 하지 않음)
+
+    create: 브랜치가 없으면 start_point(기본 HEAD)에서 생성
+    sparse_paths: 지정하면 이 디렉터리들만 checkout (cone 모드 sparse-checkout)
+    반환된 lease_id 를 get_repo_status / commit_changes / get_diff_stats 의 worktree 인자로 사용
+    """
     try:
-        if not isinstance(command_data, dict):
-            raise Exception("Invalid request format")
-            
-        jsonrpc = command_data.get('jsonrpc')
-        if jsonrpc != '2.0':
-            raise Exception("Invalid JSON-RPC version")
-            
-        method = command_data.get('method')
-        if not method:
-            raise Exception("Method is required")
-            
-        params = command_data.get('params', {})
-        request_id = command_data.get('id')
-        
-        result = None
-        
-        if method == 'get_repo_status':
-            result = get_repo_status()
-        elif method == 'commit_changes':
-            result = commit_changes(params.get('message'), params.get('files'))
-        elif method == 'push_changes':
-            result = push_changes(params.get('remote'), params.get('branch'))
-        elif method == 'pull_changes':
-            result = pull_changes(params.get('remote'), params.get('branch'))
-        elif method == 'create_branch':
-            result = create_branch(params.get('branch_name'))
-        elif method == 'switch_branch':
-            result = switch_branch(params.get('branch_name'))
-        elif method == 'merge_branch':
-            result = merge_branch(params.get('source_branch'))
-        elif method == 'get_commit_history':
-            result = get_commit_history(params.get('limit'))
-        elif method == 'get_branch_info':
-            result = get_branch_info()
-        elif method == 'get_diff_stats':
-            result = get_diff_stats()
-        elif method == 'create_tag':
-            result = create_tag(params.get('tag_name'), params.get('message'), params.get('commit_hash'))
-        elif method == 'list_tags':
-            result = list_tags()
-        elif method == 'delete_tag':
-            result = delete_tag(params.get('tag_name'), params.get('remote'))
-        elif method == 'list_remotes':
-            result = list_remotes()
-        elif method == 'add_remote':
-            result = add_remote(params.get('name'), params.get('url'))
-        elif method == 'remove_remote':
-            result = remove_remote(params.get('name'))
-        elif method == 'set_remote_url':
-            result = set_remote_url(params.get('name'), params.get('url'))
-        elif method == 'create_pull_request':
-            result = create_pull_request(
-                params.get('title'),
-                params.get('body'),
-                params.get('head'),
-                params.get('base'),
-                params.get('repo_owner'),
-                params.get('repo_name')
-            )
-        elif method == 'list_pull_requests':
-            result = list_pull_requests(
-                params.get('state'),
-                params.get('repo_owner'),
-                params.get('repo_name')
-            )
-        elif method == 'get_pull_request':
-            result = get_pull_request(
-                params.get('pull_number'),
-                params.get('repo_owner'),
-                params.get('repo_name')
-            )
-        elif method == 'update_pull_request':
-            result = update_pull_request(
-                params.get('pull_number'),
-                params.get('title'),
-                params.get('body'),
-                params.get('state'),
-                params.get('repo_owner'),
-                params.get('repo_name')
-            )
-        elif method == 'merge_pull_request':
-            result = merge_pull_request(
-                params.get('pull_number'),
-                params.get('merge_method'),
-                params.get('commit_title'),
-                params.get('commit_message'),
-                params.get('repo_owner'),
-                params.get('repo_name')
-            )
-        else:
-            raise Exception(f"Unknown method: {method}")
-            
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": result
-        }
+        return worktree_pool.get_pool(get_repo(repo)).lease(branch, create, start_point, sparse_paths)
     except Exception as e:
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id if 'request_id' in locals() else None,
-            "error": {
-                "code": -32000,
-                "message": str(e)
-            }
-        }
+        raise Exception(str(e))
+
+@tool(locked=False)
+def release_worktree(lease_id: str, remove: bool = False):
+    """worktree 임대 반납 (remove=True 면 worktree 삭제, 아니면 다음 임대 때 reset 후 재사용)"""
+    try:
+        # 이 worktree 에서 실행 중인 도구가 끝난 뒤 반납
+        with concurrency.repo_locks.locked(worktree_pool.resolve(lease_id), write=True):
+            return worktree_pool.release(lease_id, remove)
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True, locked=False)
+def list_worktrees(repo: str = None):
+    """worktree 풀 상태 (임대 현황, 재사용 / 생성 / 회수 횟수)"""
+    try:
+        return worktree_pool.get_pool(get_repo(repo)).stats()
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True, locked=False)
+def get_job(job_id: str):
+    """작업 상태 / 소요 시간 / 결과 조회"""
+    try:
+        return job_manager.get(job_id).summary()
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(read_only=True, locked=False)
+def list_jobs(status: str = None, limit: int = 50):
+    """작업 목록 (최근 순, status: queued, running, succeeded, failed, cancelled)"""
+    try:
+        return {"jobs": job_manager.list(status, limit)}
+    except Exception as e:
+        raise Exception(str(e))
+
+@tool(locked=False)
+def cancel_job(job_id: str):
+    """작업 취소 (실행 중인 git 프로세스 종료 후 lock 파일 / 중단된 merge 정리)"""
+    try:
+        return job_manager.cancel(job_id)
+    except Exception as e:
+        raise Exception(str(e))
+
+def process_command(command_data):
+    """명령어 처리 (JSON-RPC 2.0 단일 요청 또는 배치 배열)"""
+    return registry.handle(command_data)
 
 def main():
     """메인 함수"""
     try:
-        # 저장소 경로 확인
+        # 저장소 경로 확인 (GIT_REPO_ROOT / GIT_REPO_ALLOWLIST 만 지정한 경우 기본 저장소 없이 실행)
         if not REPO_PATH:
-            logger.error("GIT_REPO_PATH가 설정되지 않음")
-            sys.exit(1)
-            
+            if not repositories.configured():
+                logger.error("GIT_REPO_PATH가 설정되지 않음")
+                sys.exit(1)
+            logger.info("기본 저장소 없이 실행 (도구 호출 시 repo 인자 필요)")
+            remote_sync.start()
+            metrics.start_writer()
+            logger.info("MCP 서버 실행")
+            mcp.run()
+            return
+
         # 저장소 경로가 존재하는지 확인
         if not os.path.exists(REPO_PATH):
             logger.error(f"저장소 경로가 존재하지 않음: {REPO_PATH}")
             sys.exit(1)
             
-        # 저장소가 Git 저장소인지 확인
-        try:
-            Repo(REPO_PATH)
-            logger.info("Git 저장소 확인 완료")
-        except git.InvalidGitRepositoryError:
+        # 저장소가 Git 저장소인지 확인 (파일 시스템만 확인 - 핸들은 첫 도구 호출 때 연다)
+        if not is_repository(REPO_PATH):
             logger.error(f"유효하지 않은 Git 저장소: {REPO_PATH}")
             sys.exit(1)
-            
+        logger.info("Git 저장소 확인 완료")
+
+        remote_sync.start()
+        metrics.start_writer()
         logger.info("MCP 서버 실행")
         mcp.run()
     except Exception as e:
@@ -0,0 +1,201 @@
+"""작업 트리를 건드리지 않는 병합 미리보기 / 빠른 병합
+
+`git merge-tree --write-tree -z` 로 병합 결과 트리를 객체 DB 안에서만 계산한다.
+충돌이 있으면 결과 트리의 충돌 파일에 마커가 들어 있으므로 그 blob 에서 충돌 hunk 를 뽑는다.
+충돌이 없으면 commit-tree 로 병합 커밋을 만들고, read-tree -m -u 로 바뀐 파일만 갱신한 뒤
+update-ref 로 브랜치를 옮긴다.
+미리보기 결과는 두 커밋 SHA 로 정해지므로 공유 결과 캐시에 보관한다.
+"""
+import re
+import time
+
+import gitproc
+from cache import result_cache
+
+DEFAULT_MAX_HUNK_BYTES = 64 * 1024
+
+_STAGE_ENTRY = re.compile(r'^(\d{6}) ([0-9a-f]+) (\d)\t(.*)$', re.S)
+_STAGE_NAMES = {1: 'base', 2: 'ours', 3: 'theirs'}
+
+
+def _rev(work_tree, rev):
+    return gitproc.output(work_tree, ['rev-parse', '--verify', '--end-of-options', f'{rev}^{{commit}}']).strip()
+
+
+def _is_ancestor(work_tree, ancestor, descendant):
+    code, _ = gitproc.run(work_tree, ['merge-base', '--is-ancestor', ancestor, descendant], ok_codes=(0, 1))
+    return code == 0
+
+
+def _parse_merge_tree(raw):
+    """merge-tree -z 출력 -> (tree, {path: {stage: oid}}, messages)"""
+    fields = raw.split(b'\0')
+    tree = gitproc.decode(fields[0])
+    stages = {}
+    i = 1
+    while i < len(fields):
+        match = _STAGE_ENTRY.match(gitproc.decode(fields[i]))
+        if not match:
+            break
+        mode, oid, stage, path = match.groups()
+        stages.setdefault(path, {})[_STAGE_NAMES[int(stage)]] = {"mode": mode, "oid": oid}
+        i += 1
+    if i < len(fields) and not fields[i]:
+        i += 1
+    messages = []
+    # <경로 수> NUL <경로>... NUL <유형> NUL <메시지> NUL
+    while i < len(fields) and fields[i]:
+        try:
+            count = int(fields[i])
+        except ValueError:
+            break
+        paths = [gitproc.decode(p) for p in fields[i + 1:i + 1 + count]]
+        kind = gitproc.decode(fields[i + 1 + count]) if i + 1 + count < len(fields) else ''
+        message = gitproc.decode(fields[i + 2 + count]).strip() if i + 2 + count < len(fields) else ''
+        messages.append({"paths": paths, "type": kind, "message": message})
+        i += 3 + count
+    return tree, stages, messages
+
+
+def conflict_hunks(text):
+    """충돌 마커가 들어 있는 파일 내용 -> hunk 목록 (diff3 형식의 base 구간 포함)"""
+    hunks = []
+    current = None
+    section = None
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.startswith('<<<<<<<') and current is None:
+            current = {"line": number, "ours": [], "base": None, "theirs": []}
+            section = 'ours'
+        elif current is None:
+            continue
+        elif line.startswith('|||||||') and section == 'ours':
+            current["base"] = []
+            section = 'base'
+        elif line.startswith('=======') and section in ('ours', 'base'):
+            section = 'theirs'
+        elif line.startswith('>>>>>>>') and section == 'theirs':
+            hunks.append({
+                "line": current["line"],
+                "ours": '\n'.join(current["ours"]),
+                "base": '\n'.join(current["base"]) if current["base"] is not None else None,
+                "theirs": '\n'.join(current["theirs"]),
+            })
+            current = section = None
+        else:
+            current[section].append(line)
+    return hunks
+
+
+def preview(work_tree, source, target='HEAD', hunks=True, max_bytes=DEFAULT_MAX_HUNK_BYTES, cache=True):
+    """source 를 target 에 병합한 결과를 작업 트리 / index 변경 없이 계산
+
+    반환: {clean, up_to_date, fast_forward, tree, ours, theirs, conflicts, messages, truncated, cache_hit, seconds}
+    cache=False 면 캐시를 쓰지 않는다 (결과 트리 객체가 실제로 있어야 하는 빠른 병합용).
+    """
+    start = time.perf_counter()
+    ours, theirs = _rev(work_tree, target), _rev(work_tree, source)
+    key = [ours, theirs, hunks, max_bytes]
+    if cache:
+        cached = result_cache.get('merge_preview', key)
+        if cached is not None:
+            return dict(cached, cache_hit=True, seconds=round(time.perf_counter() - start, 4))
+    result = {
+        "clean": True,
+        "up_to_date": _is_ancestor(work_tree, theirs, ours),
+        "fast_forward": False,
+        "tree": None,
+        "ours": ours,
+        "theirs": theirs,
+        "conflicts": [],
+        "messages": [],
+        "truncated": False,
+    }
+    if result["up_to_date"]:
+        result["tree"] = gitproc.output(work_tree, ['rev-parse', f'{ours}^{{tree}}']).strip()
+        return dict(result, cache_hit=False, seconds=round(time.perf_counter() - start, 4))
+    result["fast_forward"] = _is_ancestor(work_tree, ours, theirs)
+
+    code, raw = gitproc.run(
+        work_tree, ['merge-tree', '--write-tree', '-z', '--messages', ours, theirs], ok_codes=(0, 1)
+    )
+    tree, stages, messages = _parse_merge_tree(raw)
+    result.update(clean=code == 0, tree=tree, messages=messages)
+
+    types = {}
+    for message in messages:
+        for path in message["paths"]:
+            if message["type"].startswith('CONFLICT'):
+                types.setdefault(path, []).append(message["type"])
+    budget = max_bytes
+    for path in sorted(stages):
+        conflict = {"path": path, "types": types.get(path, []), "stages": stages[path]}
+        if hunks and 'ours' in stages[path] and 'theirs' in stages[path]:
+            # 내용 충돌은 결과 트리의 파일에 마커가 들어 있다
+            code, blob = gitproc.run(work_tree, ['cat-file', 'blob', f'{tree}:{path}'], ok_codes=(0, 128))
+            if code == 0 and b'\0' not in blob[:8000]:
+                if len(blob) > budget:
+                    conflict["hunks_omitted"] = True
+                    result["truncated"] = True
+                else:
+                    budget -= len(blob)
+                    conflict["hunks"] = conflict_hunks(gitproc.decode(blob))
+        result["conflicts"].append(conflict)
+    # 호출마다 다른 값(cache_hit, seconds)은 캐시에 넣지 않는다
+    if cache:
+        result_cache.put('merge_preview', key, result)
+    return dict(result, cache_hit=False, seconds=round(time.perf_counter() - start, 4))
+
+
+def fast_merge(work_tree, source, message=None):
+    """충돌이 없으면 작업 트리 checkout 없이 병합 커밋을 만들고 현재 브랜치를 갱신
+
+    반환: preview 결과에 {merged, commit, timings} 추가. 충돌이면 merged=False 로 아무것도 바꾸지 않는다.
+    병합 커밋은 git merge 를 거치지 않으므로 merge 관련 hook 은 실행되지 않는다.
+    """
+    timings = {}
+    start = time.perf_counter()
+    # 캐시된 결과 트리는 그 사이 gc 로 지워졌을 수 있으므로 다시 계산한다
+    result = preview(work_tree, source, 'HEAD', hunks=True, cache=False)
+    timings["preview"] = round(time.perf_counter() - start, 4)
+    result["merged"] = False
+    result["commit"] = None
+    if result["up_to_date"] or not result["clean"]:
+        result["timings"] = timings
+        return result
+
+    staged = gitproc.run(work_tree, ['diff-index', '--cached', '--quiet', 'HEAD', '--'], ok_codes=(0, 1))[0]
+    if staged:
+        raise Exception("스테이징된 변경사항이 있어 빠른 병합을 할 수 없습니다")
+
+    ours, theirs = result["ours"], result["theirs"]
+    step = time.perf_counter()
+    if result["fast_forward"]:
+        commit = theirs
+    else:
+        commit = gitproc.output(
+            work_tree,
+            ['commit-tree', result["tree"], '-p', ours, '-p', theirs, '-F', '-'],
+            input=(message or f"Merge branch '{source}'").encode('utf-8')
+        ).strip()
+    timings["commit"] = round(time.perf_counter() - step, 4)
+
+    step = time.perf_counter()
+    # stat 정보가 오래된 index 항목을 갱신해야 read-tree 가 변경 여부를 바르게 판단한다
+    gitproc.run(work_tree, ['update-index', '-q', '--refresh'], ok_codes=(0, 1))
+    # 2-트리 병합: HEAD 와 결과 사이에 바뀐 파일만 index / 작업 트리에 반영
+    # (로컬 변경과 겹치면 여기서 실패하고 아무것도 바뀌지 않는다)
+    gitproc.run(work_tree, ['read-tree', '-m', '-u', ours, commit])
+    timings["checkout"] = round(time.perf_counter() - step, 4)
+
+    step = time.perf_counter()
+    reflog = f"merge {source}: {'Fast-forward' if result['fast_forward'] else 'Merge made by fast-path merge-tree'}"
+    try:
+        gitproc.run(work_tree, ['update-ref', '-m', reflog, 'HEAD', commit, ours])
+    except gitproc.GitError:
+        # 다른 프로세스가 그 사이 HEAD 를 옮긴 경우 작업 트리를 되돌린다
+        gitproc.run(work_tree, ['read-tree', '-m', '-u', commit, ours])
+        raise
+    timings["update_ref"] = round(time.perf_counter() - step, 4)
+    timings["total"] = round(time.perf_counter() - start, 4)
+    result.update(merged=True, commit=commit, timings=timings)
+    return result
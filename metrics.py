@@ -0,0 +1,291 @@
+"""서버 지표 수집
+
+- 도구별 지연 시간 히스토그램 (p50 / p95 / p99), 호출 / 오류 수, 응답 바이트
+- git 서브프로세스 명령별 실행 수와 소요 시간 (gitproc, GitPython 모두)
+- GitHub HTTP 요청 수와 소요 시간
+- 캐시 적중 / 미적중 (각 캐시의 stats() 를 조회 시점에 모음)
+
+get_server_metrics 도구가 JSON 또는 Prometheus 텍스트 형식으로 반환하며,
+GIT_MCP_METRICS_FILE 을 설정하면 주기적으로(GIT_MCP_METRICS_INTERVAL 초) 파일에 기록한다
+(node_exporter textfile collector 용). GIT_MCP_METRICS=0 이면 수집하지 않는다.
+
+log_sampled() 는 로그 수준이 꺼져 있으면 메시지를 만들지 않고, 켜져 있어도
+GIT_MCP_LOG_SAMPLE 번에 한 번만 기록한다.
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 구간(초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 백분위 계산에 쓰는 최근 표본 수
+WINDOW = 1024
+
+
+class Histogram:
+    """누적 구간 카운트(Prometheus 용) + 최근 표본(백분위 용)"""
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=WINDOW)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def pct(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else None,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+        }
+
+
+def _git_command(args):
+    """git 인자 목록에서 하위 명령 이름 (앞의 -c key=value 등 전역 옵션은 건너뜀)"""
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+            continue
+        if arg in ('-c', '-C', '--git-dir', '--work-tree'):
+            skip = True
+            continue
+        if isinstance(arg, str) and not arg.startswith('-'):
+            return arg
+    return 'unknown'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """프로세스 전역 지표 저장소"""
+
+    def __init__(self, enabled=None):
+        self.enabled = os.getenv('GIT_MCP_METRICS', '1') != '0' if enabled is None else enabled
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._tools = {}
+        self._git = {}
+        self._http = {}
+        self._caches = {}
+        self._writer = None
+
+    # ---- 기록 ----
+
+    def _tool(self, name):
+        entry = self._tools.get(name)
+        if entry is None:
+            entry = self._tools[name] = {
+                "latency": Histogram(), "errors": 0, "responses": 0, "bytes": 0, "max_bytes": 0,
+            }
+        return entry
+
+    def observe_tool(self, name, seconds, error=False):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._tool(name)
+            entry["latency"].observe(seconds)
+            if error:
+                entry["errors"] += 1
+
+    def observe_response(self, name, size):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._tool(name)
+            entry["responses"] += 1
+            entry["bytes"] += size
+            entry["max_bytes"] = max(entry["max_bytes"], size)
+
+    def observe_git(self, args, seconds, status=0):
+        if not self.enabled:
+            return
+        command = _git_command(args)
+        with self._lock:
+            entry = self._git.get(command)
+            if entry is None:
+                entry = self._git[command] = {"count": 0, "seconds": 0.0, "failures": 0}
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            if status:
+                entry["failures"] += 1
+
+    def observe_http(self, method, status, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._http.get((method, status))
+            if entry is None:
+                entry = self._http[(method, status)] = {"count": 0, "seconds": 0.0}
+            entry["count"] += 1
+            entry["seconds"] += seconds
+
+    def register_cache(self, name, stats):
+        """캐시 지표 조회 함수 등록 - stats() 는 hits / misses 를 포함한 dict 반환"""
+        self._caches[name] = stats
+
+    # ---- 조회 ----
+
+    def _cache_stats(self):
+        caches = {}
+        for name, stats in list(self._caches.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                logger.debug("캐시 지표 조회 실패 (%s): %s", name, e)
+                continue
+            if values is None:
+                continue
+            hits, misses = values.get("hits", 0), values.get("misses", 0)
+            caches[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            }
+        return caches
+
+    def snapshot(self):
+        with self._lock:
+            tools = {
+                name: dict(entry["latency"].summary(), errors=entry["errors"], responses=entry["responses"],
+                           bytes=entry["bytes"], max_bytes=entry["max_bytes"])
+                for name, entry in self._tools.items()
+            }
+            git = {name: dict(entry, seconds=round(entry["seconds"], 4)) for name, entry in self._git.items()}
+            http = [
+                {"method": method, "status": status, "count": entry["count"], "seconds": round(entry["seconds"], 4)}
+                for (method, status), entry in self._http.items()
+            ]
+        return {
+            "enabled": self.enabled,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "tools": tools,
+            "git": git,
+            "github": http,
+            "caches": self._cache_stats(),
+        }
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            tools = [(name, entry["latency"].buckets[:], entry["latency"].count, entry["latency"].sum,
+                      entry["errors"], entry["bytes"]) for name, entry in self._tools.items()]
+            git = [(name, dict(entry)) for name, entry in self._git.items()]
+            http = [(key, dict(entry)) for key, entry in self._http.items()]
+
+        metric('git_mcp_tool_duration_seconds', 'histogram', 'Tool call latency')
+        for name, buckets, count, total, _, _ in tools:
+            label = f'tool="{_escape(name)}"'
+            for bound, cumulative in zip(BUCKETS, itertools.accumulate(buckets)):
+                lines.append(f'git_mcp_tool_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'git_mcp_tool_duration_seconds_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'git_mcp_tool_duration_seconds_sum{{{label}}} {total:.6f}')
+            lines.append(f'git_mcp_tool_duration_seconds_count{{{label}}} {count}')
+        metric('git_mcp_tool_errors_total', 'counter', 'Tool calls that raised an error')
+        for name, _, _, _, errors, _ in tools:
+            lines.append(f'git_mcp_tool_errors_total{{tool="{_escape(name)}"}} {errors}')
+        metric('git_mcp_tool_response_bytes_total', 'counter', 'Serialized response bytes')
+        for name, _, _, _, _, size in tools:
+            lines.append(f'git_mcp_tool_response_bytes_total{{tool="{_escape(name)}"}} {size}')
+        metric('git_mcp_git_commands_total', 'counter', 'git subprocess invocations')
+        for name, entry in git:
+            lines.append(f'git_mcp_git_commands_total{{command="{_escape(name)}"}} {entry["count"]}')
+        metric('git_mcp_git_command_seconds_total', 'counter', 'Wall time spent in git subprocesses')
+        for name, entry in git:
+            lines.append(f'git_mcp_git_command_seconds_total{{command="{_escape(name)}"}} {entry["seconds"]:.6f}')
+        metric('git_mcp_github_requests_total', 'counter', 'GitHub API HTTP requests')
+        for (method, status), entry in http:
+            lines.append(f'git_mcp_github_requests_total{{method="{method}",status="{status}"}} {entry["count"]}')
+        metric('git_mcp_github_request_seconds_total', 'counter', 'Wall time spent in GitHub API requests')
+        for (method, status), entry in http:
+            lines.append(f'git_mcp_github_request_seconds_total{{method="{method}",status="{status}"}} '
+                         f'{entry["seconds"]:.6f}')
+        caches = self._cache_stats()
+        metric('git_mcp_cache_hits_total', 'counter', 'Cache hits')
+        for name, entry in caches.items():
+            lines.append(f'git_mcp_cache_hits_total{{cache="{_escape(name)}"}} {entry["hits"]}')
+        metric('git_mcp_cache_misses_total', 'counter', 'Cache misses')
+        for name, entry in caches.items():
+            lines.append(f'git_mcp_cache_misses_total{{cache="{_escape(name)}"}} {entry["misses"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._tools.clear()
+            self._git.clear()
+            self._http.clear()
+            self.started = time.time()
+
+    # ---- Prometheus 파일 기록 ----
+
+    def start_writer(self):
+        """GIT_MCP_METRICS_FILE 이 있으면 GIT_MCP_METRICS_INTERVAL 초마다 Prometheus 텍스트 기록"""
+        path = os.getenv('GIT_MCP_METRICS_FILE')
+        if not path or not self.enabled or self._writer is not None:
+            return
+        interval = float(os.getenv('GIT_MCP_METRICS_INTERVAL', '15'))
+
+        def write():
+            while True:
+                try:
+                    # 수집기가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓰고 rename
+                    tmp = f'{path}.{os.getpid()}.tmp'
+                    with open(tmp, 'w') as f:
+                        f.write(self.prometheus())
+                    os.replace(tmp, path)
+                except OSError as e:
+                    logger.warning(f"지표 파일 기록 실패 ({path}): {str(e)}")
+                time.sleep(interval)
+
+        self._writer = threading.Thread(target=write, name='git-mcp-metrics', daemon=True)
+        self._writer.start()
+        logger.info(f"지표 파일 기록 시작: {path} ({interval}s)")
+
+
+SAMPLE_EVERY = max(1, int(os.getenv('GIT_MCP_LOG_SAMPLE', '1')))
+_sample_counters = {}
+
+
+def log_sampled(log, level, key, msg, *args):
+    """level 이 켜져 있을 때만, key 별로 GIT_MCP_LOG_SAMPLE 번에 한 번 기록 (msg 는 %-형식, 지연 포맷)"""
+    if not log.isEnabledFor(level):
+        return
+    count = _sample_counters.get(key, 0)
+    _sample_counters[key] = count + 1
+    if count % SAMPLE_EVERY == 0:
+        log.log(level, msg, *args)
+
+# 프로세스 전역 지표
+metrics = Metrics()
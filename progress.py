@@ -0,0 +1,97 @@
+"""도구 진행 상황 보고
+
+도구 함수는 실행기 스레드에서 돌기 때문에 현재 호출의 보고 함수를 스레드 로컬에 둔다.
+report(progress, total, message) 는 보고 함수가 없으면 아무것도 하지 않는다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import gitproc
+
+_local = threading.local()
+
+
+def current():
+    return getattr(_local, 'reporter', None)
+
+
+@contextmanager
+def reporting(reporter):
+    """이 스레드에서 실행되는 동안 report() 를 reporter 로 보낸다"""
+    previous = current()
+    _local.reporter = reporter
+    try:
+        yield
+    finally:
+        _local.reporter = previous
+
+
+def report(progress, total=None, message=None):
+    reporter = current()
+    if reporter is not None:
+        reporter(progress, total, message)
+
+
+def throttled(reporter, interval=0.1):
+    """같은 단계 안에서는 interval 초에 한 번만 전달 (단계 시작/끝은 항상 전달)"""
+    state = {"last": 0.0, "message": None}
+    lock = threading.Lock()
+
+    def send(progress, total=None, message=None):
+        now = time.monotonic()
+        with lock:
+            finished = total is not None and progress >= total
+            if message == state["message"] and not finished and now - state["last"] < interval:
+                return
+            state["last"], state["message"] = now, message
+        reporter(progress, total, message)
+
+    return send
+
+
+_GitProgress = None
+
+
+def git_progress():
+    """GitPython RemoteProgress -> 보고 함수 목록 (fetch 하나를 여러 호출이 공유할 수 있음)
+
+    RemoteProgress 하위 클래스이므로 GitPython 을 import 하는 처음 호출 때 클래스를 만든다.
+    """
+    global _GitProgress
+    if _GitProgress is None:
+        RemoteProgress = gitproc.gitpython().RemoteProgress
+        # RemoteProgress 단계 코드 -> 이름
+        stages = {
+            RemoteProgress.COUNTING: 'counting',
+            RemoteProgress.COMPRESSING: 'compressing',
+            RemoteProgress.WRITING: 'writing',
+            RemoteProgress.RECEIVING: 'receiving',
+            RemoteProgress.RESOLVING: 'resolving',
+            RemoteProgress.FINDING_SOURCES: 'finding sources',
+            RemoteProgress.CHECKING_OUT: 'checking out',
+        }
+
+        class GitProgress(RemoteProgress):
+            def __init__(self):
+                super().__init__()
+                self.listeners = []
+                self._lock = threading.Lock()
+
+            def add(self, reporter):
+                if reporter is not None:
+                    with self._lock:
+                        self.listeners.append(reporter)
+
+            def update(self, op_code, cur_count, max_count=None, message=''):
+                stage = stages.get(op_code & RemoteProgress.OP_MASK, 'git')
+                with self._lock:
+                    listeners = list(self.listeners)
+                for reporter in listeners:
+                    try:
+                        reporter(float(cur_count or 0), float(max_count) if max_count else None, stage)
+                    except Exception:
+                        pass
+
+        _GitProgress = GitProgress
+    return _GitProgress()
@@ -0,0 +1,157 @@
+"""ref 조회 엔진
+
+브랜치 / 원격 브랜치 / 태그를 `git for-each-ref` 한 번으로 읽어 팁 SHA, 날짜, 작성자,
+upstream 과 ahead/behind, 주석 태그 메시지까지 파싱한다. ref 마다 git 을 다시 부르지 않는다.
+파싱 결과는 저장소별 refs / packed-refs / HEAD / config 세대 번호를 키로 캐시하므로
+ref 가 바뀌기 전까지는 git 을 실행하지 않고 필터 / 정렬 / 페이지만 계산한다.
+"""
+import fnmatch
+import os
+import re
+
+from cache import LRUCache
+import gitproc
+
+ref_cache = LRUCache(int(os.getenv('GIT_MCP_REF_CACHE_BYTES', str(64 * 1024 * 1024))))
+
+KINDS = {
+    'branch': 'refs/heads/',
+    'remote': 'refs/remotes/',
+    'tag': 'refs/tags/',
+}
+SORT_KEYS = ('name', 'date', 'version')
+FIELD_SEP = '\x1f'
+RECORD_END = '\x1e'
+# 바뀌면 캐시된 ref 목록이 오래되는 저장소 구성 요소 (repo_cache.COMPONENTS 이름)
+REF_COMPONENTS = frozenset(('head', 'refs', 'packed_refs', 'config'))
+
+# (필드 이름, for-each-ref 포맷) - 태그는 tagger, 커밋은 author 중 하나만 값이 있다
+_FORMAT = (
+    ('ref', '%(refname)'),
+    ('sha', '%(objectname)'),
+    ('type', '%(objecttype)'),
+    ('target', '%(*objectname)'),
+    ('timestamp', '%(creatordate:unix)'),
+    ('date', '%(creatordate:iso-strict)'),
+    ('author', '%(authorname)%(taggername)'),
+    ('author_email', '%(authoremail)%(taggeremail)'),
+    ('subject', '%(contents:subject)'),
+    ('message', '%(if:equals=tag)%(objecttype)%(then)%(contents)%(end)'),
+    ('upstream', '%(upstream:short)'),
+    ('track', '%(upstream:track,nobracket)'),
+    ('head', '%(HEAD)'),
+)
+_TRACK = re.compile(r'(ahead|behind) (\d+)')
+_VERSION_PART = re.compile(r'(\d+)')
+
+
+def _kind(ref):
+    for kind, prefix in KINDS.items():
+        if ref.startswith(prefix):
+            return kind, ref[len(prefix):]
+    return None, ref
+
+
+def _parse(raw):
+    refs = []
+    for record in gitproc.decode(raw).split(RECORD_END + '\n'):
+        if not record:
+            continue
+        values = dict(zip((name for name, _ in _FORMAT), record.split(FIELD_SEP)))
+        kind, name = _kind(values["ref"])
+        if kind is None or (kind == 'remote' and name.endswith('/HEAD')):
+            continue
+        entry = {
+            "name": name,
+            "kind": kind,
+            "ref": values["ref"],
+            "sha": values["sha"],
+            "commit": values["target"] or values["sha"],
+            "date": values["date"] or None,
+            "timestamp": int(values["timestamp"]) if values["timestamp"] else None,
+            "author": values["author"] or None,
+            "author_email": values["author_email"].strip('<>') or None,
+            "subject": values["subject"],
+        }
+        if kind == 'branch':
+            entry["current"] = values["head"] == '*'
+            entry["upstream"] = values["upstream"] or None
+            if entry["upstream"]:
+                track = dict((key, int(count)) for key, count in _TRACK.findall(values["track"]))
+                entry["ahead"] = track.get('ahead', 0)
+                entry["behind"] = track.get('behind', 0)
+                entry["upstream_gone"] = values["track"] == 'gone'
+        elif kind == 'tag':
+            entry["annotated"] = values["type"] == 'tag'
+            entry["message"] = values["message"].rstrip('\n') if entry["annotated"] else None
+        refs.append(entry)
+    return refs
+
+
+def load_refs(work_tree, generation=None):
+    """모든 브랜치 / 원격 브랜치 / 태그 (generation 이 있으면 캐시 사용)"""
+    key = (os.path.realpath(work_tree), generation) if generation is not None else None
+    if key is not None:
+        refs = ref_cache.get(key)
+        if refs is not None:
+            return refs
+    fmt = FIELD_SEP.join(spec for _, spec in _FORMAT) + RECORD_END
+    raw = gitproc.run(work_tree, ['for-each-ref', f'--format={fmt}', *KINDS.values()])[1]
+    refs = _parse(raw)
+    if key is not None:
+        ref_cache.put(key, refs, size=len(raw) * 2)
+    return refs
+
+
+def invalidate(path, changed):
+    """repo_manager 무효화 콜백 - ref 관련 구성 요소가 바뀐 저장소의 캐시만 버린다"""
+    if changed & REF_COMPONENTS:
+        ref_cache.discard(lambda key: key[0] == path)
+
+
+def _version_key(name):
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in _VERSION_PART.split(name) if part]
+
+
+def _sort_key(sort):
+    field = sort.lstrip('-')
+    if field not in SORT_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준: {sort} (name, date, version 중 하나, 앞에 - 를 붙이면 역순)")
+    if field == 'date':
+        return lambda entry: (entry["timestamp"] or 0, entry["name"])
+    if field == 'version':
+        return lambda entry: _version_key(entry["name"])
+    return lambda entry: entry["name"]
+
+
+def _matches(name, patterns):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def list_refs(work_tree, kinds=None, patterns=None, sort='name', offset=0, limit=100, generation=None):
+    """필터 / 정렬 / 페이지 적용한 ref 목록
+
+    kinds: 'branch', 'remote', 'tag' 중 일부 (생략 시 전부)
+    patterns: 짧은 이름에 대한 glob 패턴 목록 (예: 'release/*', 'v1.*')
+    sort: 'name', 'date', 'version' (앞에 '-' 를 붙이면 역순)
+    반환: {refs, total, offset, next_offset}
+    """
+    kinds = list(kinds) if kinds else list(KINDS)
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 ref 종류: {', '.join(unknown)}")
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    refs = [entry for entry in load_refs(work_tree, generation)
+            if entry["kind"] in kinds and (not patterns or _matches(entry["name"], patterns))]
+    refs.sort(key=_sort_key(sort), reverse=sort.startswith('-'))
+    offset = max(0, int(offset or 0))
+    page = refs[offset:offset + limit] if limit is not None else refs[offset:]
+    end = offset + len(page)
+    return {
+        "refs": page,
+        "total": len(refs),
+        "offset": offset,
+        "next_offset": end if end < len(refs) else None,
+    }
@@ -0,0 +1,139 @@
+"""원격 동기화 (fetch 합치기 / 백그라운드 fetch)
+
+같은 저장소의 같은 원격에 대한 fetch 가 동시에 들어오면 진행 중인 fetch 하나를 함께
+기다린다 (나중에 온 호출도 진행 상황을 받는다). GIT_MCP_FETCH_INTERVAL(초)을 설정하면
+열려 있는 저장소의 원격을 주기적으로 fetch 해 remote-tracking ref 를 최신으로 유지한다.
+"""
+import logging
+import os
+import threading
+import time
+
+import gitproc
+from progress import git_progress
+from repo_cache import repo_manager
+
+logger = logging.getLogger(__name__)
+
+
+class _Fetch:
+    """진행 중인 fetch 하나"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.progress = git_progress()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class RemoteSync:
+    """저장소/원격별 fetch 합치기와 주기적 fetch"""
+
+    def __init__(self, manager=None, interval=None):
+        self.manager = manager or repo_manager
+        self.interval = float(os.getenv('GIT_MCP_FETCH_INTERVAL', '0')) if interval is None else interval
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.fetches = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.last_fetch = {}
+
+    def fetch(self, path, remote='origin', reporter=None):
+        """remote 를 fetch (같은 fetch 가 진행 중이면 그 결과를 공유)
+
+        반환: {remote, updated: [{ref, old, new, flags}], seconds, coalesced}
+        """
+        key = (os.path.realpath(path), remote)
+        with self._lock:
+            op = self._inflight.get(key)
+            leader = op is None
+            if leader:
+                op = self._inflight[key] = _Fetch()
+                self.fetches += 1
+            else:
+                op.waiters += 1
+                self.coalesced += 1
+            op.progress.add(reporter)
+        if leader:
+            start = time.perf_counter()
+            try:
+                op.result = self._fetch(key[0], remote, op.progress)
+                op.result["seconds"] = round(time.perf_counter() - start, 3)
+                self.last_fetch[f'{key[0]}:{remote}'] = time.time()
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                op.error = e
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                op.done.set()
+        else:
+            op.done.wait()
+        if op.error is not None:
+            raise op.error
+        return dict(op.result, coalesced=not leader)
+
+    def _fetch(self, path, remote, progress):
+        repo = self.manager.get(path)
+        # 자격 증명 입력을 기다리며 멈추지 않도록 터미널 프롬프트를 끈다
+        with repo.git.custom_environment(GIT_TERMINAL_PROMPT='0'):
+            infos = repo.remote(remote).fetch(progress=progress)
+        updated = []
+        uptodate = gitproc.gitpython().FetchInfo.HEAD_UPTODATE
+        for info in infos:
+            if info.flags & uptodate:
+                continue
+            updated.append({
+                "ref": info.name,
+                "old": info.old_commit.hexsha if info.old_commit else None,
+                "new": info.commit.hexsha if info.commit else None,
+                "flags": info.flags,
+            })
+        return {"remote": remote, "updated": updated}
+
+    # ---- 백그라운드 fetch ----
+
+    def start(self):
+        """주기적 fetch 시작 (interval 이 0 이면 사용 안 함)"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='git-remote-sync', daemon=True)
+        self._thread.start()
+        logger.info(f"백그라운드 fetch 시작 (간격 {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for path in self.manager.paths():
+                try:
+                    remotes = [remote.name for remote in self.manager.get(path).remotes]
+                except Exception as e:
+                    logger.debug(f"원격 목록 조회 실패 ({path}): {str(e)}")
+                    continue
+                for remote in remotes:
+                    try:
+                        self.fetch(path, remote)
+                    except Exception as e:
+                        logger.warning(f"백그라운드 fetch 실패 ({path} {remote}): {str(e)}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "interval": self.interval,
+                "fetches": self.fetches,
+                "coalesced": self.coalesced,
+                "failures": self.failures,
+                "in_flight": len(self._inflight),
+                "last_fetch": dict(self.last_fetch),
+            }
+
+
+# 프로세스 전역 원격 동기화
+remote_sync = RemoteSync()
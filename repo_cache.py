@@ -0,0 +1,271 @@
+"""저장소 핸들 캐시
+
+도구 호출마다 Repo(REPO_PATH)를 새로 만들지 않고 핸들(과 핸들이 띄운
+git cat-file --batch 프로세스)을 재사용한다. HEAD / refs / packed-refs /
+index / config 의 변경을 감지해 오래된 캐시만 무효화한다.
+열린 저장소 수는 LRU 로 제한하고, 오래 쓰지 않은 저장소의 핸들은 닫는다.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import gitproc
+
+logger = logging.getLogger(__name__)
+
+# 변경 감지 대상 구성 요소
+COMPONENTS = ('head', 'refs', 'packed_refs', 'index', 'config')
+
+
+def _stat_key(path):
+    """파일 변경 판단용 (mtime_ns, size, inode) - 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _refs_key(refs_dir):
+    """refs 하위 디렉터리들의 mtime 지문
+
+    ref 갱신은 lock 파일을 rename 하므로 해당 ref 가 들어있는 디렉터리의
+    mtime 이 바뀐다. 중첩 디렉터리(refs/heads/feature/...)까지 모두 본다.
+    """
+    entries = []
+    for dirpath, dirnames, _ in os.walk(refs_dir):
+        try:
+            entries.append((dirpath, os.stat(dirpath).st_mtime_ns))
+        except OSError:
+            continue
+    entries.sort()
+    return hash(tuple(entries))
+
+
+def _file_checksum(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class RepoState:
+    """저장소 하나에 대한 공유 상태 (지문, 세대 번호, 스레드별 핸들)"""
+
+    def __init__(self, path, repo):
+        self.path = path
+        self.git_dir = repo.git_dir
+        self.common_dir = repo.common_dir
+        self.last_used = time.monotonic()
+        self.generations = dict.fromkeys(COMPONENTS, 0)
+        # GitPython 의 Repo 는 persistent cat-file 파이프를 갖고 있어 스레드 간
+        # 공유가 안전하지 않으므로 스레드마다 핸들을 하나씩 둔다.
+        # 스레드 ID -> (핸들, 핸들을 만들 때의 config 세대)
+        self.handles = {threading.get_ident(): (repo, 0)}
+        self.packed_refs_checksum = None
+        self.fingerprint = self._fingerprint()
+
+    def _fingerprint(self):
+        return {
+            'head': _stat_key(os.path.join(self.git_dir, 'HEAD')),
+            'refs': _refs_key(os.path.join(self.common_dir, 'refs')),
+            'packed_refs': _stat_key(os.path.join(self.common_dir, 'packed-refs')),
+            'index': _stat_key(os.path.join(self.git_dir, 'index')),
+            'config': _stat_key(os.path.join(self.common_dir, 'config')),
+        }
+
+    def refresh(self):
+        """지문을 다시 계산해 바뀐 구성 요소 집합을 반환"""
+        current = self._fingerprint()
+        changed = {name for name in COMPONENTS if current[name] != self.fingerprint[name]}
+        if 'packed_refs' in changed:
+            # mtime 만 바뀌고 내용은 같은 경우(예: 동일 내용 재작성)는 무시
+            checksum = _file_checksum(os.path.join(self.common_dir, 'packed-refs'))
+            if checksum is not None and checksum == self.packed_refs_checksum:
+                changed.discard('packed_refs')
+            self.packed_refs_checksum = checksum
+        for name in changed:
+            self.generations[name] += 1
+        self.fingerprint = current
+        return changed
+
+    def close(self):
+        for repo, _ in self.handles.values():
+            try:
+                repo.close()
+            except Exception as e:
+                logger.debug("핸들 종료 중 오류 무시: %s", e)
+        self.handles.clear()
+
+
+class RepoHandleManager:
+    """스레드 안전한 저장소 핸들 관리자
+
+    max_open: 동시에 열어 둘 저장소 수 (초과 시 가장 오래 쓰지 않은 저장소부터 닫음)
+    idle_seconds: 이 시간 동안 쓰지 않은 저장소는 닫음 (0 이면 사용 안 함)
+    is_busy: is_busy(path) 가 True 인 저장소는 닫지 않음 (실행 중인 도구 보호)
+    """
+
+    def __init__(self, max_open=None, idle_seconds=None, is_busy=None):
+        self.max_open = max_open or int(os.getenv('GIT_MCP_MAX_OPEN_REPOS', '16'))
+        self.idle_seconds = float(os.getenv('GIT_MCP_REPO_IDLE_SECONDS', '600')) \
+            if idle_seconds is None else idle_seconds
+        self.is_busy = is_busy
+        self._lock = threading.RLock()
+        self._states = OrderedDict()
+        self._listeners = []
+        self._reaper = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+
+    def subscribe(self, callback):
+        """무효화 콜백 등록 - callback(path, changed_components)"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, path, changed):
+        for callback in list(self._listeners):
+            try:
+                callback(path, changed)
+            except Exception as e:
+                logger.warning(f"무효화 콜백 오류: {str(e)}")
+
+    def _busy(self, key):
+        return bool(self.is_busy and self.is_busy(key))
+
+    def _evict(self, keep):
+        """용량 초과 / 유휴 저장소를 목록에서 빼서 반환 (lock 보유 상태에서 호출)"""
+        evicted = []
+        if self.idle_seconds:
+            deadline = time.monotonic() - self.idle_seconds
+            for key, state in list(self._states.items()):
+                if key != keep and state.last_used < deadline and not self._busy(key):
+                    evicted.append(self._states.pop(key))
+                    self.idle_evictions += 1
+        for key in list(self._states):
+            if len(self._states) <= self.max_open:
+                break
+            if key != keep and not self._busy(key):
+                evicted.append(self._states.pop(key))
+                self.evictions += 1
+        return evicted
+
+    def _close_states(self, states):
+        for state in states:
+            logger.info(f"저장소 핸들 닫음: {state.path}")
+            state.close()
+
+    def _start_reaper(self):
+        if self._reaper is not None or not self.idle_seconds:
+            return
+        interval = max(1.0, min(self.idle_seconds / 2, 60.0))
+
+        def reap():
+            while True:
+                time.sleep(interval)
+                with self._lock:
+                    evicted = self._evict(keep=None)
+                self._close_states(evicted)
+
+        self._reaper = threading.Thread(target=reap, name='git-repo-reaper', daemon=True)
+        self._reaper.start()
+
+    def _state(self, path):
+        key = os.path.realpath(path)
+        evicted = []
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                self.misses += 1
+                state = RepoState(key, gitproc.gitpython().Repo(key))
+                self._states[key] = state
+                evicted = self._evict(keep=key)
+                self._start_reaper()
+                changed = set()
+            else:
+                self.hits += 1
+                self._states.move_to_end(key)
+                state.last_used = time.monotonic()
+                changed = state.refresh()
+                if 'config' in changed:
+                    # core.bare, worktree 등 Repo 가 생성 시점에 읽는 값이 바뀌었을 수 있으므로
+                    # 이 저장소의 핸들을 다시 연다. 다른 스레드가 쓰는 중일 수 있어 여기서 닫지 않고,
+                    # 각 스레드가 다음에 핸들을 가져갈 때 자기 핸들을 닫고 새로 만든다 (get).
+                    logger.info(f"config 변경 감지, 핸들 재생성 예정: {key}")
+        self._close_states(evicted)
+        if changed:
+            self._notify(key, changed)
+        return state, changed
+
+    def get(self, path):
+        """현재 스레드용 Repo 핸들 반환 (없으면 생성)"""
+        state, _ = self._state(path)
+        ident = threading.get_ident()
+        stale = None
+        with self._lock:
+            repo, generation = state.handles.get(ident, (None, None))
+            if repo is not None and generation != state.generations['config']:
+                stale, repo = repo, None
+            if repo is None:
+                repo = gitproc.gitpython().Repo(state.path)
+                state.handles[ident] = (repo, state.generations['config'])
+        if stale is not None:
+            # config 가 바뀌기 전에 이 스레드가 만든 핸들 - 이 스레드만 쓰므로 안전하게 닫을 수 있다
+            try:
+                stale.close()
+            except Exception as e:
+                logger.debug("핸들 종료 중 오류 무시: %s", e)
+        return repo
+
+    def generation(self, path, *components):
+        """구성 요소별 세대 번호 - 파생 캐시의 키로 사용"""
+        state, _ = self._state(path)
+        names = components or COMPONENTS
+        return tuple(state.generations[name] for name in names)
+
+    def invalidate(self, path=None):
+        """핸들 강제 폐기 (path 가 없으면 전체)"""
+        with self._lock:
+            if path is None:
+                states = list(self._states.values())
+                self._states.clear()
+            else:
+                state = self._states.pop(os.path.realpath(path), None)
+                states = [state] if state else []
+        for state in states:
+            state.close()
+
+    def close(self):
+        self.invalidate()
+
+    def paths(self):
+        """현재 열려 있는 저장소 경로 목록"""
+        with self._lock:
+            return list(self._states)
+
+    def stats(self):
+        """핸들 캐시 지표 (적중률, 제거 횟수 등)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "open_repositories": len(self._states),
+                "open_handles": sum(len(state.handles) for state in self._states.values()),
+                "max_open": self.max_open,
+                "idle_seconds": self.idle_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "idle_evictions": self.idle_evictions,
+                "repositories": list(self._states),
+            }
+
+
+# 프로세스 전역 핸들 관리자
+repo_manager = RepoHandleManager()
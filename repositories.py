@@ -0,0 +1,101 @@
+"""저장소 선택 / 접근 허용 목록
+
+도구의 `repo` 인자를 실제 저장소 경로로 변환한다. 허용 범위는
+GIT_REPO_PATH(기본 저장소), GIT_REPO_ROOT(이 디렉터리 아래의 저장소),
+GIT_REPO_ALLOWLIST(경로 목록, os.pathsep 구분)로 정한다.
+"""
+import os
+
+
+def _real(path):
+    return os.path.realpath(os.path.expanduser(path))
+
+
+def is_repository(path):
+    """git 저장소인지 파일 시스템만으로 확인 (GitPython / git 프로세스 없이)
+
+    작업 트리(.git 디렉터리, worktree / submodule 의 .git 파일)와 bare 저장소를 인식한다.
+    """
+    dot_git = os.path.join(path, '.git')
+    if os.path.isdir(dot_git):
+        path = dot_git
+    elif os.path.isfile(dot_git):
+        try:
+            with open(dot_git) as f:
+                return f.read(8) == 'gitdir: '
+        except OSError:
+            return False
+    return all(os.path.exists(os.path.join(path, name)) for name in ('HEAD', 'objects', 'refs'))
+
+
+class RepositoryResolver:
+    """repo 인자 -> 허용된 저장소 경로"""
+
+    def __init__(self, default=None, root=None, allowlist=()):
+        self.default = _real(default) if default else None
+        self.root = _real(root) if root else None
+        self.allowlist = [_real(path) for path in allowlist if path]
+        # 이름(디렉터리 basename)으로도 지정할 수 있게 한다
+        self._names = {}
+        for path in ([self.default] if self.default else []) + self.allowlist:
+            self._names.setdefault(os.path.basename(path), path)
+
+    @classmethod
+    def from_env(cls, default=None):
+        allowlist = os.getenv('GIT_REPO_ALLOWLIST', '')
+        return cls(
+            default=default,
+            root=os.getenv('GIT_REPO_ROOT'),
+            allowlist=[p.strip() for p in allowlist.split(os.pathsep) if p.strip()],
+        )
+
+    def configured(self):
+        return bool(self.default or self.root or self.allowlist)
+
+    def _allowed(self, path):
+        if path == self.default or path in self.allowlist:
+            return True
+        return bool(self.root) and path.startswith(self.root + os.sep)
+
+    def resolve(self, repo=None):
+        """repo(None, 이름, 루트 기준 상대 경로, 절대 경로)를 저장소 경로로 변환"""
+        if not repo:
+            if not self.default:
+                raise Exception("저장소가 지정되지 않았습니다 (repo 인자 또는 GIT_REPO_PATH 필요)")
+            return self.default
+        if os.path.isabs(repo) or repo.startswith('~'):
+            candidate = _real(repo)
+        elif repo in self._names:
+            return self._names[repo]
+        elif self.root:
+            candidate = _real(os.path.join(self.root, repo))
+        else:
+            raise Exception(f"알 수 없는 저장소: {repo}")
+        if not self._allowed(candidate):
+            raise Exception(f"허용되지 않은 저장소: {repo}")
+        return candidate
+
+    def list(self, depth=2):
+        """접근 가능한 저장소 목록 (GIT_REPO_ROOT 는 depth 단계까지 탐색)"""
+        found = []
+        for path in ([self.default] if self.default else []) + self.allowlist:
+            if path not in found:
+                found.append(path)
+        if self.root and os.path.isdir(self.root):
+            base_depth = self.root.rstrip(os.sep).count(os.sep)
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                if '.git' in dirnames or '.git' in filenames:
+                    if dirpath not in found and dirpath != self.root:
+                        found.append(dirpath)
+                    dirnames[:] = []
+                    continue
+                if dirpath.count(os.sep) - base_depth >= depth:
+                    dirnames[:] = []
+                else:
+                    dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        return [{
+            "name": os.path.relpath(path, self.root) if self.root and path.startswith(self.root + os.sep)
+            else os.path.basename(path),
+            "path": path,
+            "default": path == self.default,
+        } for path in found]
@@ -0,0 +1,245 @@
+"""코드 검색 엔진 (git grep)
+
+리비전마다, 그리고 최상위 경로(pathspec) 묶음마다 `git grep` 프로세스를 하나씩 나눠
+동시에 실행하고 출력을 스트리밍으로 파싱한다. 결과가 max_results 개에 도달하면 남은
+git grep 프로세스를 바로 종료하고 대기 중인 작업은 시작하지 않는다.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gitproc
+import progress
+
+DEFAULT_MAX_RESULTS = 100
+MAX_LINE_LENGTH = 400
+# 경로 묶음을 만들 때 디렉터리를 펼치는 최대 깊이 / 명령줄에 넘길 최대 pathspec 수
+MAX_SHARD_DEPTH = 3
+MAX_SHARD_PATHS = 2000
+
+
+def _workers():
+    return int(os.getenv('GIT_MCP_SEARCH_WORKERS', str(min(8, os.cpu_count() or 1))))
+
+
+def _clip(text):
+    return text if len(text) <= MAX_LINE_LENGTH else text[:MAX_LINE_LENGTH] + '…'
+
+
+def _resolve(work_tree, revisions):
+    """리비전 이름 -> 커밋 SHA (출력의 '<rev>:<path>' 를 모호하지 않게 나누기 위해)"""
+    resolved = []
+    for revision in revisions:
+        sha = gitproc.output(work_tree, ['rev-parse', '--verify', '--end-of-options', f'{revision}^{{commit}}']).strip()
+        if sha not in (s for s, _ in resolved):
+            resolved.append((sha, revision))
+    return resolved
+
+
+def _shards(work_tree, sha, count):
+    """트리를 count 개 정도의 pathspec 묶음으로 나눔 (디렉터리를 너비 우선으로 펼침)"""
+    if count <= 1:
+        return [None]
+    entries = []
+    dirs = []
+    prefixes = []
+    for depth in range(MAX_SHARD_DEPTH):
+        args = ['ls-tree', '-z', sha]
+        if prefixes:
+            args += ['--', *[f'{prefix}/' for prefix in prefixes]]
+        level = []
+        for record in gitproc.run(work_tree, args)[1].split(b'\0'):
+            if not record:
+                continue
+            meta, path = gitproc.decode(record).split('\t', 1)
+            level.append((meta.split()[1] == 'tree', path))
+        entries = [path for path in entries if path not in prefixes]
+        entries += [path for _, path in level]
+        dirs = [path for is_dir, path in level if is_dir]
+        if len(entries) >= count * 4 or not dirs:
+            break
+        prefixes = dirs
+    if len(entries) <= 1 or len(entries) > MAX_SHARD_PATHS:
+        return [None]
+    groups = [[] for _ in range(min(count, len(entries)))]
+    for i, path in enumerate(sorted(entries)):
+        groups[i % len(groups)].append(f':(literal){path}')
+    return groups
+
+
+class _Search:
+    """검색 하나의 공유 상태 (결과 목록, 상한, 조기 종료)
+
+    gitproc 추적기 역할도 해서, 상한에 도달하면 다른 작업자의 git grep 프로세스를
+    (출력이 없어 아직 상한을 모르는 프로세스까지) 바로 종료한다.
+    """
+
+    def __init__(self, max_results, context_lines, reporter, tracker=None):
+        self.max_results = max_results
+        self.context_lines = context_lines
+        self.reporter = reporter
+        self.tracker = tracker
+        self.matches = []
+        self.stop = threading.Event()
+        self.processes = 0
+        self._procs = {}
+        self._lock = threading.Lock()
+
+    # ---- gitproc 추적기 ----
+
+    def check(self):
+        if self.tracker is not None:
+            self.tracker.check()
+
+    def add(self, proc):
+        with self._lock:
+            self._procs[threading.get_ident()] = proc
+            self.processes += 1
+        if self.tracker is not None:
+            self.tracker.add(proc)
+        if self.stop.is_set():
+            proc.terminate()
+
+    def _halt(self):
+        """상한 도달 - 이 스레드(마지막 결과의 뒤쪽 문맥을 읽는 중)를 뺀 나머지 프로세스 종료"""
+        self.stop.set()
+        me = threading.get_ident()
+        for ident, proc in list(self._procs.items()):
+            if ident != me and proc.poll() is None:
+                proc.terminate()
+
+    def collect(self, match):
+        """결과 추가 - 이미 상한에 도달했으면 False"""
+        with self._lock:
+            if len(self.matches) >= self.max_results:
+                return False
+            self.matches.append(match)
+            count = len(self.matches)
+        if count >= self.max_results:
+            self._halt()
+        if self.reporter is not None:
+            self.reporter(count, self.max_results, "matches")
+        return True
+
+    def grep(self, work_tree, options, sha, label, pathspecs):
+        if self.stop.is_set():
+            return
+        args = ['grep', '-z', '-n', '--column', '-I', '--full-name', '--no-color', *options, sha, '--']
+        if pathspecs:
+            args += pathspecs
+        try:
+            with gitproc.tracking(self):
+                # 종료 코드 1 은 결과 없음
+                records = gitproc.stream(work_tree, args, sep=b'\n', ok_codes=(0, 1))
+                self._read(records, sha, label)
+        except gitproc.GitError:
+            # 조기 종료로 끊긴 프로세스는 오류가 아니다
+            if not self.stop.is_set():
+                raise
+
+    def _read(self, records, sha, label):
+        last = None
+        pending = []
+        try:
+            for record in records:
+                if record == b'--':
+                    if self.stop.is_set():
+                        break
+                    last, pending = None, []
+                    continue
+                fields = record.split(b'\0')
+                if len(fields) < 3:
+                    # 종료된 프로세스가 남긴 잘린 줄
+                    continue
+                path = gitproc.decode(fields[0])[len(sha) + 1:]
+                number = int(fields[1])
+                if len(fields) >= 4:
+                    # --column 이 붙은 줄은 일치한 줄, 아니면 문맥 줄
+                    if self.stop.is_set():
+                        break
+                    match = {
+                        "revision": label,
+                        "commit": sha,
+                        "path": path,
+                        "line": number,
+                        "column": int(fields[2]),
+                        "text": _clip(gitproc.decode(b'\0'.join(fields[3:]))),
+                    }
+                    if self.context_lines:
+                        match["before"] = [line for p, n, line in pending
+                                           if p == path and number - n <= self.context_lines]
+                        match["after"] = []
+                    pending = []
+                    if not self.collect(match):
+                        break
+                    last = match
+                    if self.stop.is_set() and not self.context_lines:
+                        break
+                    continue
+                text = _clip(gitproc.decode(b'\0'.join(fields[2:])))
+                if last is not None and last["path"] == path and number - last["line"] <= self.context_lines:
+                    last["after"].append(text)
+                    # 상한 도달 후에는 마지막 결과의 뒤쪽 문맥까지만 읽는다
+                    if self.stop.is_set() and number - last["line"] >= self.context_lines:
+                        break
+                elif self.stop.is_set():
+                    break
+                else:
+                    pending.append((path, number, text))
+        finally:
+            records.close()
+
+
+def search(work_tree, pattern, revisions=None, paths=None, fixed_strings=False, ignore_case=False,
+           word=False, context_lines=0, max_results=DEFAULT_MAX_RESULTS, max_per_file=None):
+    """revisions 의 파일 내용을 pattern(확장 정규식)으로 검색
+
+    반환: {matches, truncated, revisions, processes, seconds}
+    """
+    start = time.perf_counter()
+    if not pattern:
+        raise ValueError("검색할 패턴이 필요합니다")
+    max_results = max(1, int(max_results))
+    context_lines = max(0, int(context_lines or 0))
+    options = ['-F' if fixed_strings else '-E']
+    if ignore_case:
+        options.append('-i')
+    if word:
+        options.append('-w')
+    if context_lines:
+        options.append(f'-C{context_lines}')
+    if max_per_file:
+        options.append(f'--max-count={int(max_per_file)}')
+    options += ['-e', pattern]
+
+    resolved = _resolve(work_tree, revisions or ['HEAD'])
+    workers = max(1, _workers())
+    per_revision = max(1, -(-workers // len(resolved)))
+    tasks = []
+    for sha, label in resolved:
+        if paths:
+            shards = [list(paths)]
+        else:
+            shards = _shards(work_tree, sha, per_revision)
+        tasks += [(sha, label, shard) for shard in shards]
+
+    # 백그라운드 작업이면 작업자 스레드의 git grep 도 작업에 등록되어 취소할 수 있다
+    state = _Search(max_results, context_lines, progress.current(), gitproc.current())
+    if len(tasks) == 1:
+        state.grep(work_tree, options, *tasks[0])
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks)), thread_name_prefix='git-grep') as pool:
+            futures = [pool.submit(state.grep, work_tree, options, *task) for task in tasks]
+            for future in futures:
+                future.result()
+
+    order = {sha: i for i, (sha, _) in enumerate(resolved)}
+    matches = sorted(state.matches, key=lambda m: (order[m["commit"]], m["path"], m["line"], m["column"]))
+    return {
+        "matches": matches,
+        "truncated": state.stop.is_set(),
+        "revisions": [{"revision": label, "commit": sha} for sha, label in resolved],
+        "processes": state.processes,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
@@ -0,0 +1,124 @@
+"""일괄 스테이징 / 커밋
+
+파일마다 index 를 다시 쓰는 대신 `git add -A --pathspec-from-file` 한 번으로
+추가와 삭제를 모두 스테이징하고 index 를 한 번만 기록한다.
+커밋이 실패하거나 작업이 취소되면 index 를 스테이징 전 상태로 되돌린다.
+"""
+import os
+import shutil
+import time
+
+import gitproc
+import status_engine
+
+
+def _pathspec_input(pathspecs):
+    return b'\0'.join(p.encode('utf-8') for p in pathspecs) + b'\0'
+
+
+def stage(work_tree, pathspecs=None):
+    """pathspec(글롭 포함)에 해당하는 추가/수정/삭제를 한 번에 스테이징 (없으면 전체)"""
+    if not pathspecs:
+        gitproc.run(work_tree, ['add', '-A'])
+        return
+    gitproc.run(
+        work_tree,
+        ['add', '-A', '--pathspec-from-file=-', '--pathspec-file-nul'],
+        input=_pathspec_input(pathspecs)
+    )
+
+
+class IndexSnapshot:
+    """스테이징 전 index 파일 보관
+
+    git 은 index 를 index.lock 에 쓴 뒤 rename 하므로 기존 파일은 수정되지 않는다.
+    그래서 복사 대신 하드 링크 하나로 스냅숏을 만든다 (하드 링크를 못 쓰면 복사).
+    """
+
+    def __init__(self, work_tree):
+        self.work_tree = work_tree
+        self.index = os.path.join(work_tree, gitproc.output(work_tree, ['rev-parse', '--git-path', 'index']).strip())
+        self.head = _head(work_tree)
+        self.backup = None
+        if os.path.exists(self.index):
+            self.backup = f'{self.index}.git-mcp-{os.getpid()}-{id(self)}'
+            try:
+                os.link(self.index, self.backup)
+            except OSError:
+                shutil.copy2(self.index, self.backup)
+
+    def restore(self):
+        """커밋이 만들어지지 않았으면 index 를 스냅숏으로 되돌린다"""
+        # 취소된 작업 안에서도 실행되도록 작업 추적(취소 확인) 밖에서 HEAD 를 확인한다
+        with gitproc.tracking(None):
+            head = _head(self.work_tree)
+        if head != self.head:
+            return False
+        if self.backup is not None:
+            os.replace(self.backup, self.index)
+            self.backup = None
+        elif os.path.exists(self.index):
+            os.remove(self.index)
+        return True
+
+    def discard(self):
+        if self.backup is not None:
+            os.remove(self.backup)
+            self.backup = None
+
+
+def _head(work_tree):
+    return gitproc.output(work_tree, ['rev-parse', '-q', '--verify', 'HEAD'], ok_codes=(0, 1)).strip() or None
+
+
+def preview(work_tree, pathspecs=None):
+    """스테이징될 변경 목록 (index 를 건드리지 않음)"""
+    args = ['status', '--porcelain=v2', '-z', '--untracked-files=all']
+    if pathspecs:
+        args += ['--', *pathspecs]
+    result = {"add": [], "remove": [], "already_staged": []}
+    for kind, entry in status_engine.iter_entries(gitproc.stream(work_tree, args)):
+        if kind == '#':
+            continue
+        if kind == '?':
+            result["add"].append(entry["path"])
+        elif kind == 'u':
+            result["add"].append(entry["path"])
+        elif entry["xy"][1] == 'D':
+            result["remove"].append(entry["path"])
+        elif entry["xy"][1] != '.':
+            result["add"].append(entry["path"])
+        else:
+            result["already_staged"].append(entry["path"])
+    return result
+
+
+def commit(work_tree, message, pathspecs=None, dry_run=False):
+    """스테이징 후 커밋하고 커밋 SHA 와 단계별 소요 시간을 반환"""
+    timings = {}
+    start = time.perf_counter()
+    if dry_run:
+        result = preview(work_tree, pathspecs)
+        timings["preview"] = round(time.perf_counter() - start, 4)
+        result.update({"dry_run": True, "timings": timings})
+        return result
+
+    snapshot = IndexSnapshot(work_tree)
+    try:
+        stage(work_tree, pathspecs)
+        staged = time.perf_counter()
+        timings["stage"] = round(staged - start, 4)
+
+        # GitPython 의 index.commit 과 같이 훅을 실행하고 빈 커밋도 허용
+        gitproc.run(work_tree, ['commit', '-q', '--allow-empty', '-F', '-'], input=message.encode('utf-8'))
+    except BaseException:
+        # 훅 실패 / 작업 취소로 커밋이 안 됐으면 이번에 스테이징한 경로를 되돌린다
+        snapshot.restore()
+        raise
+    finally:
+        snapshot.discard()
+    sha = gitproc.output(work_tree, ['rev-parse', 'HEAD']).strip()
+    done = time.perf_counter()
+    timings["commit"] = round(done - staged, 4)
+    timings["total"] = round(done - start, 4)
+    return {"commit": sha, "timings": timings}
@@ -0,0 +1,130 @@
+"""단일 패스 저장소 상태 엔진
+
+`git status --porcelain=v2 -z --branch` 를 한 번만 실행하고 출력을
+스트리밍 파싱해 get_repo_status 결과를 만든다.
+"""
+import gitproc
+
+UNTRACKED_MODES = ('all', 'normal', 'no')
+
+
+def new_result():
+    return {
+        "current_branch": None,
+        "detached": False,
+        "head": None,
+        "upstream": None,
+        "ahead": 0,
+        "behind": 0,
+        "is_dirty": False,
+        "untracked_files": [],
+        "modified_files": [],
+        "staged_files": [],
+        "renamed_files": [],
+        "conflicted_files": [],
+        "truncated": False,
+    }
+
+
+def apply_header(result, key, value):
+    """'# branch.*' 헤더 값을 결과에 반영"""
+    if key == 'branch.oid':
+        result["head"] = None if value == '(initial)' else value
+    elif key == 'branch.head':
+        if value == '(detached)':
+            result["detached"] = True
+        else:
+            result["current_branch"] = value
+    elif key == 'branch.upstream':
+        result["upstream"] = value
+    elif key == 'branch.ab':
+        ahead, behind = value.split(' ')
+        result["ahead"] = int(ahead)
+        result["behind"] = -int(behind)
+
+
+def apply_entry(result, entry):
+    """상태 항목 하나를 결과에 반영"""
+    kind, path = entry["kind"], entry["path"]
+    if kind == '?':
+        result["untracked_files"].append(path)
+        return
+    result["is_dirty"] = True
+    if kind == 'u':
+        result["conflicted_files"].append({"path": path, "state": entry["xy"]})
+        return
+    index_state, worktree_state = entry["xy"][0], entry["xy"][1]
+    if index_state != '.':
+        result["staged_files"].append(path)
+    if worktree_state != '.':
+        result["modified_files"].append(path)
+    if kind == '2':
+        result["renamed_files"].append({
+            "from": entry["orig"],
+            "to": path,
+            "kind": 'copy' if entry["score"][0] == 'C' else 'rename',
+            "score": int(entry["score"][1:]),
+        })
+
+
+def iter_entries(records):
+    """porcelain v2 -z 레코드를 ('#', (key, value)) 또는 (kind, entry) 로 변환"""
+    records = iter(records)
+    for raw in records:
+        if not raw:
+            continue
+        line = gitproc.decode(raw)
+        kind = line[0]
+        if kind == '#':
+            key, _, value = line[2:].partition(' ')
+            yield '#', (key, value)
+        elif kind == '1':
+            # 1 XY sub mH mI mW hH hI path
+            fields = line.split(' ', 8)
+            yield kind, {"kind": kind, "xy": fields[1], "path": fields[8]}
+        elif kind == '2':
+            # 2 XY sub mH mI mW hH hI Xscore path \0 origPath
+            fields = line.split(' ', 9)
+            orig = gitproc.decode(next(records, b''))
+            yield kind, {"kind": kind, "xy": fields[1], "path": fields[9], "orig": orig, "score": fields[8]}
+        elif kind == 'u':
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            fields = line.split(' ', 10)
+            yield kind, {"kind": kind, "xy": fields[1], "path": fields[10]}
+        elif kind == '?':
+            yield kind, {"kind": kind, "path": line[2:]}
+
+
+def parse(records, max_entries=None):
+    """porcelain v2 -z 레코드 이터레이터를 파싱해 결과 dict 반환"""
+    result = new_result()
+    entries = 0
+    for kind, data in iter_entries(records):
+        if kind == '#':
+            apply_header(result, *data)
+            continue
+        if max_entries is not None and entries >= max_entries:
+            result["truncated"] = True
+            break
+        entries += 1
+        apply_entry(result, data)
+    return result
+
+
+def repo_status(work_tree, untracked='all', paths=None, max_entries=None):
+    """저장소 상태 조회 (git status 1회 실행)
+
+    untracked: 'all' | 'normal' | 'no'
+    paths: 조회 대상을 제한하는 pathspec 목록
+    max_entries: 반환할 최대 항목 수 (초과 시 truncated=True 로 조기 종료)
+    """
+    if untracked not in UNTRACKED_MODES:
+        raise ValueError(f"untracked 는 {', '.join(UNTRACKED_MODES)} 중 하나여야 합니다")
+    args = ['status', '--porcelain=v2', '-z', '--branch', f'--untracked-files={untracked}']
+    if paths:
+        args += ['--', *paths]
+    records = gitproc.stream(work_tree, args)
+    try:
+        return parse(records, max_entries=max_entries)
+    finally:
+        records.close()
@@ -0,0 +1,422 @@
+"""inotify 기반 증분 상태 캐시 (Linux 전용, 선택 기능)
+
+작업 트리와 .git 을 inotify 로 감시하면서 경로별 상태 맵을 메모리에 유지한다.
+작업 트리 이벤트는 해당 경로만 `git status` 로 다시 확인하고, index / HEAD /
+refs 변경이나 이벤트 큐 넘침(IN_Q_OVERFLOW)은 전체 재스캔으로 처리한다.
+조회(snapshot) 직전에는 쌓인 이벤트를 바로 반영하고 index / HEAD 가 마지막 전체 스캔 뒤
+바뀌었으면 재스캔하므로, 호출자가 방금 쓴 변경이 debounce 때문에 빠지지 않는다.
+"""
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+
+import gitproc
+import status_engine
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+TREE_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+             | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+META_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+_EVENT = struct.Struct('iIII')
+# 이벤트 배치 후 이 시간 동안 추가 이벤트를 모아 한 번에 반영
+DEBOUNCE_SECONDS = 0.05
+# 변경 경로가 이보다 많으면 부분 조회 대신 전체 재스캔
+MAX_PARTIAL_PATHS = 500
+
+
+def enabled():
+    """GIT_STATUS_WATCH 설정 여부"""
+    return os.getenv('GIT_STATUS_WATCH', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def supported():
+    return sys.platform.startswith('linux') and ctypes.util.find_library('c') is not None
+
+
+class WatcherError(Exception):
+    """inotify 감시 설정 실패"""
+
+
+class StatusWatcher:
+    """저장소 하나의 작업 트리를 감시하며 상태 맵을 유지"""
+
+    def __init__(self, work_tree, git_dir, common_dir):
+        self.work_tree = os.path.realpath(work_tree)
+        self.git_dir = os.path.realpath(git_dir)
+        self.common_dir = os.path.realpath(common_dir)
+        self.version = 0
+        self.healthy = False
+        self._lock = threading.Lock()
+        # 이벤트 읽기부터 상태 맵 반영까지를 감시 스레드와 조회 스레드 사이에서 직렬화
+        self._update_lock = threading.Lock()
+        self._stale = False
+        self._stamp = None
+        self._header = status_engine.new_result()
+        self._entries = {}
+        self._tree_wds = {}
+        self._meta_wds = set()
+        self._stop = threading.Event()
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = None
+        self._thread = None
+
+    # ---- 감시 설정 ----
+
+    def _add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise WatcherError("inotify watch 한도 초과 (fs.inotify.max_user_watches)")
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return None
+            raise WatcherError(os.strerror(err))
+        return wd
+
+    def _ignored_dirs(self):
+        _, out = gitproc.run(self.work_tree, [
+            'ls-files', '-z', '--others', '--ignored', '--exclude-standard', '--directory'
+        ])
+        return {
+            gitproc.decode(raw).rstrip('/')
+            for raw in out.split(b'\0') if raw.endswith(b'/')
+        }
+
+    def _watch_tree(self, rel_root, ignored=()):
+        top = os.path.join(self.work_tree, rel_root) if rel_root else self.work_tree
+        for dirpath, dirnames, _ in os.walk(top):
+            rel = os.path.relpath(dirpath, self.work_tree)
+            rel = '' if rel == '.' else rel
+            dirnames[:] = [
+                d for d in dirnames
+                if d != '.git' and os.path.join(rel, d) not in ignored
+            ]
+            wd = self._add_watch(dirpath, TREE_MASK)
+            if wd is not None:
+                self._tree_wds[wd] = rel
+
+    def _watch_meta(self):
+        dirs = [self.git_dir, self.common_dir]
+        for dirpath, _, _ in os.walk(os.path.join(self.common_dir, 'refs')):
+            dirs.append(dirpath)
+        for path in dict.fromkeys(dirs):
+            wd = self._add_watch(path, META_MASK)
+            if wd is not None:
+                self._meta_wds.add(wd)
+
+    def start(self):
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise WatcherError(os.strerror(ctypes.get_errno()))
+        self._fd = fd
+        try:
+            self._watch_meta()
+            self._watch_tree('', self._ignored_dirs())
+            self._full_scan()
+        except Exception:
+            os.close(fd)
+            self._fd = None
+            raise
+        self.healthy = True
+        self._thread = threading.Thread(target=self._run, name='git-status-watcher', daemon=True)
+        self._thread.start()
+        logger.info(f"상태 감시 시작: {self.work_tree} (watch {len(self._tree_wds)}개)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.healthy = False
+        with self._update_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    # ---- 상태 맵 갱신 ----
+
+    def _scan(self, paths=None):
+        args = ['--literal-pathspecs', 'status', '--porcelain=v2', '-z', '--branch',
+                '--untracked-files=all']
+        if paths:
+            args += ['--', *paths]
+        header = status_engine.new_result()
+        entries = {}
+        for kind, data in status_engine.iter_entries(gitproc.stream(self.work_tree, args)):
+            if kind == '#':
+                status_engine.apply_header(header, *data)
+            else:
+                entries[data["path"]] = data
+        return header, entries
+
+    def _meta_stamp(self):
+        """index / HEAD / 현재 브랜치 ref 상태 - 바뀌었으면 전체 재스캔이 필요하다"""
+        def stat(path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            return st.st_mtime_ns, st.st_size, st.st_ino
+
+        try:
+            with open(os.path.join(self.git_dir, 'HEAD'), 'rb') as f:
+                head = f.read()
+        except OSError:
+            head = None
+        ref = None
+        if head and head.startswith(b'ref: '):
+            ref = stat(os.path.join(self.common_dir, os.fsdecode(head[5:].strip())))
+        return (stat(os.path.join(self.git_dir, 'index')), head, ref,
+                stat(os.path.join(self.common_dir, 'packed-refs')))
+
+    def _full_scan(self):
+        # 스캔 전에 기록해야 스캔 중에 바뀐 index 를 다음 조회에서 놓치지 않는다
+        stamp = self._meta_stamp()
+        header, entries = self._scan()
+        self._commit(header, entries, replace=None)
+        self._stamp = stamp
+        self._stale = False
+
+    def _partial_scan(self, paths):
+        with self._lock:
+            # 이름 변경 항목은 원래 경로도 함께 조회해야 rename 으로 다시 잡힌다
+            extra = [
+                entry["orig"] for entry in self._entries.values()
+                if entry["kind"] == '2' and entry["path"] in paths
+            ]
+        targets = sorted(set(paths) | set(extra))
+        header, entries = self._scan(targets)
+        self._commit(header, entries, replace=targets)
+
+    def _commit(self, header, entries, replace):
+        with self._lock:
+            if replace is None:
+                new_entries = entries
+            else:
+                prefixes = tuple(p + '/' for p in replace)
+                targets = set(replace)
+                new_entries = {
+                    path: entry for path, entry in self._entries.items()
+                    if path not in targets and not path.startswith(prefixes)
+                    and entry.get("orig") not in targets
+                }
+                new_entries.update(entries)
+            changed = new_entries != self._entries or header != self._header
+            self._entries = new_entries
+            self._header = header
+            if changed:
+                self.version += 1
+            version = self.version
+        if changed:
+            _notify(self.work_tree, version)
+
+    # ---- 이벤트 루프 ----
+
+    def _read_events(self, timeout):
+        """이벤트를 읽어 (전체 재스캔 필요 여부, 변경 경로 집합) 반환 (읽은 이벤트가 없으면 None)"""
+        full, paths = False, set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return None
+        try:
+            data = os.read(self._fd, 256 * 1024)
+        except BlockingIOError:
+            return None
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                full = True
+                continue
+            if mask & IN_IGNORED:
+                self._tree_wds.pop(wd, None)
+                self._meta_wds.discard(wd)
+                continue
+            if wd in self._meta_wds:
+                if not name.endswith('.lock'):
+                    full = True
+                continue
+            rel_dir = self._tree_wds.get(wd)
+            if rel_dir is None or not name:
+                continue
+            rel = os.path.join(rel_dir, name) if rel_dir else name
+            if name == '.gitignore':
+                full = True
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_tree(rel)
+            paths.add(rel)
+        return full, paths
+
+    def _collect(self, timeout):
+        """이벤트가 더 오지 않을 때까지 읽어 누적 -> (전체 재스캔 필요 여부, 변경 경로 집합)"""
+        full, paths = False, set()
+        while True:
+            events = self._read_events(timeout)
+            if events is None:
+                return full, paths
+            full = full or events[0]
+            paths |= events[1]
+
+    def _apply(self, full, paths):
+        if full or len(paths) > MAX_PARTIAL_PATHS:
+            self._full_scan()
+        elif paths:
+            self._partial_scan(paths)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # 읽기는 잠금 안에서 해야 조회 스레드의 sync 가 읽기만 하고 반영 전인 이벤트를 놓치지 않는다
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                with self._update_lock:
+                    # 짧은 시간 동안 이어지는 이벤트를 모아서 한 번에 반영
+                    self._apply(*self._collect(DEBOUNCE_SECONDS))
+            except WatcherError as e:
+                logger.error(f"상태 감시 중단: {str(e)}")
+                self.healthy = False
+                return
+            except Exception as e:
+                # 일시적인 git 오류 등은 다음 이벤트에서 전체 재스캔으로 복구
+                logger.warning(f"상태 감시 갱신 실패, 재스캔 예정: {str(e)}")
+                self._stale = True
+                try:
+                    with self._update_lock:
+                        self._full_scan()
+                except Exception:
+                    pass
+
+    def sync(self):
+        """쌓인 이벤트를 debounce 없이 바로 반영하고, index / HEAD 가 바뀌었거나 무효화됐으면 재스캔"""
+        with self._update_lock:
+            full, paths = self._collect(0)
+            if self._stale or self._meta_stamp() != self._stamp:
+                full = True
+            self._apply(full, paths)
+
+    def invalidate(self):
+        """다음 조회에서 전체 재스캔 (저장소를 바꾼 도구가 호출)"""
+        self._stale = True
+
+    # ---- 조회 ----
+
+    def snapshot(self, untracked='all', max_entries=None):
+        """메모리 상태 맵으로 get_repo_status 결과 생성
+
+        untracked='normal' 은 디렉터리 단위 축약이 필요해 지원하지 않으며 None 을 반환한다.
+        """
+        if not self.healthy or untracked not in ('all', 'no'):
+            return None
+        try:
+            self.sync()
+        except WatcherError as e:
+            logger.error(f"상태 감시 중단: {str(e)}")
+            self.healthy = False
+            return None
+        except Exception as e:
+            logger.warning(f"상태 감시 갱신 실패, 일반 조회로 대체: {str(e)}")
+            self._stale = True
+            return None
+        with self._lock:
+            header = self._header
+            entries = sorted(self._entries.values(), key=lambda e: (e["kind"] == '?', e["path"]))
+        result = status_engine.new_result()
+        for key in ('current_branch', 'detached', 'head', 'upstream', 'ahead', 'behind'):
+            result[key] = header[key]
+        count = 0
+        for entry in entries:
+            if entry["kind"] == '?' and untracked == 'no':
+                continue
+            if max_entries is not None and count >= max_entries:
+                result["truncated"] = True
+                break
+            count += 1
+            status_engine.apply_entry(result, entry)
+        return result
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+_listeners = []
+
+
+def subscribe(callback):
+    """감시 중인 저장소 상태가 바뀔 때마다 callback(work_tree, version) 호출"""
+    _listeners.append(callback)
+
+
+def _notify(work_tree, version):
+    for callback in list(_listeners):
+        try:
+            callback(work_tree, version)
+        except Exception as e:
+            logger.warning(f"상태 변경 콜백 오류: {str(e)}")
+
+
+def get_watcher(repo, force=False):
+    """저장소용 감시자 반환 (GIT_STATUS_WATCH 가 꺼져 있고 force 가 아니면 None)
+
+    시작에 실패하면 경고만 남기고 None 을 반환해 호출자가 일반 조회로 돌아가게 한다.
+    """
+    if not (enabled() or force) or not supported() or repo.working_tree_dir is None:
+        return None
+    key = os.path.realpath(repo.working_tree_dir)
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is not None:
+            if watcher.healthy:
+                return watcher
+            watcher.stop()
+        watcher = StatusWatcher(key, repo.git_dir, repo.common_dir)
+        try:
+            watcher.start()
+        except Exception as e:
+            logger.warning(f"상태 감시를 시작할 수 없음: {str(e)}")
+            return None
+        _watchers[key] = watcher
+        return watcher
+
+
+def invalidate(work_tree):
+    """work_tree 를 감시 중이면 다음 조회에서 전체 재스캔하게 한다"""
+    if work_tree is None:
+        return
+    with _watchers_lock:
+        watcher = _watchers.get(os.path.realpath(work_tree))
+    if watcher is not None:
+        watcher.invalidate()
+
+
+def stop_all():
+    with _watchers_lock:
+        watchers = list(_watchers.values())
+        _watchers.clear()
+    for watcher in watchers:
+        watcher.stop()
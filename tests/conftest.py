@@ -0,0 +1,71 @@
+"""테스트 공용 fixture - 임시 git 저장소"""
+import os
+import subprocess
+
+import pytest
+
+GIT_ENV = {
+    'GIT_AUTHOR_NAME': 'tester',
+    'GIT_AUTHOR_EMAIL': 'tester@example.com',
+    'GIT_COMMITTER_NAME': 'tester',
+    'GIT_COMMITTER_EMAIL': 'tester@example.com',
+}
+# 서버 코드가 띄우는 git 도 같은 신원을 쓰도록 (사용자 전역 설정과 무관하게)
+os.environ.update(GIT_ENV)
+
+
+def git(cwd, *args, input=None, env=None):
+    """git 명령 실행 후 stdout 반환"""
+    result = subprocess.run(
+        ['git', *args], cwd=cwd, input=input, env=dict(os.environ, **(env or {})),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+    )
+    return result.stdout.decode('utf-8', 'replace')
+
+
+class Repo:
+    """테스트용 저장소 조작 도우미"""
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def git(self, *args, **kwargs):
+        return git(self.path, *args, **kwargs)
+
+    def write(self, name, text):
+        target = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w') as f:
+            f.write(text)
+
+    def commit(self, message, files=None, date=None):
+        """files({경로: 내용})를 쓰고 커밋한 뒤 SHA 반환 (date 는 작성 / 커밋 시각)"""
+        for name, text in (files or {}).items():
+            self.write(name, text)
+        self.git('add', '-A')
+        env = {'GIT_AUTHOR_DATE': date, 'GIT_COMMITTER_DATE': date} if date else None
+        self.git('commit', '-q', '--allow-empty', '-m', message, env=env)
+        return self.head()
+
+    def head(self, rev='HEAD'):
+        return self.git('rev-parse', rev).strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main 브랜치에 커밋 하나가 있는 저장소"""
+    path = tmp_path / 'repo'
+    path.mkdir()
+    git(path, 'init', '-q', '-b', 'main')
+    result = Repo(path)
+    result.commit('initial', {'README.md': 'hello\n'})
+    return result
+
+
+@pytest.fixture
+def server(repo, monkeypatch):
+    """repo 를 기본 저장소로 쓰는 main 모듈"""
+    import main
+    from repositories import RepositoryResolver
+    monkeypatch.setattr(main, 'repositories', RepositoryResolver(default=repo.path))
+    return main
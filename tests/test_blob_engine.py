@@ -0,0 +1,77 @@
+import pytest
+
+import blob_engine
+from cache import result_cache
+
+TEXT = ''.join(f'line {n}\n' for n in range(1, 201)) + 'last'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    result_cache.clear()
+
+
+@pytest.fixture
+def text(repo):
+    repo.commit('text', {'text.txt': TEXT, 'binary.bin': ''})
+    with open(f'{repo.path}/binary.bin', 'wb') as f:
+        f.write(b'\0\1\2' * 100)
+    repo.commit('binary')
+    return repo
+
+
+def read(server, **params):
+    return server.registry.call('read_file_at', params)
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64, 64 * 1024])
+def test_line_range_counts_all_lines(server, text, monkeypatch, chunk_size):
+    monkeypatch.setattr(blob_engine, 'CHUNK_SIZE', chunk_size)
+    result = read(server, path='text.txt', line_range=[3, 5])
+    assert result["content"] == 'line 3\nline 4\nline 5'
+    assert (result["start_line"], result["end_line"]) == (3, 5)
+    assert result["total_lines"] == 201
+    assert result["truncated"] is False
+
+    tail = read(server, path='text.txt', line_range=[200, 300])
+    assert tail["content"] == 'line 200\nlast'
+    assert tail["end_line"] == 201
+    assert tail["total_lines"] == 201
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64 * 1024])
+def test_byte_range_stops_after_range(server, text, monkeypatch, chunk_size):
+    monkeypatch.setattr(blob_engine, 'CHUNK_SIZE', chunk_size)
+    result = read(server, path='text.txt', offset=5, length=8)
+    assert result["content"] == TEXT[5:13]
+    assert result["eof"] is False
+    assert result["binary"] is False
+    # 읽다 만 나머지가 버려졌어야 같은 cat-file 프로세스로 다음 읽기가 맞게 나온다
+    assert read(server, path='text.txt', offset=len(TEXT) - 4)["content"] == 'last'
+    assert read(server, path='text.txt', line_range=[1, 1])["content"] == 'line 1'
+
+
+def test_line_range_truncated_by_max_length(server, text, monkeypatch):
+    monkeypatch.setattr(blob_engine, 'MAX_LENGTH', 20)
+    result = read(server, path='text.txt', line_range=[1, 100])
+    assert result["content"] == 'line 1\nline 2\nline 3'
+    assert result["truncated"] is True
+    assert result["total_lines"] == 201
+
+
+def test_binary_file(server, text):
+    result = read(server, path='binary.bin', length=6)
+    assert result["binary"] is True
+    assert result["encoding"] == 'base64'
+    assert result["content"] == 'AAECAAEC'
+    with pytest.raises(Exception, match='바이너리'):
+        read(server, path='binary.bin', line_range=[1, 2])
+
+
+def test_blame_reports_cache_hit(server, text):
+    first = server.registry.call('blame', {'path': 'text.txt', 'line_range': [1, 2]})
+    assert first["cache_hit"] is False
+    assert first["ranges"][0]["commit"] == text.head('HEAD~1')
+    again = server.registry.call('blame', {'path': 'text.txt', 'line_range': [1, 2]})
+    assert again["cache_hit"] is True
+    assert again["ranges"] == first["ranges"]
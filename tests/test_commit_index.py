@@ -0,0 +1,91 @@
+import pytest
+
+import commit_index
+
+
+def test_update_commit_index_reports_its_own_work(server, repo):
+    first = server.registry.call('update_commit_index')
+    assert (first["added"], first["removed"], first["commits"]) == (1, 0, 1)
+    assert server.registry.call('update_commit_index')["added"] == 0
+
+    repo.commit('second', {'a.txt': 'a\n'})
+    repo.commit('third', {'a.txt': 'b\n'})
+    assert server.registry.call('update_commit_index')["added"] == 2
+
+    repo.git('reset', '-q', '--hard', 'HEAD~1')
+    result = server.registry.call('update_commit_index')
+    assert (result["added"], result["removed"], result["commits"]) == (0, 1, 2)
+
+    rebuilt = server.registry.call('update_commit_index', {'rebuild': True})
+    assert (rebuilt["added"], rebuilt["removed"], rebuilt["commits"]) == (2, 0, 2)
+
+
+def test_queries_do_not_recheck_tips_after_explicit_update(server, repo, monkeypatch):
+    server.registry.call('update_commit_index')
+    calls = []
+    index = commit_index.open_index(server.get_repo())
+    update = index.update
+    monkeypatch.setattr(index, 'update', lambda *a, **kw: calls.append(1) or update(*a, **kw))
+    server.registry.call('find_commits_by_path', {'path': 'README.md'})
+    assert calls == []
+
+    repo.commit('second', {'README.md': 'changed\n'})
+    commits = server.registry.call('find_commits_by_path', {'path': 'README.md'})["commits"]
+    assert calls == [1]
+    assert len(commits) == 2
+
+
+def messages(server, text, **params):
+    result = server.registry.call('search_commit_messages', dict(params, text=text))
+    return [commit["subject"] for commit in result["commits"]]
+
+
+@pytest.fixture
+def history(repo):
+    repo.commit('fix parser crash', {'src/parser.py': '1\n'}, date='2024-01-01T00:00:00+00:00')
+    repo.write('src/lexer.py', '1\n')
+    repo.git('add', '-A')
+    repo.git('commit', '-q', '-m', 'add lexer\n\nthe parser needs "tokens"',
+             env={'GIT_AUTHOR_NAME': 'Alice', 'GIT_AUTHOR_EMAIL': 'alice@example.com',
+                  'GIT_AUTHOR_DATE': '2024-02-01T00:00:00+00:00',
+                  'GIT_COMMITTER_DATE': '2024-02-01T00:00:00+00:00'})
+    repo.commit('crash fix for lexer', {'src/lexer.py': '2\n'}, date='2024-03-01T00:00:00+00:00')
+    return repo
+
+
+@pytest.mark.parametrize('fts', [True, False], ids=['fts5', 'like'])
+def test_search_messages_matches_subject_and_body(server, history, monkeypatch, fts):
+    index = commit_index.open_index(server.get_repo())
+    if not fts:
+        monkeypatch.setattr(index, '_fts', False)
+    elif not index._fts:
+        pytest.skip('SQLite 에 FTS5 가 없음')
+    assert messages(server, 'parser') == ['add lexer', 'fix parser crash']
+    assert messages(server, 'parser', oldest_first=True) == ['fix parser crash', 'add lexer']
+    assert messages(server, 'parser', limit=1) == ['add lexer']
+    # 따옴표는 구문 그대로 검색된다
+    assert messages(server, '"tokens"') == ['add lexer']
+    assert messages(server, 'parser crash') == ['fix parser crash']
+    assert messages(server, 'nothing like this') == []
+
+
+def test_incremental_update_follows_history_rewrites(server, history):
+    paths = lambda path: [c["subject"] for c in server.registry.call(
+        'find_commits_by_path', {'path': path})["commits"]]
+    assert paths('src') == ['crash fix for lexer', 'add lexer', 'fix parser crash']
+    assert paths('src/lexer.py') == ['crash fix for lexer', 'add lexer']
+    assert paths('src/lex') == []
+
+    # amend 로 사라진 커밋은 경로 / 메시지 검색에서 빠지고 새 커밋이 추가된다
+    history.write('docs/guide.md', 'guide\n')
+    history.git('add', '-A')
+    history.git('commit', '-q', '--amend', '-m', 'lexer crash fix with docs')
+    assert paths('src/lexer.py') == ['lexer crash fix with docs', 'add lexer']
+    assert paths('docs/') == ['lexer crash fix with docs']
+    assert messages(server, 'crash fix for lexer') == []
+    assert messages(server, 'docs') == ['lexer crash fix with docs']
+
+    by_author = server.registry.call('find_commits_by_author', {
+        'author': 'ALICE@example.com', 'since': '2024-01-15', 'until': '2024-02-15'})
+    assert [c["subject"] for c in by_author["commits"]] == ['add lexer']
+    assert server.registry.call('find_commits_by_author', {'author': 'alice', 'until': '2024-01-15'})["commits"] == []
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import concurrency
+from concurrency import LockTimeout, RepoLocks, RWLock
+
+
+def start(fn):
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.005)
+
+
+def test_readers_share_and_writer_excludes():
+    lock = RWLock()
+    lock.acquire_read()
+    lock.acquire_read(timeout=0.1)
+    assert lock.stats()["readers"] == 2
+    with pytest.raises(LockTimeout):
+        lock.acquire_write(timeout=0.05)
+    lock.release_read()
+    lock.release_read()
+
+    lock.acquire_write()
+    with pytest.raises(LockTimeout):
+        lock.acquire_read(timeout=0.05)
+    with pytest.raises(LockTimeout):
+        lock.acquire_write(timeout=0.05)
+    lock.release_write()
+    assert lock.stats() == {"readers": 0, "writer": False, "waiting_readers": 0, "waiting_writers": 0}
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = RWLock()
+    events = []
+    lock.acquire_read()
+
+    def writer():
+        with lock.locked(write=True):
+            events.append('write')
+
+    def reader():
+        with lock.locked():
+            events.append('read')
+
+    writer_thread = start(writer)
+    wait_until(lambda: lock.stats()["waiting_writers"] == 1)
+    reader_thread = start(reader)
+    wait_until(lambda: lock.stats()["waiting_readers"] == 1)
+    assert events == []
+
+    lock.release_read()
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert events == ['write', 'read']
+
+
+def test_writer_timeout_wakes_blocked_readers():
+    lock = RWLock()
+    lock.acquire_read()
+    results = []
+
+    def writer():
+        try:
+            lock.acquire_write(timeout=0.2)
+        except LockTimeout:
+            results.append('writer timed out')
+
+    def reader():
+        lock.acquire_read(timeout=5)
+        results.append('reader')
+        lock.release_read()
+
+    writer_thread = start(writer)
+    wait_until(lambda: lock.stats()["waiting_writers"] == 1)
+    reader_thread = start(reader)
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert results == ['writer timed out', 'reader']
+    lock.release_read()
+
+
+def test_repo_locks_key_by_real_path_and_report_busy(tmp_path):
+    locks = RepoLocks()
+    target = tmp_path / 'repo'
+    target.mkdir()
+    link = tmp_path / 'link'
+    link.symlink_to(target)
+    assert locks.get(str(link)) is locks.get(str(target))
+    assert not locks.busy(str(target))
+    with locks.locked(str(link), write=True):
+        assert locks.busy(str(target))
+        with pytest.raises(LockTimeout):
+            with locks.locked(str(target), timeout=0.05):
+                pass
+    assert not locks.busy(str(target))
+
+
+def test_run_async_runs_off_the_event_loop_thread():
+    async def run():
+        return await concurrency.run_async(threading.current_thread)
+    assert asyncio.run(run()) is not threading.main_thread()
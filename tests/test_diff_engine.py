@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+import diff_engine
+from cache import result_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    result_cache.clear()
+
+
+def records(*tokens):
+    return [token.encode() for token in tokens]
+
+
+def test_parse_summary_raw_and_numstat():
+    files = diff_engine._parse_summary(records(
+        ':100644 100644 aaaa bbbb M', 'changed.txt',
+        ':000000 100644 0000 cccc A', 'added.txt',
+        ':100644 100644 dddd eeee R090', 'old.txt', 'new.txt',
+        ':100644 100644 ffff 1111 M', 'image.png',
+        '3\t1\tchanged.txt',
+        '5\t0\tadded.txt',
+        '2\t2\t', 'old.txt', 'new.txt',
+        '-\t-\timage.png',
+    ))
+    assert files == [
+        {"path": 'changed.txt', "old_path": None, "status": 'M', "additions": 3, "deletions": 1, "binary": False},
+        {"path": 'added.txt', "old_path": None, "status": 'A', "additions": 5, "deletions": 0, "binary": False},
+        {"path": 'new.txt', "old_path": 'old.txt', "status": 'R', "additions": 2, "deletions": 2,
+         "binary": False, "similarity": 90},
+        {"path": 'image.png', "old_path": None, "status": 'M', "additions": 0, "deletions": 0, "binary": True},
+    ]
+
+
+def test_attach_hunks_within_and_over_budget():
+    patch = records(
+        'diff --git a/a.txt b/a.txt', 'index 1..2 100644', '--- a/a.txt', '+++ b/a.txt',
+        '@@ -1 +1 @@', '-old', '+new',
+        'diff --git a/b.txt b/b.txt', '--- a/b.txt', '+++ b/b.txt',
+        '@@ -1,2 +1,2 @@', ' same', '-x', '+y',
+    )
+    files = [{"path": 'a.txt'}, {"path": 'b.txt'}]
+    assert diff_engine._attach_hunks(patch, files, max_bytes=10000, max_lines=100) is False
+    assert files[0]["hunks"] == [{"header": '@@ -1 +1 @@', "lines": ['-old', '+new']}]
+    assert files[1]["hunks"][0]["lines"] == [' same', '-x', '+y']
+
+    files = [{"path": 'a.txt'}, {"path": 'b.txt'}]
+    assert diff_engine._attach_hunks(patch, files, max_bytes=10000, max_lines=2) is True
+    assert files[0]["truncated"] is True
+    assert files[1]["hunks_omitted"] is True
+
+
+def test_diff_between_commits(repo):
+    base = repo.head()
+    repo.git('mv', 'README.md', 'DOC.md')
+    repo.commit('rename and add', {'new.txt': 'one\ntwo\n', 'DOC.md': 'hello\n'})
+
+    result = diff_engine.diff(repo.path, base, 'HEAD', hunks=True)
+    by_path = {f["path"]: f for f in result["files"]}
+    assert by_path['DOC.md']["status"] == 'R'
+    assert by_path['DOC.md']["old_path"] == 'README.md'
+    assert by_path['new.txt']["additions"] == 2
+    assert by_path['new.txt']["hunks"][0]["lines"] == ['+one', '+two']
+    assert result["total_additions"] == 2
+    assert result["cache_hit"] is False
+    assert "cached" not in result
+
+    again = diff_engine.diff(repo.path, base, 'HEAD', hunks=True)
+    assert again["cache_hit"] is True
+    assert again["files"] == result["files"]
+
+
+def test_cached_parameter_compares_index(repo):
+    repo.write('README.md', 'staged\n')
+    repo.git('add', 'README.md')
+    repo.write('README.md', 'unstaged\n')
+    staged = diff_engine.diff(repo.path, cached=True)
+    assert staged["files"][0]["path"] == 'README.md'
+    assert staged["cache_hit"] is False
+    worktree = diff_engine.diff(repo.path, 'HEAD')
+    assert worktree["files"][0]["additions"] == 1
+
+
+@pytest.mark.parametrize('params', [
+    {'base': '--output=OUT'},
+    {'target': '--output=OUT'},
+    {'base': 'HEAD', 'target': '--output=OUT'},
+])
+def test_option_like_revisions_are_rejected(repo, params):
+    out = f'{repo.path}/../pwned'
+    params = {k: v.replace('OUT', out) for k, v in params.items()}
+    with pytest.raises(Exception):
+        diff_engine.diff(repo.path, **params)
+    assert not os.path.exists(out)
+
+
+def test_single_revision_compares_work_tree(repo):
+    repo.write('README.md', 'changed\n')
+    result = diff_engine.diff(repo.path, 'HEAD')
+    assert [f["path"] for f in result["files"]] == ['README.md']
+    assert result["base"] == 'HEAD'
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from dispatcher import INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, SERVER_ERROR, RPCError, ToolRegistry, ToolSpec
+
+
+def add(a: int, b: int = 1, scale: float = 1.0, label: str = None):
+    return (a + b) * scale
+
+
+def test_bind_object_and_array_params():
+    spec = ToolSpec(add, read_only=True)
+    assert spec.bind({'a': 2}).arguments == {'a': 2}
+    assert spec.bind([2, 3]).arguments == {'a': 2, 'b': 3}
+    assert spec.bind({'a': 2, 'scale': 3}).arguments["scale"] == 3
+    assert spec.bind({'a': 2, 'label': None}).arguments["label"] is None
+
+
+@pytest.mark.parametrize('params, message', [
+    ({}, "missing a required argument: 'a'"),
+    ({'a': 1, 'c': 2}, "unexpected keyword argument 'c'"),
+    ({'a': '1'}, "'a' must be int"),
+    ({'a': True}, "'a' must be int"),
+    ({'a': 1, 'scale': 'x'}, "'scale' must be float"),
+    ({'a': 1, 'label': 5}, "'label' must be str"),
+    ('a=1', "params must be an object or array"),
+])
+def test_bind_rejects_invalid_params(params, message):
+    with pytest.raises(RPCError) as raised:
+        ToolSpec(add, read_only=True).bind(params)
+    assert raised.value.code == INVALID_PARAMS
+    assert message in str(raised.value)
+
+
+def test_split_background():
+    spec = ToolSpec(add, read_only=True, background=True)
+    assert spec.split_background({'a': 1, 'background': True}) == ({'a': 1}, True)
+    assert spec.split_background({'a': 1}) == ({'a': 1}, False)
+    with pytest.raises(RPCError):
+        spec.split_background({'a': 1, 'background': 'yes'})
+    # background 를 지원하지 않는 도구에서는 일반 인자로 남아 바인딩에서 거부된다
+    assert ToolSpec(add, read_only=True).split_background({'background': True}) == ({'background': True}, False)
+
+
+@pytest.fixture
+def registry():
+    registry = ToolRegistry(max_workers=4)
+    registry.register(add, read_only=True)
+
+    def fail():
+        raise ValueError("boom")
+    registry.register(fail)
+    return registry
+
+
+def test_handle_single_requests(registry):
+    assert registry.handle({'jsonrpc': '2.0', 'id': 1, 'method': 'add', 'params': {'a': 1, 'b': 2}}) == \
+        {"jsonrpc": "2.0", "id": 1, "result": 3.0}
+    cases = [
+        ({'jsonrpc': '1.0', 'id': 2, 'method': 'add'}, INVALID_REQUEST),
+        ({'jsonrpc': '2.0', 'id': 3}, INVALID_REQUEST),
+        ({'jsonrpc': '2.0', 'id': 4, 'method': 'nope'}, METHOD_NOT_FOUND),
+        ({'jsonrpc': '2.0', 'id': 5, 'method': 'add', 'params': {'a': 'x'}}, INVALID_PARAMS),
+        ({'jsonrpc': '2.0', 'id': 6, 'method': 'fail'}, SERVER_ERROR),
+        ('not a request', INVALID_REQUEST),
+    ]
+    for request, code in cases:
+        assert registry.handle(request)["error"]["code"] == code
+
+
+def test_batch_keeps_order_and_drops_notifications(registry):
+    responses = registry.handle([
+        {'jsonrpc': '2.0', 'id': 'x', 'method': 'add', 'params': [1]},
+        {'jsonrpc': '2.0', 'method': 'add', 'params': [5]},
+        {'jsonrpc': '2.0', 'id': 'y', 'method': 'fail'},
+        {'jsonrpc': '2.0', 'id': 'z', 'method': 'add', 'params': [2, 2]},
+    ])
+    assert [r["id"] for r in responses] == ['x', 'y', 'z']
+    assert responses[0]["result"] == 2.0
+    assert responses[1]["error"]["message"] == 'boom'
+    assert responses[2]["result"] == 4.0
+    assert registry.handle([])["error"]["code"] == INVALID_REQUEST
+
+
+def test_batch_runs_read_only_calls_concurrently_and_writes_in_order():
+    registry = ToolRegistry(max_workers=4)
+    barrier = threading.Barrier(3, timeout=5)
+    order = []
+
+    def read(n: int):
+        barrier.wait()
+        return n
+
+    def write(n: int):
+        order.append(n)
+        return n
+    registry.register(read, read_only=True)
+    registry.register(write)
+
+    batch = [{'jsonrpc': '2.0', 'id': i, 'method': 'read', 'params': [i]} for i in range(3)]
+    batch += [{'jsonrpc': '2.0', 'id': 10 + i, 'method': 'write', 'params': [i]} for i in range(3)]
+    responses = registry.handle(batch)
+    # 읽기 세 개가 동시에 실행되지 않으면 barrier 가 시간 초과로 실패한다
+    assert [r["result"] for r in responses] == [0, 1, 2, 0, 1, 2]
+    assert order == [0, 1, 2]
@@ -0,0 +1,175 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import github_client
+import progress
+from benchmarks.fake_github import FakeGitHub
+from github_client import GitHubClient, GitHubError
+
+PATH = 'repos/octo/repo/pulls/1'
+
+
+@pytest.fixture
+def fake():
+    with FakeGitHub(prs=10) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake):
+    client = GitHubClient(token='x', base_url=fake.url, cache_bytes=1024 * 1024)
+    yield client
+    client.close()
+
+
+def test_etag_reuses_cached_body_on_304(fake, client):
+    first = client.get(PATH)
+    again = client.get(PATH)
+    assert again == first
+    assert fake.not_modified == 1
+    # 304 는 rate limit 를 차감하지 않는다
+    assert fake.limit - fake.remaining == 1
+    assert client.stats()["not_modified"] == 1
+
+    client.patch(PATH, json={'title': 'renamed'})
+    assert client.get(PATH)["title"] == 'renamed'
+    assert fake.not_modified == 1
+
+
+def test_session_reuses_connections(fake, client):
+    for number in range(1, 11):
+        client.get(f'repos/octo/repo/pulls/{number}')
+    assert fake.connections == 1
+    assert client.stats()["requests"] == 10
+
+
+def test_concurrent_identical_gets_are_coalesced(fake, client):
+    fake.delay = 0.2
+    barrier = threading.Barrier(10)
+    results, errors = [], []
+
+    def fetch(path):
+        barrier.wait()
+        try:
+            results.append(client.get(path))
+        except GitHubError as e:
+            errors.append(e.status)
+
+    threads = [threading.Thread(target=fetch, args=(PATH,)) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fake.requests == 1
+    assert client.stats()["coalesced"] == 9
+    assert len(results) == 10 and all(result == results[0] for result in results)
+
+    # 실패도 기다리던 호출 모두에 전달된다
+    barrier.reset()
+    threads = [threading.Thread(target=fetch, args=('repos/octo/repo/pulls/99',)) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fake.requests == 2
+    assert errors == [404] * 10
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """호출 5번 한도 - 대기(sleep)는 실제로 자지 않고 서버 한도를 바로 되돌린다"""
+    with FakeGitHub(prs=10, rate_limit=5) as server:
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            with server.lock:
+                server.remaining = server.limit
+
+        monkeypatch.setattr(github_client, 'time', SimpleNamespace(time=time.time, perf_counter=time.perf_counter,
+                                                                   sleep=sleep))
+        yield server, waits
+
+
+def test_rate_limit_waits_before_exhausting(limited):
+    server, waits = limited
+    client = GitHubClient(token='x', base_url=server.url, min_remaining=1, max_wait=server.reset_in + 10)
+    for number in range(1, 10):
+        client.get(f'repos/octo/repo/pulls/{number}')
+    assert len(waits) == client.stats()["rate_limit_waits"] == 2
+    # 남은 호출이 min_remaining 에 닿으면 멈추므로 403 을 받지 않는다
+    assert server.requests == 9
+    client.close()
+
+
+def test_rate_limited_response_is_retried_after_reset(limited):
+    server, waits = limited
+    client = GitHubClient(token='x', base_url=server.url, min_remaining=0, max_wait=server.reset_in + 10)
+    server.remaining = 0
+    assert client.get(PATH)["number"] == 1
+    assert len(waits) == 1
+    assert server.requests == 2
+    client.close()
+
+
+def test_rate_limit_wait_longer_than_max_wait_fails(limited):
+    server, waits = limited
+    client = GitHubClient(token='x', base_url=server.url, min_remaining=0, max_wait=1)
+    server.remaining = 0
+    with pytest.raises(GitHubError, match='rate limit') as error:
+        client.get(PATH)
+    assert error.value.status == 403
+    assert waits == []
+    client.close()
+
+
+@pytest.fixture
+def many():
+    """PR 1000개 (100개씩 10페이지)"""
+    with FakeGitHub(prs=1000) as server:
+        yield server
+
+
+def test_paginate_requests_a_bounded_window_lazily(many):
+    client = GitHubClient(token='x', base_url=many.url, max_concurrency=2)
+    pages = client.paginate('repos/octo/repo/pulls')
+    numbers = [pull["number"] for _ in range(3) for pull in next(pages)]
+    pages.close()
+    client.close()
+    assert numbers == list(range(1000, 700, -1))
+    # 첫 페이지 + 넘겨준 페이지 2개 + 앞서 요청한 창(2개) 이하
+    assert many.requests <= 5
+
+
+def test_paginate_stops_prefetching_at_limit(many):
+    client = GitHubClient(token='x', base_url=many.url)
+    pages = client.paginate('repos/octo/repo/pulls', limit=150)
+    assert [len(page) for page in (next(pages), next(pages))] == [100, 100]
+    assert many.requests == 2
+
+    # limit 을 넘어 계속 읽으면 한 페이지씩 이어서 가져온다
+    assert sum(len(page) for page in pages) == 800
+    assert many.requests == 10
+
+    pages = client.paginate('repos/octo/repo/pulls', limit=10)
+    assert len(next(pages)) == 10
+    pages.close()
+    assert many.requests == 11
+    client.close()
+
+
+def test_list_pull_requests_reports_pages_and_honours_limit(server, many, monkeypatch):
+    client = GitHubClient(token='x', base_url=many.url)
+    monkeypatch.setattr(server, 'GITHUB_TOKEN', 'x')
+    monkeypatch.setattr(server, '_github', client)
+    reports = []
+    params = {'repo_owner': 'octo', 'repo_name': 'repo', 'limit': 250, 'fields': ['number']}
+    with progress.reporting(lambda value, total, message: reports.append((value, total))):
+        pulls = server.registry.call('list_pull_requests', params)
+    assert [pull["number"] for pull in pulls] == list(range(1000, 750, -1))
+    assert reports == [(100, 250), (200, 250), (300, 250)]
+    assert many.requests == 3
+    client.close()
@@ -0,0 +1,229 @@
+import os
+
+import pytest
+
+import history_engine
+from cache import result_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    result_cache.clear()
+
+
+@pytest.fixture
+def history(repo):
+    """두 작성자가 번갈아 커밋하고 곁가지 두 개를 병합한 히스토리 (커밋 시각은 모두 다름)"""
+    clock = iter(range(1700000000, 1700100000, 60))
+
+    def commit(message, files=None, author='tester'):
+        env = {'GIT_AUTHOR_NAME': author, 'GIT_AUTHOR_EMAIL': f'{author}@example.com'}
+        for name, text in (files or {}).items():
+            repo.write(name, text)
+        repo.git('add', '-A')
+        date = f'{next(clock)} +0000'
+        repo.git('commit', '-q', '--allow-empty', '-m', message,
+                 env=dict(env, GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date))
+
+    for n in range(6):
+        commit(f'main {n}', {'main.txt': f'{n}\n'}, author='alice' if n % 2 else 'bob')
+    for side in ('one', 'two'):
+        repo.git('checkout', '-q', '-b', side, 'HEAD~3')
+        for n in range(4):
+            commit(f'{side} {n}', {f'{side}.txt': f'{n}\n'}, author='alice')
+            repo.git('checkout', '-q', 'main')
+            commit(f'main {side} {n}', {'main.txt': f'{side} {n}\n'}, author='bob')
+            repo.git('checkout', '-q', side)
+        repo.git('checkout', '-q', 'main')
+        date = f'{next(clock)} +0000'
+        repo.git('merge', '-q', '--no-ff', '-m', f'merge {side}', side,
+                 env={'GIT_AUTHOR_DATE': date, 'GIT_COMMITTER_DATE': date})
+    return repo
+
+
+def all_pages(work_tree, limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = history_engine.history_page(work_tree, limit=limit, cursor=cursor, fields=['hash'], **kwargs)
+        pages.append([commit["hash"] for commit in page["commits"]])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return pages
+
+
+def expected(repo, *args):
+    return repo.git('log', '--format=%H', *args).split()
+
+
+@pytest.mark.parametrize('limit', [1, 3, 7, 100])
+def test_pages_match_git_log(history, limit):
+    pages = all_pages(history.path, limit)
+    assert [sha for page in pages for sha in page] == expected(history, 'HEAD')
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+@pytest.mark.parametrize('kwargs, args', [
+    ({'revision': 'HEAD~2..HEAD'}, ['HEAD~2..HEAD']),
+    ({'revision': 'one...two'}, ['one...two']),
+    ({'paths': ['main.txt']}, ['--', 'main.txt']),
+    ({'paths': ['one.txt']}, ['--', 'one.txt']),
+    ({'author': 'alice'}, ['--author=alice']),
+    ({'author': 'b.b@'}, ['--author=b.b@']),
+    ({'until': '1700000900'}, ['--until=1700000900']),
+    ({'since': '1700000500'}, ['--since=1700000500']),
+    ({'author': 'bob', 'paths': ['main.txt'], 'since': '1700000300'},
+     ['--author=bob', '--since=1700000300', '--', 'main.txt']),
+    ({'revision': 'one...two', 'paths': ['one.txt']}, ['one...two', '--', 'one.txt']),
+])
+def test_filtered_pages_match_git_log(history, kwargs, args):
+    for limit in (1, 2, 5):
+        pages = all_pages(history.path, limit, **kwargs)
+        assert [sha for page in pages for sha in page] == expected(history, *args)
+
+
+def test_cursor_resumes_from_boundary_not_skip(history):
+    page = history_engine.history_page(history.path, limit=4)
+    state = history_engine.decode_cursor(page["next_cursor"])
+    assert "skip" not in state
+    assert state["pending"]
+    assert not set(state["pending"]) & {commit["hash"] for commit in page["commits"]}
+
+
+def test_cursor_is_pinned_when_branch_moves(history):
+    first = history_engine.history_page(history.path, limit=5)
+    history.commit('moved on')
+    second = history_engine.history_page(history.path, limit=5, cursor=first["next_cursor"])
+    hashes = [c["hash"] for c in first["commits"] + second["commits"]]
+    assert hashes == expected(history, 'HEAD~1')[:10]
+
+
+def test_fields_and_parents(history):
+    page = history_engine.history_page(history.path, limit=1, fields=['hash', 'parents', 'subject', 'author'])
+    commit = page["commits"][0]
+    assert commit["subject"] == 'merge two'
+    assert commit["parents"] == history.git('log', '-1', '--format=%P').split()
+    filtered = history_engine.history_page(history.path, limit=1, author='tester', fields=['parents', 'subject'])
+    assert filtered["commits"][0] == {"parents": commit["parents"], "subject": 'merge two'}
+
+
+def test_legacy_skip_cursor_still_works(history):
+    cursor = history_engine.encode_cursor({
+        "revs": [history.head()], "fields": ['hash'], "paths": None, "author": None,
+        "since": None, "until": None, "skip": 2,
+    })
+    page = history_engine.history_page(history.path, limit=3, cursor=cursor)
+    assert [c["hash"] for c in page["commits"]] == expected(history, 'HEAD')[2:5]
+
+
+def test_cursor_encoding_round_trip():
+    state = {"pending": ['a' * 40], "fields": ['hash'], "author": 'é'}
+    cursor = history_engine.encode_cursor(state)
+    assert '=' not in cursor
+    assert history_engine.decode_cursor(cursor) == state
+    with pytest.raises(ValueError):
+        history_engine.decode_cursor('not a cursor!')
+
+
+def test_unknown_field_and_revision(repo):
+    with pytest.raises(ValueError):
+        history_engine.history_page(repo.path, fields=['nope'])
+    with pytest.raises(Exception):
+        history_engine.history_page(repo.path, revision='no-such-branch')
+
+
+@pytest.mark.parametrize('change', [
+    {"pending": ['--output=OUT']},
+    {"exclude": ['^--output=OUT']},
+    {"exclude": ['a' * 40]},
+    {"fields": ['hash', 'nope']},
+    {"max_age": '--output=OUT'},
+    {"paths": 'x'},
+])
+def test_crafted_cursor_is_rejected(history, tmp_path, change):
+    out = str(tmp_path / 'pwned')
+    state = history_engine.decode_cursor(history_engine.history_page(history.path, limit=2)["next_cursor"])
+    state.update({key: [v.replace('OUT', out) for v in value] if isinstance(value, list) else value
+                  for key, value in change.items()})
+    with pytest.raises(ValueError, match='잘못된 커서'):
+        history_engine.history_page(history.path, cursor=history_engine.encode_cursor(state))
+    assert not os.path.exists(out)
+
+
+def test_crafted_skip_cursor_is_rejected(history, tmp_path):
+    out = str(tmp_path / 'pwned')
+    cursor = history_engine.encode_cursor({
+        "revs": [f'--output={out}'], "fields": ['hash'], "paths": None, "author": None,
+        "since": None, "until": None, "skip": 0,
+    })
+    with pytest.raises(ValueError, match='잘못된 커서'):
+        history_engine.history_page(history.path, cursor=cursor)
+    assert not os.path.exists(out)
+
+
+def test_option_like_revision_is_rejected(history):
+    with pytest.raises(ValueError, match='알 수 없는 리비전'):
+        history_engine.history_page(history.path, revision='--since=yesterday')
+
+
+@pytest.fixture
+def skewed(repo):
+    """커밋 시각이 부모보다 이른 커밋과 같은 시각의 커밋이 섞인 히스토리
+
+    main 의 C 는 곁가지 D 의 부모지만 D 보다 늦은 시각이라, 날짜순 탐색은 D 보다 C 를 먼저 낸다.
+    """
+    def commit(message, date, files):
+        repo.commit(message, {name: f'{message}\n' for name in files}, date=f'{date} +0000')
+
+    commit('A', 1700000100, ['f1.txt', 'h.txt', 'dir/x.txt'])
+    commit('C', 1700001000, ['f1.txt'])
+    repo.git('checkout', '-q', '-b', 'side')
+    for n, date in enumerate([1700000200, 1700000200, 1700000200, 1700002000]):
+        commit(f'D{n}', date, ['h.txt', 'dir/x.txt'] if n % 2 else ['h.txt'])
+    repo.git('checkout', '-q', 'main')
+    for n in range(3):
+        commit(f'T{n}', 1700002500, ['f1.txt', 'dir/y.txt'])
+    date = '1700003000 +0000'
+    repo.git('merge', '-q', '--no-ff', '-m', 'M', 'side', env={'GIT_AUTHOR_DATE': date, 'GIT_COMMITTER_DATE': date})
+    commit('after', 1700000500, ['f1.txt'])
+    return repo
+
+
+@pytest.mark.parametrize('paths', [None, ['f1.txt'], ['h.txt'], ['f1.txt', 'h.txt'], ['dir'], ['dir/*.txt']])
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 7])
+def test_pages_with_skewed_dates_have_no_duplicates(skewed, paths, limit):
+    pages = all_pages(skewed.path, limit, paths=paths)
+    hashes = [sha for page in pages for sha in page]
+    args = ['--parents', '--', *paths] if paths else ['HEAD']
+    assert hashes == expected(skewed, *args)
+    assert len(set(hashes)) == len(hashes)
+
+
+def test_skew_falls_back_to_skip(skewed):
+    # 'after' 다음에 나올 M 은 'after' 보다 늦은 시각이라 경계로 이어갈 수 없다
+    first = history_engine.history_page(skewed.path, limit=1)
+    assert history_engine.decode_cursor(first["next_cursor"])["skip"] == 1
+    second = history_engine.history_page(skewed.path, limit=1, cursor=first["next_cursor"])
+    assert [c["message"].strip() for c in first["commits"] + second["commits"]] == ['after', 'M']
+
+
+def test_same_timestamp_commits_are_remembered(repo):
+    for n in range(5):
+        repo.commit(f'same {n}', {'a.txt': f'{n}\n'}, date='1700000000 +0000')
+    page = history_engine.history_page(repo.path, limit=2, fields=['hash'])
+    state = history_engine.decode_cursor(page["next_cursor"])
+    assert state["watermark"] == 1700000000
+    assert state["seen"] == [c["hash"] for c in page["commits"]]
+    pages = all_pages(repo.path, 2)
+    assert [sha for page in pages for sha in page] == expected(repo, 'HEAD')
+
+
+def test_only_single_file_paths_resume_from_boundary(history):
+    def state(paths):
+        page = history_engine.history_page(history.path, limit=1, paths=paths)
+        return history_engine.decode_cursor(page["next_cursor"])
+    assert "skip" not in state(['main.txt'])
+    assert "skip" in state(['main.txt', 'one.txt'])
+    assert "skip" in state(['*.txt'])
+    history.commit('dir', {'dir/a.txt': 'a\n', 'dir/b.txt': 'b\n'})
+    history.commit('dir again', {'dir/a.txt': 'b\n'})
+    assert "skip" in state(['dir'])
@@ -0,0 +1,144 @@
+import os
+import stat
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import gitproc
+from jobs import CANCELLED, FAILED, SUCCEEDED, JobCancelled, JobManager
+
+
+def wait_finished(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while job.finished_at is None:
+        assert time.monotonic() < deadline, job.summary()
+        time.sleep(0.02)
+    return job
+
+
+@pytest.fixture
+def manager():
+    return JobManager(max_workers=1, history=2)
+
+
+def test_job_results_and_history(manager):
+    ok = wait_finished(manager.submit('ok', {}, lambda: 42))
+    failed = wait_finished(manager.submit('bad', {}, lambda: 1 / 0))
+    assert (ok.status, ok.result) == (SUCCEEDED, 42)
+    assert failed.status == FAILED and 'division' in failed.error
+
+    wait_finished(manager.submit('third', {}, lambda: None))
+    # 완료된 작업은 history 개만 보관한다
+    assert [job["tool"] for job in manager.list()] == ['third', 'bad']
+    with pytest.raises(Exception, match='작업을 찾을 수 없음'):
+        manager.get(ok.id)
+
+
+def test_cancel_queued_job_never_runs(manager):
+    release, ran, cleaned = threading.Event(), [], []
+    blocker = manager.submit('blocker', {}, release.wait)
+    queued = manager.submit('queued', {}, lambda: ran.append(1), cleanup=cleaned.append)
+    summary = manager.cancel(queued.id)
+    release.set()
+    wait_finished(blocker)
+    assert summary["status"] == CANCELLED
+    assert queued.error == 'cancelled before start'
+    assert ran == [] and cleaned == []
+
+
+def test_cancel_kills_running_git_and_runs_cleanup(manager, repo):
+    started, cleaned = threading.Event(), []
+
+    def slow():
+        started.set()
+        gitproc.run(repo.path, ['-c', 'alias.slow=!sleep 30', 'slow'])
+
+    job = manager.submit('slow', {}, slow, cleanup=cleaned.append)
+    assert started.wait(5)
+    # 프로세스가 등록될 때까지
+    while not job._procs:
+        time.sleep(0.01)
+    began = time.monotonic()
+    manager.cancel(job.id)
+    wait_finished(job)
+    assert time.monotonic() - began < 5
+    assert job.status == CANCELLED
+    assert cleaned == [job]
+    # 취소된 작업은 새 git 프로세스를 띄우지 못한다
+    with gitproc.tracking(job), pytest.raises(JobCancelled):
+        gitproc.run(repo.path, ['status'])
+
+
+@pytest.fixture
+def branches(repo):
+    """feature 가 clean.txt 를 추가하고 main 은 다른 커밋을 한 상태 (충돌 없음)"""
+    repo.git('checkout', '-q', '-b', 'feature')
+    repo.commit('feature', {'clean.txt': 'clean\n'})
+    repo.git('checkout', '-q', 'main')
+    repo.commit('main', {'main.txt': 'main\n'})
+    return repo
+
+
+def hook(repo, name, script):
+    path = os.path.join(repo.path, '.git', 'hooks', name)
+    with open(path, 'w') as f:
+        f.write('#!/bin/sh\n' + script + '\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+def test_cancelled_merge_job_restores_tree(server, branches):
+    hook(branches, 'pre-merge-commit', 'sleep 30')
+    head = branches.head()
+    job = server.registry.call('merge_branch', {'source_branch': 'feature', 'background': True})
+    deadline = time.monotonic() + 10
+    while 'clean.txt' not in branches.git('diff', '--cached', '--name-only'):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    server.registry.call('cancel_job', {'job_id': job["job_id"]})
+    job = wait_finished(server.job_manager.get(job["job_id"]))
+
+    assert job.status == CANCELLED
+    assert branches.head() == head
+    assert branches.git('status', '--porcelain') == ''
+    assert not os.path.exists(os.path.join(branches.path, 'clean.txt'))
+
+
+def cancelled_job(started_at):
+    return SimpleNamespace(id='test', arguments={}, started_at=started_at)
+
+
+def test_cleanup_aborts_only_what_the_job_started(server, branches):
+    git_dir = os.path.join(branches.path, '.git')
+    branches.commit('conflict', {'clean.txt': 'main side\n'})
+    head = branches.head()
+    with pytest.raises(Exception):
+        branches.git('merge', 'feature')
+    lock = os.path.join(git_dir, 'index.lock')
+    open(lock, 'w').close()
+
+    # 작업 시작 전에 있던 merge / index.lock 은 건드리지 않는다
+    server.cleanup_cancelled_job(cancelled_job(time.time() + 60))
+    assert os.path.exists(os.path.join(git_dir, 'MERGE_HEAD'))
+    assert os.path.exists(lock)
+
+    server.cleanup_cancelled_job(cancelled_job(time.time() - 60))
+    assert not os.path.exists(os.path.join(git_dir, 'MERGE_HEAD'))
+    assert not os.path.exists(lock)
+    assert branches.head() == head
+    assert branches.git('status', '--porcelain') == ''
+
+
+def test_cleanup_aborts_interrupted_rebase(server, branches):
+    branches.commit('conflict', {'clean.txt': 'main side\n'})
+    head = branches.head()
+    started_at = time.time() - 1
+    with pytest.raises(Exception):
+        branches.git('rebase', 'feature')
+    assert os.path.exists(os.path.join(branches.path, '.git', 'rebase-merge'))
+
+    server.cleanup_cancelled_job(cancelled_job(started_at))
+    assert not os.path.exists(os.path.join(branches.path, '.git', 'rebase-merge'))
+    assert branches.head() == head
+    assert branches.git('status', '--porcelain') == ''
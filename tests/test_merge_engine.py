@@ -0,0 +1,161 @@
+from types import SimpleNamespace
+
+import pytest
+
+import merge_engine
+from cache import result_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    result_cache.clear()
+
+
+def test_parse_merge_tree_stages_and_messages():
+    raw = b'\0'.join([
+        b'1111111111111111111111111111111111111111',
+        b'100644 aaaa 1\tconflict.txt',
+        b'100644 bbbb 2\tconflict.txt',
+        b'100644 cccc 3\tconflict.txt',
+        b'100755 dddd 2\tdir/with tab\t.sh',
+        b'',
+        b'1', b'conflict.txt', b'Auto-merging', b'Auto-merging conflict.txt\n',
+        b'1', b'conflict.txt', b'CONFLICT (contents)', b'CONFLICT (content): Merge conflict in conflict.txt\n',
+        b'2', b'old.txt', b'new.txt', b'CONFLICT (rename/delete)', b'old.txt renamed to new.txt\n',
+        b'',
+    ])
+    tree, stages, messages = merge_engine._parse_merge_tree(raw)
+    assert tree == '1' * 40
+    assert stages == {
+        'conflict.txt': {
+            "base": {"mode": '100644', "oid": 'aaaa'},
+            "ours": {"mode": '100644', "oid": 'bbbb'},
+            "theirs": {"mode": '100644', "oid": 'cccc'},
+        },
+        'dir/with tab\t.sh': {"ours": {"mode": '100755', "oid": 'dddd'}},
+    }
+    assert messages == [
+        {"paths": ['conflict.txt'], "type": 'Auto-merging', "message": 'Auto-merging conflict.txt'},
+        {"paths": ['conflict.txt'], "type": 'CONFLICT (contents)',
+         "message": 'CONFLICT (content): Merge conflict in conflict.txt'},
+        {"paths": ['old.txt', 'new.txt'], "type": 'CONFLICT (rename/delete)', "message": 'old.txt renamed to new.txt'},
+    ]
+
+
+def test_parse_merge_tree_clean_output():
+    assert merge_engine._parse_merge_tree(b'2222\0\0') == ('2222', {}, [])
+
+
+def test_conflict_hunks_merge_and_diff3():
+    text = '\n'.join([
+        'top',
+        '<<<<<<< ours',
+        'a1', 'a2',
+        '=======',
+        'b1',
+        '>>>>>>> theirs',
+        'middle',
+        '<<<<<<< ours',
+        'x',
+        '||||||| base',
+        'o',
+        '=======',
+        'y',
+        '>>>>>>> theirs',
+        '=======',
+    ])
+    assert merge_engine.conflict_hunks(text) == [
+        {"line": 2, "ours": 'a1\na2', "base": None, "theirs": 'b1'},
+        {"line": 9, "ours": 'x', "base": 'o', "theirs": 'y'},
+    ]
+    assert merge_engine.conflict_hunks('no markers\n=======\n') == []
+
+
+@pytest.fixture
+def branches(repo):
+    """main 과 feature 가 README.md 를 서로 다르게 고친 상태 (feature 는 clean.txt 도 추가)"""
+    repo.git('checkout', '-q', '-b', 'feature')
+    repo.commit('feature', {'README.md': 'feature\n', 'clean.txt': 'clean\n'})
+    repo.git('checkout', '-q', 'main')
+    repo.commit('main', {'README.md': 'main\n'})
+    return repo
+
+
+def test_preview_reports_conflicts_without_touching_tree(branches):
+    head = branches.head()
+    result = merge_engine.preview(branches.path, 'feature')
+    assert result["clean"] is False
+    assert result["up_to_date"] is False
+    assert result["fast_forward"] is False
+    assert result["cache_hit"] is False
+    assert [c["path"] for c in result["conflicts"]] == ['README.md']
+    conflict = result["conflicts"][0]
+    assert set(conflict["stages"]) == {'base', 'ours', 'theirs'}
+    assert 'CONFLICT (contents)' in conflict["types"]
+    assert conflict["hunks"] == [{"line": 1, "ours": 'main', "base": None, "theirs": 'feature'}]
+    assert branches.head() == head
+    assert branches.git('status', '--porcelain') == ''
+
+    again = merge_engine.preview(branches.path, 'feature')
+    assert again["cache_hit"] is True
+    assert again["conflicts"] == result["conflicts"]
+
+
+def test_preview_hunk_budget(branches):
+    result = merge_engine.preview(branches.path, 'feature', max_bytes=1)
+    assert result["truncated"] is True
+    assert result["conflicts"][0]["hunks_omitted"] is True
+
+
+def test_preview_up_to_date_and_fast_forward(repo):
+    base = repo.head()
+    repo.git('checkout', '-q', '-b', 'feature')
+    repo.commit('feature', {'new.txt': 'new\n'})
+    repo.git('checkout', '-q', 'main')
+
+    result = merge_engine.preview(repo.path, 'feature')
+    assert result["clean"] is True
+    assert result["fast_forward"] is True
+    assert result["conflicts"] == []
+    assert merge_engine.preview(repo.path, base)["up_to_date"] is True
+
+
+def test_fast_merge_creates_merge_commit(branches):
+    branches.git('checkout', '-q', '-B', 'main', 'main~1')
+    branches.commit('main', {'other.txt': 'other\n'})
+    ours, theirs = branches.head(), branches.head('feature')
+    result = merge_engine.fast_merge(branches.path, 'feature')
+    assert result["merged"] is True
+    assert result["commit"] == branches.head()
+    assert branches.git('rev-list', '--parents', '-n', '1', 'HEAD').split()[1:] == [ours, theirs]
+    assert branches.git('log', '-1', '--format=%s') == "Merge branch 'feature'\n"
+    with open(f'{branches.path}/clean.txt') as f:
+        assert f.read() == 'clean\n'
+    assert branches.git('status', '--porcelain') == ''
+
+
+def test_fast_merge_leaves_conflicts_alone(branches):
+    head = branches.head()
+    result = merge_engine.fast_merge(branches.path, 'feature')
+    assert result["merged"] is False
+    assert result["commit"] is None
+    assert branches.head() == head
+    assert branches.git('status', '--porcelain') == ''
+
+
+def test_cached_preview_keeps_per_call_fields_out(branches, monkeypatch):
+    stored = []
+    put = result_cache.put
+    monkeypatch.setattr(result_cache, 'put',
+                        lambda namespace, key, value: stored.append(value) or put(namespace, key, value))
+    first = merge_engine.preview(branches.path, 'feature')
+    assert 'seconds' not in stored[0] and 'cache_hit' not in stored[0]
+
+    hit = merge_engine.preview(branches.path, 'feature')
+    assert hit["cache_hit"] is True
+    assert set(hit) - set(stored[0]) == {'cache_hit', 'seconds'}
+    # 적중한 호출도 자기 소요 시간을 돌려준다 (첫 호출의 값을 재사용하지 않음)
+    monkeypatch.setattr(merge_engine, 'time', SimpleNamespace(perf_counter=lambda: 7.0))
+    assert merge_engine.preview(branches.path, 'feature')["seconds"] == 0
+    hit["conflicts"] = []
+    assert merge_engine.preview(branches.path, 'feature')["conflicts"] == first["conflicts"]
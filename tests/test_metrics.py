@@ -0,0 +1,137 @@
+import json
+import logging
+import re
+import time
+
+import pytest
+
+import metrics as metrics_module
+from metrics import BUCKETS, Histogram, Metrics, _git_command, metrics
+
+# 'name{labels} value' 또는 'name value'
+SAMPLE = re.compile(r'^[a-z_]+(\{[^}]*\})? -?[0-9.e+]+$')
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_summary_and_buckets():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    summary = histogram.summary()
+    assert (summary["count"], summary["p50_ms"], summary["p99_ms"], summary["max_ms"]) == (100, 51.0, 99.0, 100.0)
+    assert summary["mean_ms"] == 50.5
+    assert sum(histogram.buckets) == 100
+    assert histogram.buckets[BUCKETS.index(0.1)] == 50
+    assert Histogram().summary()["p95_ms"] is None
+
+
+def test_git_command_skips_global_options():
+    assert _git_command(['-c', 'core.quotepath=off', '--git-dir', '/x', 'log', '-1']) == 'log'
+    assert _git_command(['--version']) == 'unknown'
+
+
+def test_disabled_metrics_record_nothing():
+    disabled = Metrics(enabled=False)
+    disabled.observe_tool('t', 0.1)
+    disabled.observe_git(['status'], 0.1)
+    disabled.observe_http('GET', 200, 0.1)
+    snapshot = disabled.snapshot()
+    assert (snapshot["tools"], snapshot["git"], snapshot["github"]) == ({}, {}, [])
+
+
+def test_prometheus_dump():
+    registry = Metrics(enabled=True)
+    registry.observe_tool('get "repo"\nstatus', 0.003)
+    registry.observe_tool('get "repo"\nstatus', 100.0, error=True)
+    registry.observe_response('get "repo"\nstatus', 42)
+    registry.observe_git(['-c', 'x=y', 'status'], 0.5)
+    registry.observe_git(['status'], 0.25, status=1)
+    registry.observe_http('GET', 304, 0.01)
+    registry.register_cache('refs', lambda: {"hits": 3, "misses": 1})
+    registry.register_cache('broken', lambda: 1 / 0)
+    registry.register_cache('off', lambda: None)
+    text = registry.prometheus()
+    lines = text.splitlines()
+    assert text.endswith('\n')
+
+    names = [line.split()[2] for line in lines if line.startswith('# TYPE')]
+    assert len(names) == len(set(names)) == 9
+    for line in lines:
+        assert line.startswith('# ') or SAMPLE.match(line), line
+
+    label = 'tool="get \\"repo\\"\\nstatus"'
+    buckets = [line for line in lines if line.startswith('git_mcp_tool_duration_seconds_bucket')]
+    assert buckets[0] == f'git_mcp_tool_duration_seconds_bucket{{{label},le="0.001"}} 0'
+    assert f'git_mcp_tool_duration_seconds_bucket{{{label},le="0.005"}} 1' in lines
+    # 마지막 구간(60초)보다 큰 값은 +Inf 에만 들어간다
+    assert buckets[-2:] == [f'git_mcp_tool_duration_seconds_bucket{{{label},le="60.0"}} 1',
+                            f'git_mcp_tool_duration_seconds_bucket{{{label},le="+Inf"}} 2']
+    assert f'git_mcp_tool_duration_seconds_count{{{label}}} 2' in lines
+    assert f'git_mcp_tool_duration_seconds_sum{{{label}}} 100.003000' in lines
+    assert f'git_mcp_tool_errors_total{{{label}}} 1' in lines
+    assert f'git_mcp_tool_response_bytes_total{{{label}}} 42' in lines
+    assert 'git_mcp_git_commands_total{command="status"} 2' in lines
+    assert 'git_mcp_git_command_seconds_total{command="status"} 0.750000' in lines
+    assert 'git_mcp_github_requests_total{method="GET",status="304"} 1' in lines
+    assert 'git_mcp_cache_hits_total{cache="refs"} 3' in lines
+    assert 'git_mcp_cache_misses_total{cache="refs"} 1' in lines
+    assert 'broken' not in text and 'cache="off"' not in text
+
+    snapshot = registry.snapshot()
+    assert snapshot["git"]["status"] == {"count": 2, "seconds": 0.75, "failures": 1}
+    assert snapshot["caches"]["refs"]["hit_rate"] == 0.75
+    registry.reset()
+    assert 'git_mcp_git_commands_total{' not in registry.prometheus()
+
+
+def test_metrics_file_writer(tmp_path, monkeypatch):
+    path = tmp_path / 'git_mcp.prom'
+    monkeypatch.setenv('GIT_MCP_METRICS_FILE', str(path))
+    monkeypatch.setenv('GIT_MCP_METRICS_INTERVAL', '0.05')
+    registry = Metrics(enabled=True)
+    registry.observe_git(['log'], 0.1)
+    registry.start_writer()
+    deadline = time.monotonic() + 5
+    while not path.exists():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert 'git_mcp_git_commands_total{command="log"} 1' in path.read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ['git_mcp.prom']
+
+
+def test_log_sampled(monkeypatch, caplog):
+    monkeypatch.setattr(metrics_module, 'SAMPLE_EVERY', 3)
+    monkeypatch.setattr(metrics_module, '_sample_counters', {})
+    log = logging.getLogger('test_metrics')
+    with caplog.at_level(logging.INFO, logger='test_metrics'):
+        for n in range(7):
+            metrics_module.log_sampled(log, logging.INFO, 'key', 'call %d', n)
+        metrics_module.log_sampled(log, logging.DEBUG, 'key', 'hidden %d', 0)
+    assert [record.getMessage() for record in caplog.records] == ['call 0', 'call 3', 'call 6']
+
+
+def test_tool_calls_are_measured(server, repo):
+    repo.commit('한글 메시지', {'파일.txt': '내용\n'})
+    result = server.call_tool('get_commit_history', {'limit': 1, 'fields': ['subject']})
+    # 비 ASCII 문자는 이스케이프하지 않고, 응답 크기는 실제 UTF-8 바이트 수로 센다
+    assert '한글 메시지' in result
+    assert json.loads(result)["commits"][0]["subject"] == '한글 메시지'
+    with pytest.raises(Exception):
+        server.call_tool('read_file_at', {'path': 'missing.txt'})
+
+    snapshot = server.registry.call('get_server_metrics')
+    history = snapshot["tools"]["get_commit_history"]
+    assert (history["count"], history["errors"], history["responses"]) == (1, 0, 1)
+    assert history["bytes"] == len(result.encode('utf-8'))
+    assert snapshot["tools"]["read_file_at"]["errors"] == 1
+    assert snapshot["git"]["log"]["count"] >= 1
+
+    text = server.registry.call('get_server_metrics', {'format': 'prometheus', 'reset': True})
+    assert 'git_mcp_tool_errors_total{tool="read_file_at"} 1' in text
+    assert 'get_commit_history' not in server.registry.call('get_server_metrics')["tools"]
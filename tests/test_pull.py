@@ -0,0 +1,62 @@
+import pytest
+
+from tests.conftest import Repo, git
+
+
+@pytest.fixture
+def diverged(server, repo, tmp_path):
+    """origin 과 로컬 main 이 각자 커밋 하나씩 앞선 상태"""
+    origin = tmp_path / 'origin.git'
+    git(tmp_path, 'init', '-q', '--bare', '-b', 'main', str(origin))
+    repo.git('remote', 'add', 'origin', str(origin))
+    repo.git('push', '-q', '-u', 'origin', 'main')
+    other = Repo(tmp_path / 'other')
+    git(tmp_path, 'clone', '-q', str(origin), other.path)
+    other.commit('remote change', {'remote.txt': 'remote\n'})
+    other.git('push', '-q', 'origin', 'main')
+    repo.commit('local change', {'local.txt': 'local\n'})
+    return repo
+
+
+def pull(server, **params):
+    return server.registry.call('pull_changes', params)
+
+
+def test_ff_only_refuses_divergent_history(server, diverged):
+    diverged.git('config', 'pull.ff', 'only')
+    head = diverged.head()
+    with pytest.raises(Exception, match='fast-forward'):
+        pull(server)
+    assert diverged.head() == head
+
+
+def test_rebase_setting_of_branch_is_honoured(server, diverged):
+    diverged.git('config', 'pull.rebase', 'false')
+    diverged.git('config', 'branch.main.rebase', 'true')
+    result = pull(server)
+    assert result["message"] == 'Changes pulled from origin/main'
+    assert diverged.git('log', '--format=%s').split('\n')[:3] == ['local change', 'remote change', 'initial']
+    assert diverged.git('rev-list', '--merges', 'HEAD') == ''
+
+
+def test_merge_when_rebase_disabled(server, diverged):
+    diverged.git('config', 'pull.rebase', 'false')
+    pull(server)
+    assert diverged.git('rev-list', '--merges', 'HEAD').strip() == diverged.head()
+
+
+def test_interactive_rebase_is_rejected(server, diverged):
+    diverged.git('config', 'pull.rebase', 'interactive')
+    head = diverged.head()
+    with pytest.raises(Exception, match='interactive'):
+        pull(server)
+    assert diverged.head() == head
+
+
+def test_configured_upstream_is_used_when_branch_is_omitted(server, diverged):
+    diverged.git('config', 'pull.rebase', 'true')
+    diverged.git('checkout', '-q', '-b', 'work', 'main~1')
+    diverged.git('branch', '-q', '-u', 'origin/main')
+    result = pull(server)
+    assert result["message"] == 'Changes pulled from origin/main'
+    assert diverged.head() == diverged.head('origin/main')
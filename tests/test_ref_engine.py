@@ -0,0 +1,98 @@
+import pytest
+
+import gitproc
+import ref_engine
+
+
+@pytest.fixture
+def refs(repo):
+    """main(upstream origin/main 보다 1 앞, 1 뒤), feature, 주석 / 경량 태그, 사라진 upstream"""
+    base = repo.head()
+    repo.git('remote', 'add', 'origin', 'https://example.com/repo.git')
+    repo.commit('remote side', {'remote.txt': 'r\n'}, date='2024-01-02T00:00:00+00:00')
+    repo.git('update-ref', 'refs/remotes/origin/main', 'HEAD')
+    repo.git('reset', '-q', '--hard', base)
+    repo.commit('local side', {'local.txt': 'l\n'}, date='2024-01-03T00:00:00+00:00')
+    repo.git('config', 'branch.main.remote', 'origin')
+    repo.git('config', 'branch.main.merge', 'refs/heads/main')
+
+    repo.git('checkout', '-q', '-b', 'feature', base)
+    repo.commit('feature work', {'feature.txt': 'f\n'}, date='2024-01-01T00:00:00+00:00')
+    repo.git('checkout', '-q', 'main')
+    repo.git('config', 'branch.feature.remote', 'origin')
+    repo.git('config', 'branch.feature.merge', 'refs/heads/feature')
+    repo.git('tag', 'v1.9', 'feature')
+    repo.git('tag', '-a', 'v1.10', '-m', 'release 1.10\n\nnotes', 'HEAD')
+    repo.git('tag', 'v1.2', 'HEAD')
+    return repo
+
+
+def by_name(result):
+    return {entry["name"]: entry for entry in result["refs"]}
+
+
+def test_parses_branches_upstreams_and_tags(refs):
+    entries = by_name(ref_engine.list_refs(refs.path, limit=None))
+    assert set(entries) == {'main', 'feature', 'origin/main', 'v1.9', 'v1.10', 'v1.2'}
+
+    main = entries['main']
+    assert main["kind"] == 'branch' and main["current"] is True
+    assert (main["upstream"], main["ahead"], main["behind"], main["upstream_gone"]) == ('origin/main', 1, 1, False)
+    assert main["sha"] == main["commit"] == refs.head()
+    assert (main["author"], main["author_email"]) == ('tester', 'tester@example.com')
+    assert main["subject"] == 'local side'
+    assert main["date"].startswith('2024-01-03T00:00:00')
+
+    assert entries['feature']["current"] is False
+    assert entries['feature']["upstream_gone"] is True
+    assert entries['origin/main']["kind"] == 'remote'
+
+    annotated, light = entries['v1.10'], entries['v1.2']
+    assert annotated["annotated"] is True
+    assert annotated["sha"] != annotated["commit"] == refs.head()
+    assert annotated["message"] == 'release 1.10\n\nnotes'
+    assert annotated["subject"] == 'release 1.10'
+    assert (light["annotated"], light["message"], light["commit"]) == (False, None, refs.head())
+
+
+def test_filter_sort_and_page(refs):
+    tags = ref_engine.list_refs(refs.path, kinds=['tag'], sort='version')
+    assert [entry["name"] for entry in tags["refs"]] == ['v1.2', 'v1.9', 'v1.10']
+    names = [entry["name"] for entry in ref_engine.list_refs(refs.path, kinds=['tag'], sort='-version')["refs"]]
+    assert names == ['v1.10', 'v1.9', 'v1.2']
+
+    branches = ref_engine.list_refs(refs.path, kinds=['branch'], sort='-date')
+    assert [entry["name"] for entry in branches["refs"]] == ['main', 'feature']
+
+    first = ref_engine.list_refs(refs.path, patterns='v1.*', limit=2)
+    assert (first["total"], first["offset"], first["next_offset"]) == (3, 0, 2)
+    rest = ref_engine.list_refs(refs.path, patterns=['v1.*'], offset=first["next_offset"], limit=2)
+    assert [entry["name"] for entry in first["refs"] + rest["refs"]] == ['v1.10', 'v1.2', 'v1.9']
+    assert rest["next_offset"] is None
+
+    with pytest.raises(ValueError, match='알 수 없는 ref 종류'):
+        ref_engine.list_refs(refs.path, kinds=['note'])
+    with pytest.raises(ValueError, match='지원하지 않는 정렬 기준'):
+        ref_engine.list_refs(refs.path, sort='size')
+
+
+def test_cached_until_refs_change(server, refs, monkeypatch):
+    ref_engine.ref_cache.clear()
+    calls = []
+    run = gitproc.run
+    monkeypatch.setattr(gitproc, 'run', lambda cwd, args, *a, **kw: (
+        calls.append(args[0]) or run(cwd, args, *a, **kw)))
+
+    first = server.registry.call('list_refs', {'kinds': ['tag']})
+    again = server.registry.call('list_refs', {'kinds': ['tag'], 'sort': '-name'})
+    assert calls.count('for-each-ref') == 1
+    assert [entry["name"] for entry in again["refs"]] == [entry["name"] for entry in reversed(first["refs"])]
+
+    refs.git('tag', 'v2.0')
+    result = server.registry.call('list_refs', {'kinds': ['tag'], 'sort': '-version'})
+    assert result["refs"][0]["name"] == 'v2.0'
+    assert calls.count('for-each-ref') == 2
+
+    info = server.registry.call('get_branch_info', {'details': True})
+    assert (info["current"], info["all_branches"]) == ('main', ['feature', 'main'])
+    assert calls.count('for-each-ref') == 2
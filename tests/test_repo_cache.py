@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import ref_engine
+from repo_cache import RepoHandleManager
+
+
+def test_subscribers_receive_changed_components(repo):
+    manager = RepoHandleManager(idle_seconds=0)
+    events = []
+    manager.subscribe(lambda path, changed: events.append((path, changed)))
+    manager.get(repo.path)
+    assert events == []
+
+    repo.git('branch', 'topic')
+    manager.get(repo.path)
+    assert events == [(os.path.realpath(repo.path), {'refs'})]
+    manager.close()
+
+
+def test_ref_change_drops_only_that_repository_refs(repo, tmp_path):
+    other = os.path.realpath(tmp_path / 'other')
+    path = os.path.realpath(repo.path)
+    ref_engine.ref_cache.put((path, (0,)), [], size=1)
+    ref_engine.ref_cache.put((other, (0,)), [], size=1)
+
+    ref_engine.invalidate(path, {'index'})
+    assert ref_engine.ref_cache.get((path, (0,))) == []
+
+    ref_engine.invalidate(path, {'refs'})
+    assert ref_engine.ref_cache.get((path, (0,))) is None
+    assert ref_engine.ref_cache.get((other, (0,))) == []
+    ref_engine.ref_cache.clear()
+
+
+def test_config_change_reopens_each_threads_handle_on_its_next_get(repo):
+    manager = RepoHandleManager(idle_seconds=0)
+    closed = []
+    other_thread = ThreadPoolExecutor(max_workers=1)
+
+    def get():
+        handle = manager.get(repo.path)
+        handle.close = lambda handle=handle: closed.append(handle)
+        return handle
+
+    mine = get()
+    theirs = other_thread.submit(get).result()
+    repo.git('config', 'mcp.test', 'changed')
+
+    # config 변경을 감지한 스레드는 자기 핸들만 다시 연다 - 다른 스레드가 쓰는 핸들은 닫지 않는다
+    reopened = get()
+    assert reopened is not mine
+    assert closed == [mine]
+    assert manager.get(repo.path) is reopened
+
+    assert other_thread.submit(get).result() is not theirs
+    assert closed == [mine, theirs]
+    other_thread.shutdown()
+    manager.close()
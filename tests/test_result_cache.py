@@ -0,0 +1,123 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cache import ResultCache, result_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = {
+    'get_commit_history': {'revision': 'main', 'limit': 10, 'fields': ['hash', 'subject', 'author']},
+    'get_diff_stats': {'base': 'main~2', 'target': 'main', 'hunks': True},
+    'blame': {'path': 'file.txt', 'revision': 'main'},
+    'preview_merge': {'source_branch': 'side', 'target': 'main'},
+}
+
+# 캐시 적중 여부 / 소요 시간 등 결과 비교에서 제외할 필드
+VOLATILE = ('cache_hit', 'seconds', 'revision')
+
+
+def normalize(value):
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items() if k not in VOLATILE}
+    if isinstance(value, list):
+        return [normalize(v) for v in value]
+    return value
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+@pytest.fixture
+def history(repo):
+    """main 에 커밋 다섯 개, main~1 에서 갈라진 side 브랜치"""
+    for n in range(1, 5):
+        repo.commit(f'change {n}', {'file.txt': ''.join(f'{i}\n' for i in range(n))})
+    repo.git('branch', 'side', 'main~1')
+    repo.git('checkout', '-q', 'side')
+    repo.commit('side change', {'side.txt': 'side\n'})
+    repo.git('checkout', '-q', 'main')
+    return repo
+
+
+def call_all(server):
+    return {name: server.registry.call(name, params) for name, params in QUERIES.items()}
+
+
+def uncached(server):
+    result_cache.clear()
+    return call_all(server)
+
+
+@pytest.mark.parametrize('move', [
+    lambda repo: repo.git('update-ref', 'refs/heads/main', 'main~2'),
+    lambda repo: repo.git('reset', '-q', '--hard', 'main~1'),
+    lambda repo: repo.commit('new commit', {'file.txt': 'rewritten\n'}),
+], ids=['branch_move', 'reset', 'new_commit'])
+def test_ref_move_never_serves_stale_results(server, history, move):
+    before = call_all(server)
+    call_all(server)
+    namespaces = result_cache.stats()["namespaces"]
+    assert all(namespaces[name]["hits"] >= 1 for name in ('history', 'diff', 'blame', 'merge_preview'))
+
+    move(history)
+    history.git('reset', '-q', '--hard')
+    after = call_all(server)
+    fresh = uncached(server)
+    for name in QUERIES:
+        assert normalize(after[name]) == normalize(fresh[name]), name
+        assert normalize(after[name]) != normalize(before[name]), name
+
+
+def test_same_refs_hit_the_cache(server, history):
+    call_all(server)
+    again = call_all(server)
+    for name in ('get_diff_stats', 'blame', 'preview_merge'):
+        assert again[name]["cache_hit"] is True, name
+    assert result_cache.stats()["namespaces"]["history"]["hits"] >= 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / 'cache' / 'results.sqlite')
+    first = ResultCache(1024 * 1024, disk_path=path)
+    first.put('diff', ['a', 'b'], {"files": ['x']})
+
+    restarted = ResultCache(1024 * 1024, disk_path=path)
+    assert restarted.get('diff', ['a', 'b']) == {"files": ['x']}
+    assert restarted.stats()["disk"]["hits"] == 1
+    assert restarted.get('diff', ['a', 'c']) is None
+
+
+RESTART_SCRIPT = '''
+import json, logging, sys
+sys.path.insert(0, {root!r})
+logging.disable(logging.CRITICAL)
+import main
+from cache import result_cache
+for name, params in {queries!r}.items():
+    main.registry.call(name, params)
+print(json.dumps(result_cache.stats()))
+'''
+
+
+def test_disk_tier_hits_after_server_restart(history, tmp_path):
+    env = dict(os.environ, GIT_REPO_PATH=history.path, GIT_MCP_RESULT_CACHE_DIR=str(tmp_path / 'cache'))
+    script = RESTART_SCRIPT.format(root=ROOT, queries=QUERIES)
+
+    def run():
+        return json.loads(subprocess.run(
+            [sys.executable, '-c', script], env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        ).stdout)
+
+    first = run()
+    assert first["disk"]["hits"] == 0
+    second = run()
+    assert second["disk"]["hits"] >= len(QUERIES)
+    assert all(counts["misses"] == 0 for counts in second["namespaces"].values())
@@ -0,0 +1,82 @@
+import pytest
+
+import progress
+import search_engine
+
+
+@pytest.fixture
+def code(repo):
+    """여러 디렉터리에 걸친 파일 - 경로 묶음(shard)으로 나뉠 만큼"""
+    files = {
+        f'pkg{d}/mod{m}.py': ''.join(f'line {n}\n' for n in range(1, 6)) + f'def target_{d}_{m}():\n    return TARGET\n'
+        for d in range(4) for m in range(3)
+    }
+    files['docs/a file:with colon.txt'] = 'Target in docs\ntargets plural\n'
+    files['long.txt'] = 'target ' + 'x' * 1000 + '\n'
+    repo.commit('code', files)
+    repo.git('tag', 'v1')
+    repo.commit('more', {'pkg0/mod0.py': 'target moved\n'})
+    return repo
+
+
+@pytest.mark.parametrize('workers', ['1', '4'])
+def test_sharded_search_matches_git_grep(code, monkeypatch, workers):
+    monkeypatch.setenv('GIT_MCP_SEARCH_WORKERS', workers)
+    result = search_engine.search(code.path, 'target_[0-9]', revisions=['v1', 'HEAD'], max_results=1000)
+    assert result["truncated"] is False
+    assert [(m["path"], m["line"]) for m in result["matches"] if m["revision"] == 'v1'] == [
+        (f'pkg{d}/mod{m}.py', 6) for d in range(4) for m in range(3)
+    ]
+    assert len([m for m in result["matches"] if m["revision"] == 'HEAD']) == 11
+    assert [r["revision"] for r in result["revisions"]] == ['v1', 'HEAD']
+    if workers == '4':
+        assert result["processes"] > 2
+
+
+def test_options_and_paths(code):
+    search = lambda pattern, **options: [
+        (m["path"], m["line"]) for m in search_engine.search(code.path, pattern, **options)["matches"]]
+    assert search('Target', paths=['docs']) == [('docs/a file:with colon.txt', 1)]
+    assert search('target', paths=['docs'], ignore_case=True) == [
+        ('docs/a file:with colon.txt', 1), ('docs/a file:with colon.txt', 2)]
+    assert search('target', paths=['docs'], ignore_case=True, word=True) == [('docs/a file:with colon.txt', 1)]
+    assert search('target_0_1()', fixed_strings=True) == [('pkg0/mod1.py', 6)]
+    assert search('line', paths=['pkg1/mod1.py'], max_per_file=2) == [('pkg1/mod1.py', 1), ('pkg1/mod1.py', 2)]
+
+    clipped = search_engine.search(code.path, 'x{10}', paths=['long.txt'])["matches"][0]["text"]
+    assert len(clipped) == search_engine.MAX_LINE_LENGTH + 1 and clipped.endswith('…')
+
+
+def test_context_lines(code):
+    match = search_engine.search(code.path, 'target_1_2', context_lines=2)["matches"][0]
+    assert (match["path"], match["line"], match["column"]) == ('pkg1/mod2.py', 6, 5)
+    assert match["before"] == ['line 4', 'line 5']
+    assert match["after"] == ['    return TARGET']
+
+
+@pytest.mark.parametrize('context_lines', [0, 1])
+def test_max_results_truncates(code, monkeypatch, context_lines):
+    monkeypatch.setenv('GIT_MCP_SEARCH_WORKERS', '4')
+    result = search_engine.search(code.path, 'line', max_results=5, context_lines=context_lines)
+    assert result["truncated"] is True
+    assert len(result["matches"]) == 5
+
+
+def test_revisions_are_resolved_once_and_validated(code):
+    result = search_engine.search(code.path, 'target moved', revisions=['HEAD', 'main'])
+    assert result["revisions"] == [{"revision": 'HEAD', "commit": code.head()}]
+    assert [m["revision"] for m in result["matches"]] == ['HEAD']
+    with pytest.raises(ValueError, match='패턴'):
+        search_engine.search(code.path, '')
+    with pytest.raises(Exception):
+        search_engine.search(code.path, 'x', revisions=['--output=/tmp/x'])
+    with pytest.raises(Exception):
+        search_engine.search(code.path, 'x', revisions=['no-such-branch'])
+
+
+def test_search_code_tool_reports_progress(server, code):
+    reports = []
+    with progress.reporting(lambda value, total, message: reports.append((value, total, message))):
+        result = server.registry.call('search_code', {'pattern': 'def target', 'max_results': 3})
+    assert len(result["matches"]) == 3
+    assert reports[-1] == (3, 3, 'matches')
@@ -0,0 +1,72 @@
+import os
+import stat
+import time
+
+import pytest
+
+import staging
+from jobs import CANCELLED
+
+
+def staged(repo):
+    return sorted(repo.git('diff', '--cached', '--name-only').split())
+
+
+def hook(repo, script):
+    path = os.path.join(repo.path, '.git', 'hooks', 'pre-commit')
+    with open(path, 'w') as f:
+        f.write('#!/bin/sh\n' + script + '\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+@pytest.fixture
+def changes(repo):
+    """a.txt 는 미리 스테이징, b.txt / c.txt 는 작업 트리에만 있는 상태"""
+    repo.write('a.txt', 'a\n')
+    repo.git('add', 'a.txt')
+    repo.write('b.txt', 'b\n')
+    repo.write('c.txt', 'c\n')
+    return repo
+
+
+def test_commit_stages_pathspecs_in_one_pass(changes):
+    result = staging.commit(changes.path, 'add b', pathspecs=['b.txt'])
+    assert result["commit"] == changes.head()
+    assert sorted(changes.git('show', '--name-only', '--format=', 'HEAD').split()) == ['a.txt', 'b.txt']
+    assert not [name for name in os.listdir(os.path.join(changes.path, '.git')) if 'git-mcp' in name]
+
+
+def test_dry_run_leaves_index_alone(changes):
+    result = staging.commit(changes.path, 'dry', pathspecs=['*.txt'], dry_run=True)
+    assert result["add"] == ['b.txt', 'c.txt']
+    assert result["already_staged"] == ['a.txt']
+    assert staged(changes) == ['a.txt']
+
+
+def test_failed_commit_restores_index(changes):
+    hook(changes, 'exit 1')
+    head = changes.head()
+    with pytest.raises(Exception):
+        staging.commit(changes.path, 'rejected', pathspecs=['b.txt', 'c.txt'])
+    assert changes.head() == head
+    assert staged(changes) == ['a.txt']
+    assert not [name for name in os.listdir(os.path.join(changes.path, '.git')) if 'git-mcp' in name]
+
+
+def test_cancelled_commit_job_leaves_tree_as_found(server, changes):
+    hook(changes, 'sleep 30')
+    head = changes.head()
+    job = server.registry.call('commit_changes', {'message': 'slow', 'files': ['b.txt', 'c.txt'], 'background': True})
+    deadline = time.monotonic() + 10
+    while staged(changes) != ['a.txt', 'b.txt', 'c.txt']:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    server.registry.call('cancel_job', {'job_id': job["job_id"]})
+    while server.job_manager.get(job["job_id"]).finished_at is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+    assert server.job_manager.get(job["job_id"]).status == CANCELLED
+    assert changes.head() == head
+    assert staged(changes) == ['a.txt']
+    assert not os.path.exists(os.path.join(changes.path, '.git', 'index.lock'))
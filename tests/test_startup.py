@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ('git', 'requests', 'github_client')
+# bench_startup 의 기본 예산 (CI 기기 편차를 생각해 여러 번 중 가장 빠른 값으로 본다)
+BUDGET_MS = 1500
+ATTEMPTS = 3
+
+
+def run_python(code, env):
+    return json.loads(subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ).stdout)
+
+
+def server_env(path, **extra):
+    return dict(os.environ, GIT_REPO_PATH=str(path), GIT_MCP_LOG_LEVEL='WARNING', **extra)
+
+
+def request(proc, request_id, method, params):
+    proc.stdin.write(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+                     .encode() + b'\n')
+    proc.stdin.flush()
+    while True:
+        line = proc.stdout.readline()
+        assert line, f"서버가 종료됨 (exit {proc.poll()})"
+        message = json.loads(line)
+        if message.get('id') == request_id:
+            return message
+
+
+def start_server(env):
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'main.py')], cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+
+
+def test_import_defers_heavy_modules(repo):
+    code = f'import json, sys, main; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))'
+    assert run_python(code, server_env(repo.path)) == []
+
+
+def test_first_tool_call_loads_gitpython(repo):
+    code = ('import json, sys, main\n'
+            'main.registry.call("get_repo_status", {})\n'
+            'print(json.dumps(["git" in sys.modules, "requests" in sys.modules]))')
+    assert run_python(code, server_env(repo.path)) == [True, False]
+
+
+def test_initialize_within_budget(repo):
+    env = server_env(repo.path)
+    elapsed = []
+    for _ in range(ATTEMPTS):
+        started = time.perf_counter()
+        proc = start_server(env)
+        try:
+            response = request(proc, 1, 'initialize', {
+                'protocolVersion': '2024-11-05', 'capabilities': {},
+                'clientInfo': {'name': 'git-mcp-test', 'version': '1.0'},
+            })
+            elapsed.append((time.perf_counter() - started) * 1000)
+            assert response["result"]["serverInfo"]["name"]
+            proc.stdin.write(json.dumps({'jsonrpc': '2.0', 'method': 'notifications/initialized'}).encode() + b'\n')
+            proc.stdin.flush()
+            call = request(proc, 2, 'tools/call', {'name': 'get_repo_status', 'arguments': {}})
+            assert not call["result"].get("isError")
+        finally:
+            # MCP SDK 의 stdio 서버는 stdin EOF 에 종료하지 않으므로 직접 종료시킨다
+            proc.stdin.close()
+            proc.terminate()
+            proc.wait()
+    assert min(elapsed) <= BUDGET_MS, elapsed
+
+
+def test_invalid_repository_rejected_at_startup(tmp_path):
+    proc = start_server(server_env(tmp_path))
+    proc.stdin.close()
+    assert proc.wait(timeout=30) != 0
@@ -0,0 +1,75 @@
+import pytest
+
+import status_engine
+
+
+def records(*lines):
+    return [line.encode() for line in lines]
+
+
+def test_parse_headers_and_entries():
+    result = status_engine.parse(records(
+        '# branch.oid 0123456789abcdef0123456789abcdef01234567',
+        '# branch.head main',
+        '# branch.upstream origin/main',
+        '# branch.ab +2 -3',
+        '1 M. N... 100644 100644 100644 aaaa bbbb staged.txt',
+        '1 .M N... 100644 100644 100644 aaaa aaaa modified file.txt',
+        '2 R. N... 100644 100644 100644 aaaa aaaa R87 new name.txt', 'old name.txt',
+        'u UU N... 100644 100644 100644 100644 aaaa bbbb cccc conflict.txt',
+        '? untracked.txt',
+    ))
+    assert result["current_branch"] == 'main'
+    assert result["head"] == '0123456789abcdef0123456789abcdef01234567'
+    assert result["upstream"] == 'origin/main'
+    assert (result["ahead"], result["behind"]) == (2, 3)
+    assert result["is_dirty"] is True
+    assert result["staged_files"] == ['staged.txt', 'new name.txt']
+    assert result["modified_files"] == ['modified file.txt']
+    assert result["renamed_files"] == [{"from": 'old name.txt', "to": 'new name.txt', "kind": 'rename', "score": 87}]
+    assert result["conflicted_files"] == [{"path": 'conflict.txt', "state": 'UU'}]
+    assert result["untracked_files"] == ['untracked.txt']
+
+
+def test_parse_detached_and_initial_head():
+    result = status_engine.parse(records('# branch.oid (initial)', '# branch.head (detached)'))
+    assert result["head"] is None
+    assert result["detached"] is True
+    assert result["current_branch"] is None
+    assert result["is_dirty"] is False
+
+
+def test_parse_copy_and_truncation():
+    result = status_engine.parse(records(
+        '# branch.head main',
+        '2 C. N... 100644 100644 100644 aaaa aaaa C100 copy.txt', 'source.txt',
+        '? a.txt',
+        '? b.txt',
+    ), max_entries=2)
+    assert result["renamed_files"][0]["kind"] == 'copy'
+    assert result["untracked_files"] == ['a.txt']
+    assert result["truncated"] is True
+
+
+def test_untracked_only_is_not_dirty():
+    result = status_engine.parse(records('? a.txt'))
+    assert result["is_dirty"] is False
+
+
+def test_repo_status(repo):
+    repo.git('mv', 'README.md', 'README.txt')
+    repo.write('new.txt', 'new\n')
+    repo.write('dir/nested.txt', 'nested\n')
+    result = status_engine.repo_status(repo.path)
+    assert result["current_branch"] == 'main'
+    assert result["renamed_files"] == [{"from": 'README.md', "to": 'README.txt', "kind": 'rename', "score": 100}]
+    assert result["untracked_files"] == ['dir/nested.txt', 'new.txt']
+
+    assert status_engine.repo_status(repo.path, untracked='normal')["untracked_files"] == ['dir/', 'new.txt']
+    assert status_engine.repo_status(repo.path, untracked='no')["untracked_files"] == []
+    assert status_engine.repo_status(repo.path, paths=['new.txt'])["renamed_files"] == []
+
+
+def test_repo_status_rejects_unknown_untracked_mode(repo):
+    with pytest.raises(ValueError):
+        status_engine.repo_status(repo.path, untracked='some')
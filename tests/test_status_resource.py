@@ -0,0 +1,79 @@
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+from urllib.parse import quote
+
+import pytest
+from mcp.server.lowlevel.server import request_ctx
+
+import main
+import status_watcher
+from repositories import RepositoryResolver
+
+
+@pytest.fixture
+def server(repo, monkeypatch):
+    monkeypatch.setattr(main, 'repositories', RepositoryResolver(allowlist=[repo.path]))
+    monkeypatch.setattr(main, '_status_subscribers', {})
+    yield main
+    status_watcher.stop_all()
+
+
+def subscribe(uri, session):
+    async def run():
+        token = request_ctx.set(SimpleNamespace(session=session))
+        try:
+            await main.subscribe_resource(uri)
+        finally:
+            request_ctx.reset(token)
+    asyncio.run(run())
+
+
+def test_status_resource_repo(server, repo):
+    path = os.path.realpath(repo.path)
+    assert server.status_resource_repo('git://status/repo') == path
+    assert server.status_resource_repo('git://status/' + quote(path, safe='')) == path
+    with pytest.raises(Exception, match='저장소가 지정되지 않았습니다'):
+        server.status_resource_repo('git://status')
+    with pytest.raises(Exception, match='Unknown resource'):
+        server.status_resource_repo('git://other')
+
+
+def test_subscribe_resolves_repository_off_the_event_loop(server, repo, monkeypatch):
+    threads = []
+    watch = server._watch_status
+    monkeypatch.setattr(server, '_watch_status', lambda uri: threads.append(threading.current_thread()) or watch(uri))
+    session = object()
+
+    subscribe('git://status/repo', session)
+    assert threads and threads[0] is not threading.main_thread()
+    loop, work_tree = server._status_subscribers[(session, 'git://status/repo')]
+    assert work_tree == os.path.realpath(repo.path)
+
+
+def test_subscribe_without_default_repository_fails_cleanly(server):
+    session = object()
+    with pytest.raises(Exception, match='저장소가 지정되지 않았습니다'):
+        subscribe('git://status', session)
+    assert server._status_subscribers == {}
+
+
+def test_notifications_go_to_subscribers_of_that_repository(server, repo):
+    sent = []
+
+    class Session:
+        def __init__(self, name):
+            self.name = name
+
+        async def send_resource_updated(self, uri):
+            sent.append((self.name, uri))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        server._status_subscribers[(Session('a'), 'git://status/repo')] = (loop, os.path.realpath(repo.path))
+        server._status_subscribers[(Session('b'), 'git://status/other')] = (loop, '/elsewhere')
+        await loop.run_in_executor(None, server._notify_status_subscribers, os.path.realpath(repo.path), 1)
+        await asyncio.sleep(0.05)
+    asyncio.run(run())
+    assert sent == [('a', 'git://status/repo')]
@@ -0,0 +1,161 @@
+import os
+
+import git as gitpython
+import pytest
+
+import status_watcher
+from status_watcher import IN_CLOSE_WRITE, IN_CREATE, IN_IGNORED, IN_ISDIR, IN_Q_OVERFLOW, StatusWatcher
+
+pytestmark = pytest.mark.skipif(not status_watcher.supported(), reason='inotify 미지원 플랫폼')
+
+
+@pytest.fixture
+def watcher(repo):
+    """감시 스레드를 멈춰 둔 감시자 - 이벤트는 snapshot 의 sync 로만 반영된다"""
+    handle = gitpython.Repo(repo.path)
+    watcher = status_watcher.get_watcher(handle, force=True)
+    watcher._stop.set()
+    watcher._thread.join()
+    yield watcher
+    status_watcher.stop_all()
+
+
+def lose_events(watcher, monkeypatch):
+    monkeypatch.setattr(watcher, '_read_events', lambda timeout: None)
+
+
+def test_snapshot_sees_own_write_before_debounce(repo, watcher):
+    repo.write('README.md', 'changed\n')
+    repo.write('new.txt', 'new\n')
+    snapshot = watcher.snapshot()
+    assert snapshot["modified_files"] == ['README.md']
+    assert snapshot["untracked_files"] == ['new.txt']
+
+
+def test_index_or_head_change_rescans_without_events(repo, watcher, monkeypatch):
+    lose_events(watcher, monkeypatch)
+    head = repo.commit('second', {'a.txt': 'a\n'})
+    snapshot = watcher.snapshot()
+    assert snapshot["head"] == head
+    assert snapshot["untracked_files"] == []
+
+    repo.git('checkout', '-q', '-b', 'topic')
+    assert watcher.snapshot()["current_branch"] == 'topic'
+
+
+def test_invalidate_forces_full_rescan(repo, watcher, monkeypatch):
+    lose_events(watcher, monkeypatch)
+    repo.write('lost.txt', 'lost\n')
+    assert watcher.snapshot()["untracked_files"] == []
+    status_watcher.invalidate(repo.path)
+    assert watcher.snapshot()["untracked_files"] == ['lost.txt']
+
+
+def test_commit_tool_invalidates_watcher(server, repo, monkeypatch):
+    monkeypatch.setenv('GIT_STATUS_WATCH', '1')
+    try:
+        assert server.registry.call('get_repo_status', {})["untracked_files"] == []
+        watcher = status_watcher._watchers[os.path.realpath(repo.path)]
+        watcher._stop.set()
+        watcher._thread.join()
+        lose_events(watcher, monkeypatch)
+        # index / HEAD 비교도 막아 두고 도구의 무효화만으로 반영되는지 본다
+        monkeypatch.setattr(watcher, '_meta_stamp', lambda: watcher._stamp)
+
+        repo.write('new.txt', 'new\n')
+        result = server.registry.call('commit_changes', {'message': 'add new'})
+        status = server.registry.call('get_repo_status', {})
+        assert status["head"] == result["commit"] == repo.head()
+        assert status["untracked_files"] == []
+        assert status["staged_files"] == []
+    finally:
+        status_watcher.stop_all()
+
+
+def entry(path, kind='1', orig=None):
+    return {"kind": kind, "path": path, "orig": orig}
+
+
+def test_partial_commit_replaces_only_scanned_paths(repo, watcher):
+    notified = []
+
+    def listener(work_tree, version):
+        notified.append(version)
+
+    status_watcher.subscribe(listener)
+    try:
+        header = dict(watcher._header)
+        watcher._commit(header, {
+            'a.txt': entry('a.txt'),
+            'dir/b.txt': entry('dir/b.txt'),
+            'new.txt': entry('new.txt', kind='2', orig='old.txt'),
+            'keep.txt': entry('keep.txt', kind='?'),
+        }, replace=None)
+        version = watcher.version
+
+        # dir 아래 항목과 old.txt 에서 이름이 바뀐 항목은 새 스캔 결과로 대체된다
+        watcher._commit(header, {'a.txt': entry('a.txt', kind='u')}, replace=['a.txt', 'dir', 'old.txt'])
+        assert watcher._entries == {'a.txt': entry('a.txt', kind='u'), 'keep.txt': entry('keep.txt', kind='?')}
+        assert watcher.version == version + 1
+
+        watcher._commit(header, {'a.txt': entry('a.txt', kind='u')}, replace=['a.txt'])
+        assert watcher.version == version + 1
+        assert notified == [version, version + 1]
+    finally:
+        status_watcher._listeners.remove(listener)
+
+
+def test_apply_escalates_to_full_scan(repo, watcher, monkeypatch):
+    calls = []
+    monkeypatch.setattr(watcher, '_full_scan', lambda: calls.append('full'))
+    monkeypatch.setattr(watcher, '_partial_scan', lambda paths: calls.append(sorted(paths)))
+    watcher._apply(False, {'a.txt'})
+    watcher._apply(False, set())
+    watcher._apply(True, {'a.txt'})
+    watcher._apply(False, {f'{n}.txt' for n in range(status_watcher.MAX_PARTIAL_PATHS + 1)})
+    assert calls == [['a.txt'], 'full', 'full']
+
+
+@pytest.fixture
+def events(repo):
+    """inotify fd 대신 파이프에서 이벤트를 읽는 감시자와 이벤트 기록 함수"""
+    read_fd, write_fd = os.pipe()
+    watcher = StatusWatcher(repo.path, os.path.join(repo.path, '.git'), os.path.join(repo.path, '.git'))
+    watcher._fd = read_fd
+    watcher._meta_wds = {1}
+    watcher._tree_wds = {2: '', 3: 'dir'}
+
+    def send(*records):
+        data = b''
+        for wd, mask, name in records:
+            raw = name.encode() + b'\0' * (16 - len(name) % 16)
+            data += status_watcher._EVENT.pack(wd, mask, 0, len(raw)) + raw
+        os.write(write_fd, data)
+        return watcher._read_events(0)
+
+    yield watcher, send
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def test_read_events_maps_tree_and_meta_events(events):
+    watcher, send = events
+    assert watcher._read_events(0) is None
+    assert send((2, IN_CLOSE_WRITE, 'a.txt'), (3, IN_CREATE, 'b.txt')) == (False, {'a.txt', 'dir/b.txt'})
+    assert send((1, IN_CREATE, 'index.lock')) == (False, set())
+    assert send((1, IN_CLOSE_WRITE, 'index')) == (True, set())
+    assert send((3, IN_CLOSE_WRITE, '.gitignore')) == (True, {'dir/.gitignore'})
+
+
+def test_read_events_overflow_and_removed_watches(events, repo, monkeypatch):
+    watcher, send = events
+    assert send((-1, IN_Q_OVERFLOW, '')) == (True, set())
+    assert send((3, IN_IGNORED, '')) == (False, set())
+    assert 3 not in watcher._tree_wds
+    assert send((3, IN_CLOSE_WRITE, 'b.txt')) == (False, set())
+
+    # 새 디렉터리는 하위 트리까지 감시를 추가한다
+    watched = []
+    monkeypatch.setattr(watcher, '_watch_tree', watched.append)
+    assert send((2, IN_CREATE | IN_ISDIR, 'sub')) == (False, {'sub'})
+    assert watched == ['sub']
@@ -0,0 +1,142 @@
+import os
+import time
+
+import pytest
+
+import worktree_pool
+from tests.conftest import git
+from worktree_pool import WorktreePool
+
+
+@pytest.fixture
+def project(repo):
+    """a/, b/ 디렉터리와 topic 브랜치가 있는 저장소"""
+    repo.commit('layout', {'a/one.txt': 'one\n', 'b/two.txt': 'two\n'})
+    repo.git('branch', 'topic')
+    return repo
+
+
+@pytest.fixture
+def make_pool(project, tmp_path):
+    pools = []
+
+    def make(**options):
+        pool = WorktreePool(project.path, os.path.join(project.path, '.git'), root=str(tmp_path / 'worktrees'),
+                            **options)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        for slot in pool._slots:
+            worktree_pool._leases.pop(slot.lease_id, None)
+
+
+def branch_of(path):
+    return git(path, 'branch', '--show-current').strip()
+
+
+def test_lease_creates_worktree_and_rejects_second_lease(make_pool, project):
+    pool = make_pool()
+    lease = pool.lease('topic')
+    assert lease["reused"] is False
+    assert worktree_pool.resolve(lease["lease_id"]) == lease["path"]
+    assert branch_of(lease["path"]) == 'topic'
+    assert project.git('branch', '--show-current').strip() == 'main'
+    with pytest.raises(Exception, match='이미 임대 중'):
+        pool.lease('topic')
+    with pytest.raises(Exception, match='브랜치가 없습니다'):
+        pool.lease('missing')
+
+    created = pool.lease('new-branch', create=True, start_point='main~1')
+    assert branch_of(created["path"]) == 'new-branch'
+    assert not os.path.exists(os.path.join(created["path"], 'a'))
+
+
+def test_released_worktree_is_cleaned_and_reused(make_pool):
+    pool = make_pool()
+    first = pool.lease('topic')
+    with open(os.path.join(first["path"], 'a', 'one.txt'), 'w') as f:
+        f.write('dirty\n')
+    with open(os.path.join(first["path"], 'leftover.txt'), 'w') as f:
+        f.write('leftover\n')
+    pool.release(first["lease_id"])
+    with pytest.raises(Exception, match='찾을 수 없음'):
+        worktree_pool.resolve(first["lease_id"])
+
+    again = pool.lease('topic')
+    assert again["reused"] is True
+    assert again["path"] == first["path"]
+    assert open(os.path.join(again["path"], 'a', 'one.txt')).read() == 'one\n'
+    assert not os.path.exists(os.path.join(again["path"], 'leftover.txt'))
+    assert (pool.stats()["creates"], pool.stats()["reuses"]) == (1, 1)
+
+
+def test_full_pool_switches_least_recently_used_idle_worktree(make_pool):
+    pool = make_pool(max_size=1)
+    first = pool.lease('topic')
+    with pytest.raises(Exception, match='사용 가능한 worktree 가 없습니다'):
+        pool.lease('main-copy', create=True)
+    pool.release(first["lease_id"])
+
+    second = pool.lease('main-copy', create=True, start_point='main')
+    assert second["path"] == first["path"]
+    assert branch_of(second["path"]) == 'main-copy'
+    assert pool.stats()["evictions"] == 1
+
+
+def test_expired_lease_is_reclaimed(make_pool):
+    pool = make_pool(max_size=1, lease_seconds=0.01)
+    first = pool.lease('topic')
+    time.sleep(0.05)
+    second = pool.lease('other', create=True)
+    assert second["path"] == first["path"]
+    with pytest.raises(Exception, match='찾을 수 없음'):
+        worktree_pool.resolve(first["lease_id"])
+
+
+def test_sparse_paths_limit_checkout(make_pool):
+    pool = make_pool()
+    lease = pool.lease('topic', sparse_paths=['a'])
+    assert lease["sparse_paths"] == ['a']
+    assert os.path.exists(os.path.join(lease["path"], 'a', 'one.txt'))
+    assert not os.path.exists(os.path.join(lease["path"], 'b'))
+    pool.release(lease["lease_id"])
+
+    full = pool.lease('topic')
+    assert full["sparse_paths"] is None
+    assert os.path.exists(os.path.join(full["path"], 'b', 'two.txt'))
+
+
+def test_existing_worktrees_are_rediscovered(make_pool):
+    lease = make_pool().lease('topic')
+    restarted = make_pool()
+    assert [slot.info()["path"] for slot in restarted._slots] == [lease["path"]]
+    assert restarted._slots[0].branch == 'topic'
+    assert restarted.lease('topic')["reused"] is True
+
+
+def test_remove_on_release(make_pool, project):
+    pool = make_pool()
+    lease = pool.lease('topic')
+    assert pool.release(lease["lease_id"], remove=True)["removed"] is True
+    assert not os.path.exists(lease["path"])
+    assert pool.stats()["worktrees"] == []
+    assert lease["path"] not in project.git('worktree', 'list')
+
+
+def test_tools_run_inside_leased_worktree(server, project, tmp_path, monkeypatch):
+    monkeypatch.setenv('GIT_MCP_WORKTREE_DIR', str(tmp_path / 'tool-worktrees'))
+    monkeypatch.setattr(worktree_pool, '_pools', {})
+    lease = server.registry.call('lease_worktree', {'branch': 'topic'})
+    try:
+        with open(os.path.join(lease["path"], 'c.txt'), 'w') as f:
+            f.write('c\n')
+        status = server.registry.call('get_repo_status', {'worktree': lease["lease_id"]})
+        assert status["current_branch"] == 'topic'
+        assert status["untracked_files"] == ['c.txt']
+        server.registry.call('commit_changes', {'message': 'in worktree', 'worktree': lease["lease_id"]})
+        assert project.git('log', '-1', '--format=%s', 'topic').strip() == 'in worktree'
+        assert project.git('log', '-1', '--format=%s', 'main').strip() == 'layout'
+    finally:
+        server.registry.call('release_worktree', {'lease_id': lease["lease_id"]})
@@ -0,0 +1,239 @@
+"""git worktree 풀
+
+브랜치 작업마다 기본 작업 트리를 checkout 하지 않고, 풀에서 worktree 를 임대(lease)한다.
+임대가 끝난 worktree 는 지우지 않고 다음 임대 때 reset / clean 후 재사용하며, 풀이 가득
+차면 가장 오래 쓰지 않은 유휴 worktree 를 다른 브랜치로 전환해 쓴다. sparse_paths 를
+주면 cone 모드 sparse-checkout 으로 필요한 디렉터리만 채운다.
+
+worktree 는 기본적으로 <common_dir>/mcp-worktrees 아래에 만들어진다 (GIT_MCP_WORKTREE_DIR).
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+
+import gitproc
+
+logger = logging.getLogger(__name__)
+
+
+class Slot:
+    """풀의 worktree 하나"""
+
+    def __init__(self, path, branch=None, sparse=None):
+        self.path = path
+        self.branch = branch
+        self.sparse = sparse
+        self.lease_id = None
+        self.leased_at = None
+        self.last_used = time.monotonic()
+        self.busy = False
+
+    def info(self):
+        return {
+            "path": self.path,
+            "branch": self.branch,
+            "sparse_paths": self.sparse,
+            "lease_id": self.lease_id,
+            "idle_seconds": None if self.lease_id else round(time.monotonic() - self.last_used, 1),
+        }
+
+
+class WorktreePool:
+    """저장소 하나의 worktree 풀
+
+    max_size: 최대 worktree 수 (GIT_MCP_WORKTREE_POOL_SIZE)
+    lease_seconds: 이 시간 동안 쓰지 않은 임대는 회수 가능 (GIT_MCP_WORKTREE_LEASE_SECONDS)
+    """
+
+    def __init__(self, work_tree, common_dir, root=None, max_size=None, lease_seconds=None):
+        self.work_tree = work_tree
+        self.root = root or os.getenv('GIT_MCP_WORKTREE_DIR') or os.path.join(common_dir, 'mcp-worktrees')
+        self.max_size = max_size or int(os.getenv('GIT_MCP_WORKTREE_POOL_SIZE', '4'))
+        self.lease_seconds = lease_seconds or float(os.getenv('GIT_MCP_WORKTREE_LEASE_SECONDS', '3600'))
+        self._lock = threading.Lock()
+        self._slots = []
+        self.leases = 0
+        self.reuses = 0
+        self.creates = 0
+        self.evictions = 0
+        self._discover()
+
+    def _git(self, cwd, *args):
+        return gitproc.output(cwd, list(args))
+
+    def _discover(self):
+        """이전 실행에서 만든 worktree 를 유휴 상태로 다시 등록"""
+        root = os.path.realpath(self.root)
+        path = branch = None
+        for line in self._git(self.work_tree, 'worktree', 'list', '--porcelain').splitlines() + ['']:
+            if line.startswith('worktree '):
+                path, branch = line[len('worktree '):], None
+            elif line.startswith('branch refs/heads/'):
+                branch = line[len('branch refs/heads/'):]
+            elif not line and path:
+                if os.path.realpath(path).startswith(root + os.sep) and os.path.isdir(path):
+                    self._slots.append(Slot(path, branch, self._sparse_of(path)))
+                path = None
+
+    def _sparse_of(self, path):
+        try:
+            if self._git(path, 'config', '--bool', 'core.sparseCheckout').strip() != 'true':
+                return None
+            return [p for p in self._git(path, 'sparse-checkout', 'list').splitlines() if p]
+        except gitproc.GitError:
+            return None
+
+    # ---- 임대 ----
+
+    def _pick(self, branch):
+        """임대할 슬롯 선택 (lock 보유 상태에서 호출) -> (slot, 새로 만들지 여부)"""
+        now = time.monotonic()
+        for slot in self._slots:
+            # 오래 쓰지 않은 임대는 회수
+            if slot.lease_id and not slot.busy and now - slot.last_used > self.lease_seconds:
+                logger.info(f"만료된 worktree 임대 회수: {slot.lease_id} ({slot.path})")
+                _leases.pop(slot.lease_id, None)
+                slot.lease_id = None
+        for slot in self._slots:
+            if slot.branch == branch:
+                if slot.lease_id or slot.busy:
+                    raise Exception(f"브랜치가 이미 임대 중입니다: {branch} (lease {slot.lease_id})")
+                return slot, False
+        if len(self._slots) < self.max_size:
+            name = f'wt-{uuid.uuid4().hex[:8]}'
+            slot = Slot(os.path.join(self.root, name))
+            self._slots.append(slot)
+            return slot, True
+        idle = [slot for slot in self._slots if not slot.lease_id and not slot.busy]
+        if not idle:
+            raise Exception(f"사용 가능한 worktree 가 없습니다 (최대 {self.max_size}개 모두 임대 중)")
+        self.evictions += 1
+        return min(idle, key=lambda slot: slot.last_used), False
+
+    def lease(self, branch, create=False, start_point=None, sparse_paths=None):
+        """branch 용 worktree 임대 -> 임대 정보 dict"""
+        start = time.perf_counter()
+        sparse = sorted(set(sparse_paths)) if sparse_paths else None
+        exists = self._branch_exists(branch)
+        if not exists and not create:
+            raise Exception(f"브랜치가 없습니다: {branch} (create=true 로 생성 가능)")
+        with self._lock:
+            slot, new = self._pick(branch)
+            slot.busy = True
+        try:
+            if new:
+                self._create(slot, branch, exists, start_point, sparse)
+                self.creates += 1
+            else:
+                self._reuse(slot, branch, exists, start_point, sparse)
+                self.reuses += 1
+        except Exception:
+            with self._lock:
+                slot.busy = False
+                if new:
+                    self._slots.remove(slot)
+            raise
+        with self._lock:
+            slot.busy = False
+            slot.branch, slot.sparse = branch, sparse
+            slot.lease_id = uuid.uuid4().hex[:12]
+            slot.leased_at = slot.last_used = time.monotonic()
+            _leases[slot.lease_id] = (self, slot)
+            self.leases += 1
+        logger.info(f"worktree 임대: {slot.lease_id} {branch} -> {slot.path}")
+        return dict(slot.info(), reused=not new, seconds=round(time.perf_counter() - start, 3))
+
+    def _branch_exists(self, branch):
+        code, _ = gitproc.run(self.work_tree, ['show-ref', '--verify', '--quiet', f'refs/heads/{branch}'], ok_codes=(0, 1))
+        return code == 0
+
+    def _create(self, slot, branch, exists, start_point, sparse):
+        os.makedirs(self.root, exist_ok=True)
+        args = ['worktree', 'add', '-q']
+        if sparse:
+            # 먼저 sparse 범위를 정한 뒤 파일을 채운다
+            args.append('--no-checkout')
+        if exists:
+            args += [slot.path, branch]
+        else:
+            args += ['-b', branch, slot.path, start_point or 'HEAD']
+        self._git(self.work_tree, *args)
+        if sparse:
+            self._git(slot.path, 'sparse-checkout', 'set', '--cone', '--', *sparse)
+            self._git(slot.path, 'reset', '--hard', '-q')
+
+    def _reuse(self, slot, branch, exists, start_point, sparse):
+        # 이전 임대가 남긴 변경을 버리고 재사용 (무시된 빌드 산출물은 남겨 둔다)
+        self._git(slot.path, 'reset', '--hard', '-q')
+        self._git(slot.path, 'clean', '-fdq')
+        if sparse != slot.sparse:
+            if sparse:
+                self._git(slot.path, 'sparse-checkout', 'set', '--cone', '--', *sparse)
+            else:
+                self._git(slot.path, 'sparse-checkout', 'disable')
+        if slot.branch != branch:
+            if exists:
+                self._git(slot.path, 'checkout', '-q', '-f', branch)
+            else:
+                self._git(slot.path, 'checkout', '-q', '-f', '-b', branch, start_point or 'HEAD')
+
+    def release(self, lease_id, remove=False):
+        with self._lock:
+            slot = next((s for s in self._slots if s.lease_id == lease_id), None)
+            if slot is None:
+                raise Exception(f"worktree 임대를 찾을 수 없음: {lease_id}")
+            _leases.pop(lease_id, None)
+            slot.lease_id = None
+            slot.last_used = time.monotonic()
+            if remove:
+                self._slots.remove(slot)
+        if remove:
+            self._git(self.work_tree, 'worktree', 'remove', '--force', slot.path)
+        return dict(slot.info(), removed=remove)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "root": self.root,
+                "max_size": self.max_size,
+                "worktrees": [slot.info() for slot in self._slots],
+                "leases": self.leases,
+                "reuses": self.reuses,
+                "creates": self.creates,
+                "evictions": self.evictions,
+            }
+
+
+# lease_id -> (pool, slot)
+_leases = {}
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(repo):
+    """저장소(GitPython Repo)의 worktree 풀"""
+    key = os.path.realpath(repo.common_dir)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = WorktreePool(repo.working_tree_dir, repo.common_dir)
+        return pool
+
+
+def resolve(lease_id):
+    """임대 ID -> worktree 경로 (사용 시각 갱신)"""
+    entry = _leases.get(lease_id)
+    if entry is None:
+        raise Exception(f"worktree 임대를 찾을 수 없음: {lease_id}")
+    pool, slot = entry
+    slot.last_used = time.monotonic()
+    return slot.path
+
+
+def release(lease_id, remove=False):
+    entry = _leases.get(lease_id)
+    if entry is None:
+        raise Exception(f"worktree 임대를 찾을 수 없음: {lease_id}")
+    return entry[0].release(lease_id, remove)